@@ -0,0 +1,59 @@
+from fastapi import APIRouter, Header, HTTPException, status
+from app.core import config
+from app.core.quota import ledger
+
+router = APIRouter()
+
+
+def require_admin(key: str | None) -> None:
+    """
+    Check the X-Admin-Key header against ADMIN_API_KEY.
+
+    Raises:
+        HTTPException:
+            - 404 NOT FOUND: ADMIN_API_KEY is not configured, the admin API is disabled.
+            - 403 FORBIDDEN: The key is missing or wrong.
+    """
+    if not config.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="NOT FOUND: The admin API is disabled."
+        )
+    if key != config.ADMIN_API_KEY:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="FORBIDDEN: A valid X-Admin-Key header is required."
+        )
+
+
+@router.get("/admin/quotas")
+async def get_quotas(x_admin_key: str | None = Header(default=None)):
+    """
+    Report upstream quota usage of this worker.
+
+    For each upstream: the total number of requests sent, whether a budget
+    is nearly spent (low-priority enrichment is then deferred), and the
+    usage of each configured rolling window.
+
+    Example:
+        GET /api/v1/admin/quotas
+        X-Admin-Key: <ADMIN_API_KEY>
+
+        Response:
+        {
+            "soft_limit": 0.8,
+            "upstreams": {
+                "lastfm": {
+                    "total_requests": 212,
+                    "nearly_spent": false,
+                    "windows": [{"window": "5m", "budget": 1500, "used": 212, "remaining": 1288, "utilization": 0.141}]
+                },
+                ...
+            }
+        }
+    """
+    require_admin(x_admin_key)
+    return {
+        "soft_limit": config.QUOTA_SOFT_LIMIT,
+        "upstreams": ledger.snapshot(),
+    }
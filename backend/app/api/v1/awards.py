@@ -7,16 +7,23 @@ from The Movie Database (TMDb). Includes comprehensive error handling for API
 failures, rate limiting, and data validation.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Response, status
+from typing import Literal
 import httpx
+from app.core.http_cache import DEGRADED_CACHE_CONTROL
 from app.services.awards_service import fetch_oscar_highlights
+from app.models.year import OscarHighlights
 from app.utils.validate_year import validate_year
 
 
 router = APIRouter()
 
-@router.get("/year/{year}/awards")
-async def get_awards(year: int):
+@router.get(
+    "/year/{year}/awards",
+    response_model=OscarHighlights,
+    response_model_exclude_unset=True,
+)
+async def get_awards(response: Response, year: int, categories: Literal["major", "all"] = "major"):
     """
     Retrieve Oscar highlights for a specific year.
 
@@ -24,8 +31,12 @@ async def get_awards(year: int):
     and Best Actress) for the specified year. Movie posters and actor profile images
     are retrieved from TMDb to enrich the response data.
 
+    With ``?categories=all`` the response also covers directing, supporting roles,
+    screenplay and international feature, each with its own image.
+
     Args:
         year (int): The Oscar ceremony year to retrieve awards for (e.g., 2020).
+        categories (str): "major" (default) or "all" for the expanded category set.
 
     Returns:
         dict: A dictionary containing:
@@ -43,6 +54,9 @@ async def get_awards(year: int):
                     - movie (str): Movie they won for
                     - image (str | None): Profile image path from TMDb
             - source (str): Data source identifier ("The Awards API")
+            - missing_categories (list[str], optional): Categories that could
+              not be loaded; such a partial response is sent with
+              ``Cache-Control: no-store``
 
     Raises:
         HTTPException:
@@ -84,7 +98,7 @@ async def get_awards(year: int):
     validate_year(year)
 
     try:
-        highlights = await fetch_oscar_highlights(year)
+        highlights = await fetch_oscar_highlights(year, categories=categories)
 
     except httpx.HTTPStatusError as e:
         code = e.response.status_code
@@ -113,4 +127,7 @@ async def get_awards(year: int):
             status_code = status.HTTP_404_NOT_FOUND,
             detail = f"NOT FOUND: No Oscar data found for year {year}."
         )
+    if highlights.get("missing_categories"):
+        # Partial result: clients and shared caches must not keep it
+        response.headers["Cache-Control"] = DEGRADED_CACHE_CONTROL
     return highlights
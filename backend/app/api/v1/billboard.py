@@ -2,13 +2,20 @@ from fastapi import APIRouter, HTTPException, status
 from app.services.artist_of_the_year import get_artist_of_the_year, add_artist_images
 from app.clients.artist_img_client import fetch_wiki_image
 from app.services.hit_song_year import get_year_with_hit_songs
+from app.models.year import BillboardArtistsWithImages, BillboardTopSongs
+from app.core.admission import load_cached
+from app.core.cache import year_ttl
 from app.utils.validate_year import validate_year
 import httpx
 
 
 router = APIRouter()
 
-@router.get("/year/{year}/billboard/artist/top-songs")
+@router.get(
+    "/year/{year}/billboard/artist/top-songs",
+    response_model=BillboardTopSongs,
+    response_model_exclude_unset=True,
+)
 async def get_billboard_top_songs(year: int):
     """
     Retrives the top Billboard artists and their hit songs for a given year.
@@ -33,12 +40,18 @@ async def get_billboard_top_songs(year: int):
         - 404 NOT FOUND: No Billboard data exsits for the given year.
         - 429 TOO MANY REQUESTS: The Billboard service rate limit was exceeded.
         - 502 BAD GATEWAY: The Billboard service returned an unexpected error.
-        - 503 SERVICE UNAVAILABLE: A connection error occurred when contacting the Billboard service.         
+        - 503 SERVICE UNAVAILABLE: A connection error occurred when contacting the Billboard service,
+          or too many top-songs requests are already in progress (with Retry-After).
     """
     validate_year(year)
 
     try:
-        result = await get_year_with_hit_songs(year)
+        # One Last.fm call per artist: cache misses go through admission control
+        result = await load_cached(
+            ("billboard_top_songs", year),
+            lambda: get_year_with_hit_songs(year),
+            year_ttl(year),
+        )
     except httpx.HTTPStatusError as e:
         code = e.response.status_code
         if code == 404:
@@ -70,7 +83,11 @@ async def get_billboard_top_songs(year: int):
 
     return result
 
-@router.get("/year/{year}/billboard/artist")
+@router.get(
+    "/year/{year}/billboard/artist",
+    response_model=BillboardArtistsWithImages,
+    response_model_exclude_unset=True,
+)
 async def get_billboard_artists(year:int):
     """
     Retrieve Billboard's top artists for a given year.
@@ -133,5 +150,5 @@ async def get_billboard_artists(year:int):
             detail=f"NOT FOUND: No Billboard data found for year {year}."
         )
 
-    return add_artist_images(base, fetch_wiki_image)
+    return await add_artist_images(base, fetch_wiki_image)
 
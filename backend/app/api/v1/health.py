@@ -0,0 +1,64 @@
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.core import http
+from app.services import warmup
+
+router = APIRouter()
+
+
+@router.get("/health")
+async def get_health():
+    """
+    Report the state of each upstream.
+
+    Each upstream lists its circuit breaker state ("closed", "open" or
+    "half_open"), consecutive failures, seconds until an open breaker lets a
+    probe through, whether its credentials are configured, and its current
+    concurrency limit and in-flight requests. The overall status is
+    "degraded" while any breaker is not closed or any upstream is not
+    configured; the API itself still answers, serving affected sections from
+    cache or reporting them unavailable.
+
+    Example:
+        GET /api/v1/health
+
+        Response:
+        {
+            "status": "degraded",
+            "upstreams": {
+                "awards": {"state": "open", "consecutive_failures": 3, "retry_in": 42.0, "configured": true, ...},
+                "tmdb": {"state": "closed", "consecutive_failures": 0, "retry_in": 0.0, "configured": true, ...}
+            }
+        }
+    """
+    upstreams = http.upstream_health()
+    degraded = any(
+        upstream["state"] != "closed" or not upstream["configured"] for upstream in upstreams.values()
+    )
+    return {
+        "status": "degraded" if degraded else "ok",
+        "upstreams": upstreams,
+    }
+
+
+@router.get("/ready")
+async def get_readiness():
+    """
+    Report whether this worker has finished its startup warm-up.
+
+    Answers 503 while upstream connections are still being opened, so a
+    load balancer only sends traffic to warmed-up workers. Each upstream
+    lists "ok", "timeout" or the error that kept it from connecting.
+
+    Example:
+        GET /api/v1/ready
+
+        Response:
+        {
+            "ready": true,
+            "duration": 0.412,
+            "upstreams": {"wikipedia": "ok", "tmdb": "ok", ..., "spotify_token": "ok"}
+        }
+    """
+    state = warmup.status()
+    return JSONResponse(status_code=200 if state["ready"] else 503, content=state)
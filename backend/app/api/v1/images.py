@@ -0,0 +1,81 @@
+"""
+Image proxy endpoint module.
+
+Serves the TMDb and Wikimedia images referenced by the other endpoints from
+the local disk cache, optionally at a smaller width, so repeat views do not
+touch the image hosts and the timeline gets thumbnails of the size it shows.
+"""
+
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import FileResponse, Response
+import httpx
+
+from app.services.image_proxy import ImageNotFound, get_image
+
+router = APIRouter()
+
+# Cached images never change: the same URL always yields the same bytes
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+@router.get("/img/{source}/{path:path}")
+async def get_proxied_image(
+    request: Request,
+    source: str,
+    path: str,
+    w: int | None = Query(None, ge=16, le=4096, description="Desired width in pixels"),
+):
+    """
+    Serve an image through the local image cache.
+
+    Args:
+        source (str): "tmdb" for TMDb image paths (``poster``, ``image``
+            fields of the movie and award endpoints, e.g.
+            ``/api/v1/img/tmdb/abc.jpg``) or "wikimedia" for
+            upload.wikimedia.org URLs (artist and Nobel laureate images, e.g.
+            ``/api/v1/img/wikimedia/wikipedia/commons/a/ab/File.jpg``).
+        path (str): Image path within the source.
+        w (int | None): Desired width. Rounded up to the nearest width the
+            image host renders; the original size without it.
+
+    Returns:
+        FileResponse: The image, with a long-lived Cache-Control header and
+        the content hash as ETag (304 if it matches If-None-Match).
+
+    Raises:
+        HTTPException:
+            - 404 NOT FOUND: Unknown source, invalid path, or no such image.
+            - 502 BAD GATEWAY: The image host returned an error.
+            - 503 SERVICE UNAVAILABLE: The image host could not be reached.
+    """
+    try:
+        image = await get_image(source, path, w)
+    except ImageNotFound:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="NOT FOUND: No such image."
+        )
+    except httpx.HTTPStatusError as e:
+        code = e.response.status_code
+        if code in (400, 403, 404):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="NOT FOUND: No such image."
+            )
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"BAD GATEWAY: Image host returned {code}."
+        )
+    except httpx.RequestError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="SERVICE UNAVAILABLE: An error occurred while trying to connect to the image host."
+        )
+
+    etag = f'"{image.digest}"'
+    headers = {"Cache-Control": CACHE_CONTROL, "ETag": etag}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    # FileResponse streams the file from disk (zero-copy where the server supports it)
+    return FileResponse(image.path, media_type=image.content_type, headers=headers)
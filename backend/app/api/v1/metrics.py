@@ -0,0 +1,16 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from app.core import metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """
+    Expose in-process metrics in the Prometheus text format.
+
+    Includes the adaptive concurrency limit, in-flight requests and queue
+    depth per upstream, and upstream request counts by status.
+    """
+    return metrics.render()
@@ -4,18 +4,27 @@ Movies and TV Series API endpoints module.
 This module provides API endpoints for retrieving top-rated movies and TV series
 for a specific year using The Movie Database (TMDb) API. Includes comprehensive
 error handling for API failures, rate limiting, and data validation.
+
+Cross-year search endpoints are answered from the local media index instead
+of calling TMDb live.
 """
 
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Query, status
+from typing import Literal
 from app.services.movie_service import fetch_movies_for_year
 from app.services.movie_service import fetch_series_for_year
+from app.models.year import MoviesSection, SeriesSection
 from app.utils.validate_year import validate_year
 import httpx
 
 
 router = APIRouter()
 
-@router.get("/year/{year}/movies")
+@router.get(
+    "/year/{year}/movies",
+    response_model=MoviesSection,
+    response_model_exclude_unset=True,
+)
 async def get_movies(year: int):
     """
     Retrieve top-rated movies for a specific year.
@@ -100,8 +109,12 @@ async def get_movies(year: int):
 
     return movies
 
-@router.get("/year/{year}/series")
-async def get_series(year: int):
+@router.get(
+    "/year/{year}/series",
+    response_model=SeriesSection,
+    response_model_exclude_unset=True,
+)
+async def get_series(year: int, pages: int | None = Query(default=None, ge=1, le=10)):
     """
     Retrieve top-rated TV series for a specific year.
 
@@ -111,6 +124,8 @@ async def get_series(year: int):
 
     Args:
         year (int): The air year to retrieve TV series for (e.g., 2020).
+        pages (int | None): Number of TMDb discover pages (20 series each) to
+            rank across. Defaults to the server configuration.
 
     Returns:
         dict: A dictionary containing:
@@ -158,7 +173,7 @@ async def get_series(year: int):
     validate_year(year)
 
     try:
-        series = await fetch_series_for_year(year)
+        series = await fetch_series_for_year(year, pages=pages)
 
     except httpx.HTTPStatusError as e:
         code = e.response.status_code
@@ -184,3 +199,126 @@ async def get_series(year: int):
         )
 
     return series
+
+
+def search_media(
+    kind: str,
+    min_rating: float,
+    min_votes: int,
+    from_year: int | None,
+    to_year: int | None,
+    sort: str,
+    limit: int,
+) -> dict:
+    """
+    Run a filter query against the media index for "movies" or "series".
+
+    Raises:
+        HTTPException:
+            - 400: Invalid year range
+            - 503: The media index has not been built yet
+    """
+    for year in (from_year, to_year):
+        if year is not None:
+            validate_year(year)
+
+    if from_year is not None and to_year is not None and from_year > to_year:
+        raise HTTPException(
+            status_code = status.HTTP_400_BAD_REQUEST,
+            detail = "BAD REQUEST: 'from' must not be after 'to'."
+        )
+
+    # Imported on first use: the index module loads numpy, which takes tens of milliseconds
+    from app.services.media_index import get_media_index
+
+    index = get_media_index(kind)
+    if index is None:
+        raise HTTPException(
+            status_code = status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail = f"SERVICE UNAVAILABLE: The {kind} index has not been built yet."
+        )
+
+    results = index.search(
+        min_rating=min_rating,
+        min_votes=min_votes,
+        from_year=from_year,
+        to_year=to_year,
+        sort=sort,
+        limit=limit,
+    )
+
+    return {
+        "from": from_year,
+        "to": to_year,
+        "sort": sort,
+        "results": results,
+        "source": "TMDb",
+    }
+
+
+@router.get("/movies/search")
+async def search_movies(
+    min_rating: float = Query(default=0, ge=0, le=10),
+    min_votes: int = Query(default=0, ge=0),
+    from_year: int | None = Query(default=None, alias="from"),
+    to_year: int | None = Query(default=None, alias="to"),
+    sort: Literal["votes", "rating", "popularity", "year"] = "votes",
+    limit: int = Query(default=20, ge=1, le=100),
+):
+    """
+    Search top movies across years.
+
+    Answers filter queries from the local media index built from the yearly
+    top movie lists, so no TMDb request is made.
+
+    Args:
+        min_rating (float): Minimum average rating (0-10).
+        min_votes (int): Minimum number of votes.
+        from (int | None): First release year to include.
+        to (int | None): Last release year to include.
+        sort (str): "votes", "rating" or "popularity" (descending) or "year" (ascending).
+        limit (int): Maximum number of results (1-100).
+
+    Returns:
+        dict: A dictionary containing:
+            - from (int | None), to (int | None), sort (str): The applied query
+            - results (list): Movies with year, title, rating, votes,
+              popularity, poster and release_date
+            - source (str): Data source identifier ("TMDb")
+
+    Raises:
+        HTTPException:
+            - 400: Invalid year or year range
+            - 503: The movie index has not been built yet
+
+    Example:
+        GET /api/v1/movies/search?min_rating=8&from=1990&to=1999&sort=rating
+    """
+    return search_media("movies", min_rating, min_votes, from_year, to_year, sort, limit)
+
+
+@router.get("/series/search")
+async def search_series(
+    min_rating: float = Query(default=0, ge=0, le=10),
+    min_votes: int = Query(default=0, ge=0),
+    from_year: int | None = Query(default=None, alias="from"),
+    to_year: int | None = Query(default=None, alias="to"),
+    sort: Literal["votes", "rating", "popularity", "year"] = "votes",
+    limit: int = Query(default=20, ge=1, le=100),
+):
+    """
+    Search top TV series across years.
+
+    Same query parameters and response shape as /movies/search, answered
+    from the local series index. A series listed in several years is
+    returned once.
+
+    Raises:
+        HTTPException:
+            - 400: Invalid year or year range
+            - 503: The series index has not been built yet
+
+    Example:
+        GET /api/v1/series/search?min_votes=5000&from=2010&sort=popularity
+    """
+    return search_media("series", min_rating, min_votes, from_year, to_year, sort, limit)
@@ -1,20 +1,30 @@
 from fastapi import APIRouter, HTTPException
+from typing import Literal
 import httpx
 from app.services.music_service import fetch_songs_for_year, fetch_artists_for_year
+from app.models.year import SongsSection
 router = APIRouter()
 
 @router.get("/year/{year}/artists") # Används inte ännu
-def get_artists(year: int):
+async def get_artists(year: int):
 
-    return fetch_artists_for_year(year)
+    return await fetch_artists_for_year(year)
 
 
-@router.get("/year/{year}/songs")
-def get_songs(year: int):
+@router.get(
+    "/year/{year}/songs",
+    response_model=SongsSection,
+    response_model_exclude_unset=True,
+)
+async def get_songs(year: int, mode: Literal["sample", "top"] = "sample", seed: int | None = None):
     """
     Retrieve top songs for a specific year from Spotify.
+    The selection is deterministic for a given year, mode and seed, so the
+    response can be cached.
     Args:
         year (int): The year to retrieve songs for (e.g., 2020).
+        mode (str): "sample" (default) for a seeded sample, "top" for the most popular songs.
+        seed (int | None): Seed for "sample" mode. Defaults to the year.
     Returns:
         dict: If no error, returns a dictionary containing the year and a list of top songs.
         Else, raises HTTPException with appropriate status code and detail message.
@@ -22,7 +32,7 @@ def get_songs(year: int):
         HTTPException: Raises appropriate HTTP exceptions for various error scenarios.
     """
     try:
-        songs = fetch_songs_for_year(year)
+        songs = await fetch_songs_for_year(year, mode=mode, seed=seed)
         return songs
     
     except httpx.HTTPStatusError as error:
@@ -1,11 +1,16 @@
 from fastapi import APIRouter, HTTPException, status
 import httpx
 from app.services.nobel_service import get_nobel_prizes
+from app.models.year import NobelPrizes
 from app.utils.validate_year import validate_year
 
 router = APIRouter()
 
-@router.get("/year/{year}/nobel")
+@router.get(
+    "/year/{year}/nobel",
+    response_model=NobelPrizes,
+    response_model_exclude_unset=True,
+)
 async def year_nobel(year: int):
     validate_year(year)
 
@@ -1,13 +1,19 @@
 from fastapi import APIRouter, HTTPException, status
 import httpx
 from app.services.wiki_service import fetch_year_summary
+from app.models.year import YearEvents
 from app.utils.validate_year import validate_year
 
 router = APIRouter()
 
 
 
-@router.get("/year/{year}/wiki", status_code=status.HTTP_200_OK)
+@router.get(
+    "/year/{year}/wiki",
+    status_code=status.HTTP_200_OK,
+    response_model=YearEvents,
+    response_model_exclude_unset=True,
+)
 async def get_year(year: int):
     validate_year(year)
 
@@ -4,10 +4,34 @@ Year API endpoint module.
 This module provides API endpoints for retrieving comprehensive year data,
 including historical events, movies, TV series, music charts, and award information.
 All data is fetched concurrently from multiple external APIs for optimal performance.
+
+If an upstream fails, its circuit breaker is open, or a section does not
+finish before the request deadline, only the sections that depend on it are
+affected: they are served from the last successful result for that year, or
+returned as null and listed as unavailable.
+
+Complete responses are cached per year. Cache misses run under admission
+control (app.core.admission), so a traffic spike is shed with 503 instead of
+starting an unbounded number of aggregations.
+
+Image lookups are the slowest and least important part of a year. With
+?images=deferred the year response skips the Oscar image lookups and links
+to /year/{year}/images, which resolves every image URL of the year in one
+cacheable call, reusing the sections the year response just loaded.
 """
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request, Response
+from typing import Any, Awaitable, Literal
 import asyncio
+import httpx
+import logging
+
+from app.core import deadline, quota
+from app.core.admission import load_cached
+from app.core.cache import cache, year_ttl
+from app.core.compression import EncodedPayload
+from app.core.http_cache import DEGRADED_CACHE_CONTROL
+from app.models.year import YearImagesResponse, YearResponse
 
 from app.services.awards_service import fetch_oscar_highlights
 from app.services.movie_service import fetch_movies_for_year, fetch_series_for_year
@@ -15,12 +39,107 @@ from app.services.wiki_service import fetch_year_summary
 from app.services.artist_of_the_year import get_artist_of_the_year
 from app.services.hit_song_year import get_year_with_hit_songs
 from app.services.nobel_service import get_nobel_prizes
+from app.services.image_service import fetch_artist_images, fetch_oscar_images, nobel_images
 from app.services.music_service import fetch_songs_for_year
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+
+async def load_section(name: str, year: int, loader: Awaitable[Any]) -> tuple[Any, str]:
+    """
+    Load one section of the year response, falling back to its last known value.
+
+    Args:
+        name (str): Section name, as used in the response.
+        year (int): The requested year.
+        loader (Awaitable): The service call producing the section.
+
+    Returns:
+        tuple[Any, str]: The section value and its status: "ok", "stale"
+        (last successful value, served because the upstream failed or only
+        returned part of the section) or "unavailable" (the section failed
+        and nothing is cached, value is None). A section is partial if some
+        categories are missing or some enrichment was skipped
+        (quota.track_skipped); partial sections are never cached.
+    """
+    key = ("year_section", name, year)
+    try:
+        with quota.track_skipped() as skipped:
+            # Cancelled when the request deadline passes
+            value = await deadline.run(loader)
+    except Exception as e:
+        # Any failure only degrades this section. CancelledError is not an
+        # Exception, so a cancelled request still stops here.
+        if isinstance(e, (httpx.HTTPError, deadline.DeadlineExceeded)):
+            # HTTPError includes CircuitOpenError, raised without calling the upstream
+            logger.info("Section %s of %d failed: %r", name, year, e)
+        else:
+            logger.warning("Section %s of %d failed", name, year, exc_info=True)
+        entry = await cache.get_entry(key)
+        if entry is None:
+            return None, "unavailable"
+        return entry.value, "stale"
 
-@router.get("/year/{year}")
-async def get_year(year: int):
+    if skipped or (isinstance(value, dict) and value.get("missing_categories")):
+        # Partial result: never cached, and the last complete one is preferred
+        entry = await cache.get_entry(key)
+        return (value if entry is None else entry.value), "stale"
+
+    await cache.set(key, value, year_ttl(year))
+    return value, "ok"
+
+
+async def gather_sections(year: int, sections: dict[str, Awaitable[Any]]) -> dict:
+    """
+    Load sections concurrently with load_section().
+
+    Returns:
+        dict: The year, every section by name, and the stale_sections and
+        unavailable_sections lists.
+    """
+    results = await asyncio.gather(
+        *(load_section(name, year, loader) for name, loader in sections.items())
+    )
+
+    response = {"year": year}
+    stale, unavailable = [], []
+    for name, (value, status) in zip(sections, results):
+        response[name] = value
+        if status == "stale":
+            stale.append(name)
+        elif status == "unavailable":
+            unavailable.append(name)
+
+    response["stale_sections"] = stale
+    response["unavailable_sections"] = unavailable
+    return response
+
+
+async def load_degradable(key: tuple, loader, ttl: float, request: Request) -> Response:
+    """
+    Serve a gather_sections() response under admission control, without
+    keeping degraded responses in the cache, nor letting clients keep them.
+
+    The response is cached serialized and compressed (EncodedPayload), so
+    cache hits send stored bytes.
+    """
+    async def load_encoded():
+        data = await loader()
+        # Serializing and compressing a year takes milliseconds; keep it off the event loop
+        return await asyncio.to_thread(EncodedPayload.from_data, data)
+
+    payload = await load_cached(key, load_encoded, ttl)
+    headers = None
+    if payload.data["stale_sections"] or payload.data["unavailable_sections"]:
+        # Do not keep a degraded response, the next request should try again
+        await cache.delete(key)
+        headers = {"Cache-Control": DEGRADED_CACHE_CONTROL}
+    return payload.response(request, headers)
+
+
+@router.get("/year/{year}", responses={200: {"model": YearResponse}})
+async def get_year(request: Request, year: int, images: Literal["inline", "deferred"] = "inline"):
     """
     Retrieve comprehensive data for a specific year.
 
@@ -30,6 +149,13 @@ async def get_year(year: int):
 
     Args:
         year (int): The year to retrieve data for (e.g., 2020).
+        images (str): "inline" (default) looks up the Oscar images from TMDb
+            as part of the response. "deferred" leaves the Oscar posters and
+            photos as null and adds an ``images`` link to /year/{year}/images,
+            so the text data is not held up by the TMDb lookups. Only the
+            Oscar images are deferred: the year response has no artist
+            images either way (they are only in /images), and laureate
+            images come with the Nobel prizes page that is read anyway.
 
     Returns:
         dict: A dictionary containing:
@@ -41,6 +167,13 @@ async def get_year(year: int):
             - billboard_top_artists (dict): Billboard Hot 100 chart-topping artists
             - billboard_artist_top_songs (dict): Top songs for each artist
             - nobel_prizes (dict): Nobel Prize winners for the year
+            - spotify_songs (dict): Songs from the year on Spotify
+            - stale_sections (list[str]): Sections served from an earlier
+              result because their upstream failed, or only partially loaded
+            - unavailable_sections (list[str]): Sections that could not be
+              loaded; their value is null
+            - images (str, deferred only): Path of the images endpoint for
+              this year
 
     Example:
         GET /api/v1/year/2020
@@ -61,26 +194,97 @@ async def get_year(year: int):
         All external API calls run concurrently, so the total response time
         is approximately equal to the slowest API call rather than the sum
         of all calls.
+
+    Raises:
+        Overloaded: If the request is a cache miss and admission control
+            sheds it (503 with Retry-After).
     """
-    # Run all API calls concurrently for maximum performance
-    events, movie_highlights, movies, series, billboard_artists, billboard_songs, nobel = await asyncio.gather(
-        fetch_year_summary(year),
-        fetch_oscar_highlights(year),
-        fetch_movies_for_year(year),
-        fetch_series_for_year(year),
-        get_artist_of_the_year(year),
-        get_year_with_hit_songs(year),
-        get_nobel_prizes(year)
+    deferred = images == "deferred"
+    return await load_degradable(
+        ("year", year, images), lambda: aggregate_year(year, deferred_images=deferred), year_ttl(year), request
     )
 
-    return {
-        "year": year,
-        "events_by_month": events,
-        "movie_highlights": movie_highlights,
-        "movies": movies,
-        "series": series,
-        "billboard_top_artists": billboard_artists,
-        "billboard_artist_top_songs": billboard_songs,
-        "nobel_prizes": nobel,
-        "spotify_songs": fetch_songs_for_year(year)
+
+@router.get("/year/{year}/images", responses={200: {"model": YearImagesResponse}})
+async def get_year_images(request: Request, year: int):
+    """
+    Resolve every image URL of a year in one call.
+
+    Companion of ``GET /year/{year}?images=deferred``: the client renders the
+    text data first and fills in the images from this response. Cached per
+    year like the year response.
+
+    Args:
+        year (int): The year to retrieve images for.
+
+    Returns:
+        dict: A dictionary containing:
+            - year (int): The requested year
+            - oscars (dict): Per category, the ``poster`` or ``image`` field
+              of ``movie_highlights.oscars`` (TMDb paths)
+            - artists (dict): Wikipedia image URL per Billboard artist
+            - nobel (dict): Image URL per laureate, per prize category
+            - stale_sections (list[str]), unavailable_sections (list[str]):
+              As in the year response
+
+    Raises:
+        Overloaded: If the request is a cache miss and admission control
+            sheds it (503 with Retry-After).
+    """
+    return await load_degradable(
+        ("year_images", year), lambda: aggregate_images(year), year_ttl(year), request
+    )
+
+
+async def aggregate_year(year: int, *, deferred_images: bool = False) -> dict:
+    """
+    Fetch every section of the year response concurrently. See get_year().
+    """
+    sections = {
+        "events_by_month": fetch_year_summary(year),
+        "movie_highlights": fetch_oscar_highlights(year, images=not deferred_images),
+        "movies": fetch_movies_for_year(year),
+        "series": fetch_series_for_year(year),
+        "billboard_top_artists": get_artist_of_the_year(year),
+        "billboard_artist_top_songs": get_year_with_hit_songs(year),
+        "nobel_prizes": get_nobel_prizes(year),
+        "spotify_songs": fetch_songs_for_year(year),
     }
+
+    # Run all API calls concurrently for maximum performance
+    response = await gather_sections(year, sections)
+    if deferred_images:
+        response["images"] = f"/api/v1/year/{year}/images"
+    return response
+
+
+# The image sections below reuse the sections of a recent year response if
+# there are any (the deferred year request usually just loaded them), so only
+# the image lookups themselves call upstreams
+
+async def oscar_section_images(year: int) -> dict:
+    highlights = await cache.get(("year_section", "movie_highlights", year))
+    return await fetch_oscar_images(year, highlights)
+
+
+async def artist_section_images(year: int) -> dict:
+    artists = await cache.get(("year_section", "billboard_top_artists", year))
+    return await fetch_artist_images(year, artists)
+
+
+async def nobel_section_images(year: int) -> dict:
+    nobel_prizes = await cache.get(("year_section", "nobel_prizes", year))
+    if nobel_prizes is None:
+        nobel_prizes = await get_nobel_prizes(year)
+    return nobel_images(nobel_prizes)
+
+
+async def aggregate_images(year: int) -> dict:
+    """
+    Fetch the image sections of a year concurrently. See get_year_images().
+    """
+    return await gather_sections(year, {
+        "oscars": oscar_section_images(year),
+        "artists": artist_section_images(year),
+        "nobel": nobel_section_images(year),
+    })
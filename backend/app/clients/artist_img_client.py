@@ -1,11 +1,11 @@
 import urllib.parse
-import httpx
+from app.core import http
 
 WIKI_SUMMARY = "https://en.wikipedia.org/api/rest_v1/page/summary"
 HEADERS = {"User-Agent": "WikiCap/1.0 (https://github.com/WikiCap/year-overview)"}
 
 
-def fetch_wiki_image(title:str) -> str | None:
+async def fetch_wiki_image(title:str) -> str | None:
     """
     Fetch the main image URL for a given Wikipedia page title.
     
@@ -26,7 +26,7 @@ def fetch_wiki_image(title:str) -> str | None:
     safe_title = urllib.parse.quote(title.replace(" ", "_"))
     url = f"{WIKI_SUMMARY}/{safe_title}"
     
-    response = httpx.get(url, headers=HEADERS, timeout=10)
+    response = await http.get("wikipedia", url, headers=HEADERS)
     response.raise_for_status()
     
     data = response.json()
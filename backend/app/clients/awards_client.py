@@ -7,7 +7,7 @@ to retrieve Oscar (Academy Awards) data including editions, categories, and nomi
 API Documentation: https://theawards.vercel.app/api
 """
 
-import httpx
+from app.core import http
 
 BASE_AWARDS_URL = "https://theawards.vercel.app/api"
 
@@ -37,14 +37,43 @@ async def get_oscar_edition_by_year(year: int):
         await get_oscar_edition_by_year(2020)
         [{"id": 92, "year": 2020, "date": "2020-02-09", ...}]
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BASE_AWARDS_URL}/oscars/editions",
-            params={"year": year},
-            headers={"accept": "application/json"},
-        )
-        response.raise_for_status()
-        return response.json()
+    response = await http.get(
+        "awards",
+        f"{BASE_AWARDS_URL}/oscars/editions",
+        params={"year": year},
+        headers={"accept": "application/json"},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_oscar_editions():
+    """
+    Fetch metadata for every Oscar edition known to The Awards API.
+
+    Used to build the local Oscar index in bulk, so regular requests do not
+    have to look up the edition id for a year one call at a time.
+
+    Returns:
+        list[dict]: List of Oscar edition objects, each containing at least:
+            - id (int): Edition ID for use in subsequent API calls
+            - year (int): The ceremony year
+
+    Raises:
+        httpx.HTTPStatusError: If the API returns a non-2xx status code
+        httpx.RequestError: If the request fails due to network issues
+
+    Example:
+        await get_oscar_editions()
+        [{"id": 1, "year": 1929, ...}, ..., {"id": 92, "year": 2020, ...}]
+    """
+    response = await http.get(
+        "awards",
+        f"{BASE_AWARDS_URL}/oscars/editions",
+        headers={"accept": "application/json"},
+    )
+    response.raise_for_status()
+    return response.json()
 
 
 async def get_oscar_categories(edition_id: int):
@@ -74,13 +103,13 @@ async def get_oscar_categories(edition_id: int):
             {"id": 2, "name": "Actor In A Leading Role", ...}
         ]
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BASE_AWARDS_URL}/oscars/editions/{edition_id}/categories",
-            headers={"accept": "application/json"},
-        )
-        response.raise_for_status()
-        return response.json()
+    response = await http.get(
+        "awards",
+        f"{BASE_AWARDS_URL}/oscars/editions/{edition_id}/categories",
+        headers={"accept": "application/json"},
+    )
+    response.raise_for_status()
+    return response.json()
 
 
 async def get_oscar_category_details(edition_id: int, category_id: int):
@@ -112,10 +141,10 @@ async def get_oscar_category_details(edition_id: int, category_id: int):
             {"id": 124, "name": "Leonardo DiCaprio", "winner": False, "more": "Once Upon a Time..."}
         ]
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BASE_AWARDS_URL}/oscars/editions/{edition_id}/categories/{category_id}/nominees",
-            headers={"accept": "application/json"},
-        )
-        response.raise_for_status()
-        return response.json()
+    response = await http.get(
+        "awards",
+        f"{BASE_AWARDS_URL}/oscars/editions/{edition_id}/categories/{category_id}/nominees",
+        headers={"accept": "application/json"},
+    )
+    response.raise_for_status()
+    return response.json()
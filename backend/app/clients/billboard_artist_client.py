@@ -1,5 +1,4 @@
-import httpx
-import os
+from app.core import config, http
 
 HEADERS = {
     "User-Agent": "WikiCap/1.0 (https://github.com/WikiCap/year-overview)"
@@ -32,14 +31,12 @@ async def get_billboard_page(year: int) -> str | None:
     else: 
         url = ( f"https://en.wikipedia.org/wiki/List_of_Billboard_Hot_100_number-one_singles_of_{year}")
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, headers=HEADERS, timeout=20.0, follow_redirects=True)
-        response.raise_for_status()
+    response = await http.get("wikipedia", url, headers=HEADERS, follow_redirects=True)
+    response.raise_for_status()
 
     return response.text
 
 URL = "https://ws.audioscrobbler.com/2.0/"
-LASTFM_API_KEY = os.getenv("LASTFM_API_KEY")
 
 
 async def get_artist_lastfm(artist_name: str, limit: int=9) ->list[str]:
@@ -66,15 +63,14 @@ async def get_artist_lastfm(artist_name: str, limit: int=9) ->list[str]:
     params = {
         "method": "artist.search",
         "artist": artist_name,
-        "api_key": LASTFM_API_KEY,
+        "api_key": config.LASTFM_API_KEY,
         "format": "json",
         "limit": limit,
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.get(URL, params=params, timeout=15)
-        response.raise_for_status()
-    
+    response = await http.get("lastfm", URL, params=params)
+    response.raise_for_status()
+
     api_data = response.json()
     
     results = api_data.get("results")
@@ -125,16 +121,15 @@ async def get_hit_song(artist: str, limit: int=5) -> list[dict]:
     params = {
         "method": "artist.gettoptracks",
         "artist": artist,
-        "api_key": LASTFM_API_KEY,
+        "api_key": config.LASTFM_API_KEY,
         "format": "json",
         "limit": limit,
         "autocorrect": 1,
     }
         
-    async with httpx.AsyncClient() as client:
-        response = await client.get(URL, params=params, timeout=15)
-        response.raise_for_status()
-        
+    response = await http.get("lastfm", URL, params=params)
+    response.raise_for_status()
+    
     data = response.json()
 
     top_tracks = data.get("toptracks")
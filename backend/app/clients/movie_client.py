@@ -4,20 +4,31 @@ TMDb (The Movie Database) API client module.
 This module provides async HTTP client functions for interacting with The Movie
 Database (TMDb) API v3. Handles authentication, request construction, and returns
 raw JSON responses for movies, TV series, and person search operations.
+All calls go through app.core.http, sharing one pooled client and the TMDb
+concurrency limiter.
 
 API Documentation: https://developers.themoviedb.org/3
 """
 
 from app.core import config
-import httpx
+from app.core import http
 
 BASE_URL = "https://api.themoviedb.org/3"
-HEADERS = {
-    "Accept": "application/json",
-    "Authorization": "Bearer " + config.TMDB_API_KEY,
-}
 
-async def get_top_movies_by_year(year: int):
+def tmdb_headers() -> dict[str, str]:
+    """
+    Build the TMDb request headers.
+
+    Built per call rather than at import: without TMDB_API_KEY the app still
+    starts, and app.core.http refuses TMDb calls instead.
+    """
+    return {
+        "Accept": "application/json",
+        "Authorization": f"Bearer {config.TMDB_API_KEY}",
+    }
+
+
+async def get_top_movies_by_year(year: int, page: int = 1):
     """
     Fetch top-rated movies for a specific release year from TMDb.
 
@@ -29,6 +40,7 @@ async def get_top_movies_by_year(year: int):
 
     Args:
         year (int): The primary release year to filter by.
+        page (int): Discover results page to fetch (20 results per page). Defaults to 1.
 
     Returns:
         dict: Raw TMDb API response containing:
@@ -46,21 +58,23 @@ async def get_top_movies_by_year(year: int):
         await get_top_movies_by_year(2020)
         {"results": [...], "page": 1, "total_results": 42, ...}
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BASE_URL}/discover/movie",
-            headers=HEADERS,
-            params={
-                "primary_release_year": year,
-                "sort_by": "vote_count.desc",
-                "vote_average.gte": 7,
-                "vote_count.gte": 1000,
-            }
-        )
-        return response.json()
-
-
-async def get_top_series_by_year(year: int):
+    response = await http.get(
+        "tmdb",
+        f"{BASE_URL}/discover/movie",
+        headers=tmdb_headers(),
+        params={
+            "primary_release_year": year,
+            "sort_by": "vote_count.desc",
+            "vote_average.gte": 7,
+            "vote_count.gte": 1000,
+            "page": page,
+        }
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_top_series_by_year(year: int, page: int = 1):
     """
     Fetch top-rated TV series that aired during a specific year from TMDb.
 
@@ -73,6 +87,7 @@ async def get_top_series_by_year(year: int):
 
     Args:
         year (int): The year to filter series by (based on air date).
+        page (int): Discover results page to fetch (20 results per page). Defaults to 1.
 
     Returns:
         dict: Raw TMDb API response containing:
@@ -90,20 +105,22 @@ async def get_top_series_by_year(year: int):
         await get_top_series_by_year(2020)
         {"results": [...], "page": 1, "total_results": 38, ...}
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BASE_URL}/discover/tv",
-            headers=HEADERS,
-            params={
-                "air_date.gte": f"{year}-01-01",
-                "air_date.lte": f"{year}-12-31",
-                "sort_by": "popularity.desc",
-                "vote_count.gte": 1000,
-                "vote_average.gte": 7,
-                "include_null_first_air_dates": False,
-            }
-        )
-        return response.json()
+    response = await http.get(
+        "tmdb",
+        f"{BASE_URL}/discover/tv",
+        headers=tmdb_headers(),
+        params={
+            "air_date.gte": f"{year}-01-01",
+            "air_date.lte": f"{year}-12-31",
+            "sort_by": "popularity.desc",
+            "vote_count.gte": 1000,
+            "vote_average.gte": 7,
+            "include_null_first_air_dates": False,
+            "page": page,
+        }
+    )
+    response.raise_for_status()
+    return response.json()
 
 
 async def search_movie_by_title(title: str, year: int | None = None):
@@ -145,14 +162,15 @@ async def search_movie_by_title(title: str, year: int | None = None):
     if year:
         params["year"] = year
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BASE_URL}/search/movie",
-            headers=HEADERS,
-            params=params,
-        )
-        results = response.json().get("results", [])
-        return results[0] if results else None
+    response = await http.get(
+        "tmdb",
+        f"{BASE_URL}/search/movie",
+        headers=tmdb_headers(),
+        params=params,
+    )
+    response.raise_for_status()
+    results = response.json().get("results", [])
+    return results[0] if results else None
 
 
 async def search_person_by_name(name: str):
@@ -187,14 +205,15 @@ async def search_person_by_name(name: str):
         await search_person_by_name("NonexistentActor12345")
         None
     """
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            f"{BASE_URL}/search/person",
-            headers=HEADERS,
-            params={
-                "query": name,
-                "include_adult": False,
-            }
-        )
-        results = response.json().get("results", [])
-        return results[0] if results else None
+    response = await http.get(
+        "tmdb",
+        f"{BASE_URL}/search/person",
+        headers=tmdb_headers(),
+        params={
+            "query": name,
+            "include_adult": False,
+        }
+    )
+    response.raise_for_status()
+    results = response.json().get("results", [])
+    return results[0] if results else None
@@ -1,38 +1,19 @@
+import asyncio
 import base64
-import json
 from app.core import config
+from app.core import http
+from app.core.cache import TTLCache
 import httpx
 
 SPOTIFY_BASE_URL = "https://api.spotify.com/v1/search"
 SPOTIFY_TOKEN_URL = "https://accounts.spotify.com/api/token"
 
-spotify_client_id = config.SPOTIFY_CLIENT_ID
-spotify_client_secret = config.SPOTIFY_CLIENT_SECRET
+# Client-credentials tokens are valid for an hour; renew a minute early
+TOKEN_TTL = 3600 - 60
+TOKEN_KEY = "spotify_token"
 
-def get_spotify_token():
-    """
-    Retrieves an access token from the Spotify API using client credentials.
-    Token is required for making authorized requests to Spotify endpoints.
-    Token is valid for 1 hour.
-    
-    Returns: 
-        json: Access token string.
-    """
-
-    auth_string = f"{spotify_client_id}:{spotify_client_secret}"
-    auth_base64 = base64.b64encode(auth_string.encode()).decode()
-    
-    response = httpx.post(
-        SPOTIFY_TOKEN_URL,
-        headers={
-            "Authorization": f"Basic {auth_base64}",
-            "Content-Type": "application/x-www-form-urlencoded",
-        },
-        data={"grant_type": "client_credentials"}
-    )
-    response.raise_for_status()
-
-    return response.json()["access_token"]
+# In memory only: the token must not end up in a shared cache file
+_token_cache = TTLCache()
 
 def get_auth_header(token):
     """
@@ -46,7 +27,7 @@ def get_auth_header(token):
     spotify_token = token
     return {"Authorization": f"Bearer {spotify_token}"}
 
-def get_artists_by_year(year: int, token):
+async def get_artists_by_year(year: int, token):
     """
     Fetches artists from Spotify released in a specific year.
     Args:
@@ -56,7 +37,8 @@ def get_artists_by_year(year: int, token):
         list: A list of artist items from Spotify.
     """
 
-    response = httpx.get(
+    response = await http.get(
+        "spotify",
         SPOTIFY_BASE_URL,
         headers=token,
         params={
@@ -68,30 +50,137 @@ def get_artists_by_year(year: int, token):
     
     return response.json()["artists"]["items"]
 
-def get_songs_by_year(year: int, headers):
+
+async def get_cached_spotify_token(*, refresh: bool = False) -> str:
     """
-    Fetches songs from Spotify released in a specific year.
+    Returns a Spotify access token, requesting a new one only when needed.
+    The token is reused until shortly before it expires (tokens are valid for 1 hour),
+    and concurrent callers share a single token request.
+    Args:
+        refresh (bool): Request a new token even if the cached one is still valid.
+    Returns:
+        str: Access token string.
+    """
+    if refresh:
+        await _token_cache.delete(TOKEN_KEY)
+    return await _token_cache.get_or_load(TOKEN_KEY, fetch_spotify_token, TOKEN_TTL)
+
+
+async def fetch_spotify_token() -> str:
+    """
+    Requests a new client-credentials access token from Spotify.
+    Returns:
+        str: Access token string.
+    """
+    auth_string = f"{config.SPOTIFY_CLIENT_ID}:{config.SPOTIFY_CLIENT_SECRET}"
+    auth_base64 = base64.b64encode(auth_string.encode()).decode()
+
+    response = await http.request(
+        "spotify",
+        "POST",
+        SPOTIFY_TOKEN_URL,
+        headers={
+            "Authorization": f"Basic {auth_base64}",
+            "Content-Type": "application/x-www-form-urlencoded",
+        },
+        data={"grant_type": "client_credentials"}
+    )
+    response.raise_for_status()
+
+    return response.json()["access_token"]
+
+async def search_tracks(year: int, token: str, *, offset: int = 0, limit: int = 50) -> list[dict]:
+    """
+    Fetches one page of Spotify track search results for a specific year.
     Args:
         year (int): The year to search for songs.
         token (str): The access token for Spotify API.
+        offset (int): Index of the first result to return.
+        limit (int): Number of results to return (max 50).
     Returns:
         list: A list of song items from Spotify.
     """
-
-    response = httpx.get(
+    response = await http.get(
+        "spotify",
         SPOTIFY_BASE_URL,
-        headers=headers,
+        headers=get_auth_header(token),
         params={
             "q": f"year:{year}",
             "type": "track",
-            "limit": 30,
+            "limit": limit,
+            "offset": offset,
         }
     )
     response.raise_for_status()
 
-    songs = response.json()["tracks"]["items"]
-    if not songs:
-        print("No songs found for the given year.")
-        return []
-    
-    return songs
\ No newline at end of file
+    return response.json()["tracks"]["items"]
+
+def compact_track(item: dict) -> dict:
+    """
+    Keeps only the fields of a Spotify track item that the songs section uses.
+    Args:
+        item (dict): A Spotify track item.
+    Returns:
+        dict: Compact track with id, isrc, popularity and display fields.
+    """
+    images = item["album"].get("images") or []
+    return {
+        "id": item["id"],
+        "isrc": item.get("external_ids", {}).get("isrc"),
+        "popularity": item.get("popularity", 0),
+        "name": item["name"],
+        "artist": item["artists"][0]["name"],
+        "album": item["album"]["name"],
+        "release_date": item["album"]["release_date"],
+        "spotify_url": item["external_urls"]["spotify"],
+        "image": images[0]["url"] if images else None,
+    }
+
+async def get_song_candidates(year: int, *, pages: int = 5, page_size: int = 50) -> list[dict]:
+    """
+    Fetches a wide pool of candidate songs for a specific year.
+    Requests several pages of the Spotify search concurrently over the pooled client
+    and removes duplicates (same track id, or the same recording released on
+    several albums, recognized by its ISRC).
+    Args:
+        year (int): The year to search for songs.
+        pages (int): Number of search pages to fetch. Defaults to 5.
+        page_size (int): Results per page (max 50). Defaults to 50.
+    Returns:
+        list: Compact track dicts (see compact_track), in search order.
+    """
+    token = await get_cached_spotify_token()
+
+    async def fetch_pages(token: str):
+        return await asyncio.gather(*[
+            search_tracks(year, token, offset=page * page_size, limit=page_size)
+            for page in range(pages)
+        ])
+
+    try:
+        results = await fetch_pages(token)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 401:
+            raise
+        # The token was revoked or expired early, get a new one and try once more
+        results = await fetch_pages(await get_cached_spotify_token(refresh=True))
+
+    candidates = []
+    seen = set()
+    for items in results:
+        for item in items:
+            if not item or not item.get("id"):
+                continue
+
+            track = compact_track(item)
+            keys = {("id", track["id"])}
+            if track["isrc"]:
+                keys.add(("isrc", track["isrc"]))
+            if keys & seen:
+                continue
+
+            seen |= keys
+            candidates.append(track)
+
+    return candidates
+
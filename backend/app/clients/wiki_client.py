@@ -1,4 +1,5 @@
 import httpx
+from app.core import http
 
 WIKI_API = "https://en.wikipedia.org/w/api.php"
 
@@ -38,7 +39,7 @@ async def fetch_year_toc(client: httpx.AsyncClient, year: int) -> list[dict]:
         "format": "json",
         "formatversion": "2",
     }
-    request_response = await client.get(WIKI_API, params = params)
+    request_response = await http.get("wikipedia", WIKI_API, client=client, params=params, hedge=True)
     request_response.raise_for_status()
 
     return request_response.json().get("parse", {}).get("tocdata", [])
@@ -72,7 +73,7 @@ async def get_month_wikitext(client: httpx.AsyncClient, year: int, month_index:
         "formatversion": "2",
     }
 
-    request_response = await client.get(WIKI_API, params=params)
+    request_response = await http.get("wikipedia", WIKI_API, client=client, params=params, hedge=True)
     request_response.raise_for_status()
 
     return request_response.json().get("parse", {}).get("wikitext", "")
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""
+Admission control for expensive aggregation endpoints.
+
+A cache miss on /year/{year} or the Billboard top-songs endpoint fans out
+into dozens of upstream calls. Without a bound, a traffic spike starts all
+of them at once, memory grows and every request times out together. The
+admission controller runs at most ``max_concurrent`` aggregations at a time,
+lets up to ``max_queue`` more wait briefly for a slot, and sheds the rest
+immediately with Overloaded, which the app turns into 503 with Retry-After.
+
+Cache hits never reach the controller: load_cached() serves them directly
+and only sends misses through admission.
+"""
+
+from collections import deque
+from typing import Any, Awaitable, Callable, Hashable
+from app.core import config, deadline, metrics, ratelimit
+from app.core.cache import cache
+import asyncio
+import math
+import time
+
+IN_FLIGHT = metrics.gauge(
+    "admission_in_flight", "Aggregations currently running", ("pool",)
+)
+QUEUE_DEPTH = metrics.gauge(
+    "admission_queue_depth", "Aggregations waiting for admission", ("pool",)
+)
+ADMITTED = metrics.counter(
+    "admission_admitted_total", "Aggregations admitted", ("pool",)
+)
+SHED = metrics.counter(
+    "admission_shed_total", "Requests rejected by admission control", ("pool", "reason")
+)
+CACHE_HITS = metrics.counter(
+    "admission_cache_hits_total", "Aggregation requests served from cache without admission", ("pool",)
+)
+
+
+class Overloaded(Exception):
+    """
+    Raised when a request is shed by admission control.
+
+    Attributes:
+        retry_after: Suggested seconds before the client retries.
+    """
+
+    def __init__(self, pool: str, retry_after: int):
+        super().__init__(f"{pool} is overloaded, retry in {retry_after}s")
+        self.pool = pool
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Bounded concurrency with a short, bounded FIFO wait queue.
+
+    Usage:
+        async with controller:  # raises Overloaded when shed
+            result = await aggregate()
+    """
+
+    def __init__(self, name: str, *, max_concurrent: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.avg_duration: float | None = None
+        self._waiters: deque[asyncio.Future] = deque()
+        self._started: dict[int, float] = {}
+        self._update_gauges()
+
+    def _update_gauges(self) -> None:
+        IN_FLIGHT.set(self.in_flight, pool=self.name)
+        QUEUE_DEPTH.set(len(self._waiters), pool=self.name)
+
+    def retry_after(self) -> int:
+        """
+        Estimate when a slot frees up: about one average aggregation.
+        """
+        return max(1, math.ceil(self.avg_duration or 1))
+
+    def _shed(self, reason: str) -> Overloaded:
+        SHED.inc(pool=self.name, reason=reason)
+        return Overloaded(self.name, self.retry_after())
+
+    async def acquire(self) -> None:
+        """
+        Wait for a slot for at most max_wait seconds (or until the request deadline).
+
+        Raises:
+            Overloaded: If the queue is full or no slot freed up in time.
+        """
+        if not self._waiters and self.in_flight < self.max_concurrent:
+            self.in_flight += 1
+        else:
+            if len(self._waiters) >= self.max_queue:
+                raise self._shed("queue_full")
+
+            wait = self.max_wait
+            remaining = deadline.remaining()
+            if remaining is not None:
+                wait = min(wait, max(remaining, 0))
+
+            future = asyncio.get_running_loop().create_future()
+            self._waiters.append(future)
+            self._update_gauges()
+            try:
+                await asyncio.wait_for(asyncio.shield(future), timeout=wait)
+            except asyncio.TimeoutError:
+                if not future.done():
+                    self._waiters.remove(future)
+                    future.cancel()
+                    self._update_gauges()
+                    raise self._shed("timeout")
+                # The slot was handed over as the wait timed out; keep it
+            except asyncio.CancelledError:
+                if future.done() and not future.cancelled():
+                    self.release()
+                else:
+                    self._waiters.remove(future)
+                    future.cancel()
+                    self._update_gauges()
+                raise
+
+        ADMITTED.inc(pool=self.name)
+        self._started[id(asyncio.current_task())] = time.monotonic()
+        self._update_gauges()
+
+    def release(self) -> None:
+        started = self._started.pop(id(asyncio.current_task()), None)
+        if started is not None:
+            duration = time.monotonic() - started
+            self.avg_duration = duration if self.avg_duration is None else 0.9 * self.avg_duration + 0.1 * duration
+
+        self.in_flight -= 1
+        # Hand the slot straight to the oldest waiter
+        while self._waiters and self.in_flight < self.max_concurrent:
+            future = self._waiters.popleft()
+            if future.done():
+                continue
+            self.in_flight += 1
+            future.set_result(None)
+        self._update_gauges()
+
+    async def __aenter__(self) -> "AdmissionController":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+
+aggregations = AdmissionController(
+    "aggregation",
+    max_concurrent=config.ADMISSION_MAX_CONCURRENT,
+    max_queue=config.ADMISSION_MAX_QUEUE,
+    max_wait=config.ADMISSION_MAX_WAIT_SECONDS,
+)
+
+
+async def load_cached(
+    key: Hashable,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: float,
+    *,
+    controller: AdmissionController = aggregations,
+) -> Any:
+    """
+    Serve a value from the cache, or compute it under admission control.
+
+    Concurrent misses for the same key share one admitted load, so a burst
+    of requests for one uncached year takes a single slot.
+
+    Args:
+        key (Hashable): Cache key.
+        loader (Callable[[], Awaitable]): Coroutine function computing the value.
+        ttl (float): Time to live of the computed value, in seconds.
+        controller (AdmissionController): Controller admitting the load.
+
+    Returns:
+        Any: The cached or freshly computed value.
+
+    Raises:
+        Overloaded: If the load was shed.
+        RateLimited: If the API client has used up its fan-out rate limit.
+    """
+    value = await cache.get(key)
+    if value is not None:
+        CACHE_HITS.inc(pool=controller.name)
+        return value
+
+    await ratelimit.charge_fanout()
+
+    async def admitted_load():
+        async with controller:
+            return await loader()
+
+    return await cache.get_or_load(key, admitted_load, ttl)
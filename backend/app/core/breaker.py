@@ -0,0 +1,156 @@
+"""
+Circuit breakers for upstream APIs.
+
+When an upstream keeps failing, waiting for each call to time out ties up
+workers and connection slots. A breaker counts consecutive failures per
+upstream and, once a threshold is reached, opens: calls then fail immediately
+with CircuitOpenError. After a cool-down the breaker goes half-open and lets a
+single probe request through. A successful probe closes it again, a failed one
+reopens it.
+
+CircuitOpenError is an httpx.RequestError, so routers that already map
+network errors to 503 handle an open breaker the same way.
+"""
+
+from app.core import metrics
+import httpx
+import time
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+STATE = metrics.gauge(
+    "upstream_circuit_state", "Circuit breaker state per upstream (0 closed, 1 half-open, 2 open)", ("upstream",)
+)
+OPENED = metrics.counter(
+    "upstream_circuit_opened_total", "Times the circuit breaker of an upstream opened", ("upstream",)
+)
+REJECTED = metrics.counter(
+    "upstream_circuit_rejected_total", "Calls rejected by an open circuit breaker", ("upstream",)
+)
+
+
+class CircuitOpenError(httpx.RequestError):
+    """
+    Raised instead of calling an upstream whose circuit breaker is open.
+    """
+
+    def __init__(self, upstream: str, retry_in: float):
+        super().__init__(f"Circuit breaker for {upstream} is open, retry in {retry_in:.0f}s")
+        self.upstream = upstream
+        self.retry_in = retry_in
+
+
+def is_failure(status: int | None) -> bool:
+    """
+    Return True if an outcome means the upstream itself is unhealthy.
+
+    Transport errors (status None) and 5xx responses count. 4xx responses,
+    including 429, are answers from a working upstream; rate limiting is
+    handled by the concurrency limiter.
+    """
+    return status is None or status >= 500
+
+
+class CircuitBreaker:
+    """
+    Closed/open/half-open circuit breaker for one upstream.
+
+    Usage:
+        probe = breaker.before_call()  # raises CircuitOpenError while open
+        ...
+        breaker.record(response.status_code, probe=probe)  # status None on a transport error
+    """
+
+    def __init__(self, name: str, *, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+        self._set_state(CLOSED)
+
+    def _set_state(self, state: str) -> None:
+        self.state = state
+        STATE.set(_STATE_VALUES[state], upstream=self.name)
+
+    def retry_in(self) -> float:
+        """
+        Seconds until an open breaker lets a probe through, 0 if not open.
+        """
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_timeout - time.monotonic())
+
+    def before_call(self) -> bool:
+        """
+        Check whether a call may go through.
+
+        Returns:
+            bool: True if the call is the probe of a half-open breaker. Its
+            outcome must be reported with record(..., probe=True), or with
+            cancel() if there is none.
+
+        Raises:
+            CircuitOpenError: If the breaker is open, or half-open with the
+                probe request still in flight.
+        """
+        if self.state == OPEN:
+            if self.retry_in() > 0:
+                REJECTED.inc(upstream=self.name)
+                raise CircuitOpenError(self.name, self.retry_in())
+            self._set_state(HALF_OPEN)
+
+        if self.state == HALF_OPEN:
+            if self._probe_in_flight:
+                REJECTED.inc(upstream=self.name)
+                raise CircuitOpenError(self.name, 0.0)
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def record(self, status: int | None, *, probe: bool = False) -> None:
+        """
+        Update the breaker from the outcome of a call let through by before_call().
+
+        Args:
+            status (int | None): HTTP status code, None on a transport error.
+            probe (bool): Whether the call was the half-open probe.
+        """
+        if probe:
+            self._probe_in_flight = False
+
+        if not is_failure(status):
+            self.failures = 0
+            if self.state != CLOSED:
+                self._set_state(CLOSED)
+            return
+
+        self.failures += 1
+        if probe or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                OPENED.inc(upstream=self.name)
+            self.opened_at = time.monotonic()
+            self._set_state(OPEN)
+
+    def cancel(self) -> None:
+        """
+        Forget a probe that ended without an outcome (e.g. it was cancelled),
+        so a half-open breaker can send another one.
+        """
+        self._probe_in_flight = False
+
+    def snapshot(self) -> dict:
+        """
+        Return the breaker state for the health endpoint.
+        """
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in": round(self.retry_in(), 1),
+        }
@@ -0,0 +1,429 @@
+"""
+Cache for upstream data.
+
+Historic years never change, so data fetched for them can be kept for a long
+time, while the current year is refreshed every few minutes. Entries are kept
+after they expire (until evicted) so callers can still fall back to the last
+known value when an upstream is unavailable.
+
+Entries are stored by a backend. The default keeps them in memory, per
+worker. With CACHE_BACKEND=sqlite every worker on a host also reads and
+writes a shared SQLite file (WAL mode, memory-mapped), so a year loaded by
+one worker is a cache hit in all of them; each worker keeps its memory
+cache in front of the file, so repeat hits cost the same as before. The
+cache methods are coroutines, so file access never blocks the event loop.
+"""
+
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Hashable, Protocol
+from app.core import config, metrics
+import asyncio
+import os
+import pickle
+import sqlite3
+import time
+
+# Time to live for data about past years and the current year, in seconds
+HISTORIC_TTL = 24 * 3600
+CURRENT_YEAR_TTL = 10 * 60
+
+
+def year_ttl(year: int) -> float:
+    """
+    Return how long data for a year may be cached, in seconds.
+
+    Args:
+        year (int): The year the data is about.
+
+    Returns:
+        float: HISTORIC_TTL for past years, CURRENT_YEAR_TTL for the current
+        year (and any future year).
+    """
+    if year < date.today().year:
+        return HISTORIC_TTL
+    return CURRENT_YEAR_TTL
+
+
+@dataclass
+class CacheEntry:
+    """
+    A cached value with the time it was stored and the time it expires.
+    """
+    value: Any
+    stored_at: float
+    expires_at: float
+
+    @property
+    def fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+
+class LoadAbandoned(Exception):
+    """
+    Set on a shared load whose leading caller was cancelled; the callers
+    waiting for it load again instead of being cancelled with it.
+    """
+
+
+class CacheBackend(Protocol):
+    """
+    Storage of a TTLCache. Backends decide what to evict, never what is fresh.
+    """
+
+    async def get(self, key: Hashable) -> CacheEntry | None: ...
+
+    async def set(self, key: Hashable, entry: CacheEntry) -> None: ...
+
+    async def delete(self, key: Hashable) -> None: ...
+
+    async def clear(self) -> None: ...
+
+
+class MemoryBackend:
+    """
+    Entries in memory, local to this worker; least recently used entries are
+    evicted beyond ``max_entries``.
+    """
+
+    def __init__(self, max_entries: int = 2048):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[Hashable, CacheEntry] = OrderedDict()
+
+    async def get(self, key: Hashable) -> CacheEntry | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    async def set(self, key: Hashable, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: Hashable) -> None:
+        self._entries.pop(key, None)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+
+
+SHARED_LOOKUPS = metrics.counter(
+    "cache_shared_lookups_total", "Lookups in the shared cache file by outcome", ("outcome",)
+)
+SHARED_EVICTIONS = metrics.counter(
+    "cache_shared_evictions_total", "Entries evicted from the shared cache file"
+)
+
+
+class SQLiteBackend:
+    """
+    Entries in a local SQLite file, shared by all workers on a host.
+
+    Values are pickled; keys are stored by their repr, so they must be made
+    of plain values (strings, numbers, tuples). Every write is its own
+    transaction, so readers see a whole entry or none. When the values add
+    up to more than ``max_bytes``, the least recently read entries are
+    evicted; the total is kept up to date by triggers, so writes do not sum
+    the table. A failing database (locked beyond the busy timeout, disk full)
+    is treated as a miss: the cache is an optimization, never a reason to
+    fail a request.
+
+    Database calls, pickling included, run on the backend's own thread: a
+    write waiting for another worker's lock holds up cache calls, not the
+    event loop.
+    """
+
+    # Reading an entry refreshes its recency at most this often, to keep
+    # reads from taking the write lock
+    TOUCH_INTERVAL = 60.0
+
+    # Entries dropped per eviction round
+    EVICT_BATCH = 32
+
+    def __init__(self, path: Path, max_bytes: int):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self._db: sqlite3.Connection | None = None
+        self._executor: ThreadPoolExecutor | None = None
+        self._pid = None
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                "key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, "
+                "stored_at REAL NOT NULL, expires_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS entries_accessed_at ON entries (accessed_at)")
+            # Total size of the entries, maintained by the triggers below
+            db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+            db.execute(
+                "INSERT OR IGNORE INTO meta (name, value) "
+                "SELECT 'size', COALESCE(SUM(size), 0) FROM entries"
+            )
+            db.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_size_insert AFTER INSERT ON entries BEGIN "
+                "UPDATE meta SET value = value + NEW.size WHERE name = 'size'; END"
+            )
+            db.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_size_update AFTER UPDATE OF size ON entries BEGIN "
+                "UPDATE meta SET value = value + NEW.size - OLD.size WHERE name = 'size'; END"
+            )
+            db.execute(
+                "CREATE TRIGGER IF NOT EXISTS entries_size_delete AFTER DELETE ON entries BEGIN "
+                "UPDATE meta SET value = value - OLD.size WHERE name = 'size'; END"
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per process; a forked worker must not reuse its parent's
+        if self._db is None or self._pid != os.getpid():
+            db = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            # Losing the last writes on a power cut is fine for a cache
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(f"PRAGMA mmap_size={max(self.max_bytes * 2, 64 << 20)}")
+            self._db, self._pid = db, os.getpid()
+            self._executor = None
+        return self._db
+
+    async def _run(self, function, *args):
+        self._connection()
+        if self._executor is None:
+            # A single thread: calls run one at a time, in the order they were made
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-sqlite")
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    async def get(self, key: Hashable) -> CacheEntry | None:
+        return await self._run(self._get, key)
+
+    async def set(self, key: Hashable, entry: CacheEntry) -> None:
+        await self._run(self._set, key, entry)
+
+    async def delete(self, key: Hashable) -> None:
+        await self._run(self._execute, "DELETE FROM entries WHERE key = ?", (repr(key),))
+
+    async def clear(self) -> None:
+        await self._run(self._execute, "DELETE FROM entries", ())
+
+    def _get(self, key: Hashable) -> CacheEntry | None:
+        now = time.time()
+        try:
+            db = self._connection()
+            row = db.execute(
+                "SELECT value, stored_at, expires_at, accessed_at FROM entries WHERE key = ?", (repr(key),)
+            ).fetchone()
+            if row is not None and now - row[3] > self.TOUCH_INTERVAL:
+                db.execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, repr(key)))
+        except sqlite3.Error:
+            SHARED_LOOKUPS.inc(outcome="error")
+            return None
+        if row is None:
+            SHARED_LOOKUPS.inc(outcome="miss")
+            return None
+        SHARED_LOOKUPS.inc(outcome="hit")
+        return CacheEntry(pickle.loads(row[0]), row[1], row[2])
+
+    def _set(self, key: Hashable, entry: CacheEntry) -> None:
+        try:
+            value = pickle.dumps(entry.value, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            # Not shareable; the worker's memory cache still has it
+            return
+        try:
+            db = self._connection()
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                # An upsert rather than INSERT OR REPLACE, whose implicit
+                # delete would not fire the size trigger
+                db.execute(
+                    "INSERT INTO entries (key, value, size, stored_at, expires_at, accessed_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(key) DO UPDATE SET "
+                    "value = excluded.value, size = excluded.size, stored_at = excluded.stored_at, "
+                    "expires_at = excluded.expires_at, accessed_at = excluded.accessed_at",
+                    (repr(key), value, len(value), entry.stored_at, entry.expires_at, time.time()),
+                )
+                self._evict(db)
+                db.execute("COMMIT")
+            except BaseException:
+                if db.in_transaction:
+                    db.execute("ROLLBACK")
+                raise
+        except sqlite3.Error:
+            pass
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        total = db.execute("SELECT value FROM meta WHERE name = 'size'").fetchone()[0]
+        while total > self.max_bytes:
+            rows = db.execute(
+                "SELECT key, size FROM entries ORDER BY accessed_at LIMIT ?", (self.EVICT_BATCH,)
+            ).fetchall()
+            if not rows:
+                return
+            for key, size in rows:
+                db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                SHARED_EVICTIONS.inc()
+                total -= size
+                if total <= self.max_bytes:
+                    return
+
+    def _execute(self, sql: str, parameters: tuple) -> None:
+        try:
+            self._connection().execute(sql, parameters)
+        except sqlite3.Error:
+            pass
+
+
+class TieredBackend:
+    """
+    A worker-local backend in front of a shared one.
+
+    Reads are served locally while the local entry is fresh; otherwise the
+    shared backend is asked, since another worker may have stored a newer
+    entry. Writes and deletes go to both.
+    """
+
+    def __init__(self, local: CacheBackend, shared: CacheBackend):
+        self.local = local
+        self.shared = shared
+
+    async def get(self, key: Hashable) -> CacheEntry | None:
+        entry = await self.local.get(key)
+        if entry is not None and entry.fresh:
+            return entry
+        shared = await self.shared.get(key)
+        if shared is not None and (entry is None or shared.stored_at > entry.stored_at):
+            await self.local.set(key, shared)
+            return shared
+        return entry
+
+    async def set(self, key: Hashable, entry: CacheEntry) -> None:
+        await self.local.set(key, entry)
+        await self.shared.set(key, entry)
+
+    async def delete(self, key: Hashable) -> None:
+        await self.local.delete(key)
+        await self.shared.delete(key)
+
+    async def clear(self) -> None:
+        await self.local.clear()
+        await self.shared.clear()
+
+
+def create_backend() -> CacheBackend:
+    if config.CACHE_BACKEND == "sqlite":
+        return TieredBackend(
+            MemoryBackend(),
+            SQLiteBackend(config.CACHE_DB_PATH, int(config.CACHE_DB_MAX_MB * 1024 * 1024)),
+        )
+    return MemoryBackend()
+
+
+class TTLCache:
+    """
+    Cache with a time to live per entry, stored by a CacheBackend (by default
+    a size-bounded LRU in memory).
+
+    Concurrent get_or_load calls for the same key share a single load, so a
+    burst of requests for an uncached year only hits the upstream once per
+    worker.
+    """
+
+    def __init__(self, backend: CacheBackend | None = None):
+        self.backend = backend if backend is not None else MemoryBackend()
+        self._loading: dict[Hashable, asyncio.Future] = {}
+
+    async def get_entry(self, key: Hashable) -> CacheEntry | None:
+        """
+        Return the entry for a key, even if it has expired.
+        """
+        return await self.backend.get(key)
+
+    async def get(self, key: Hashable) -> Any | None:
+        """
+        Return the cached value for a key, or None if missing or expired.
+        """
+        entry = await self.get_entry(key)
+        if entry is None or not entry.fresh:
+            return None
+        return entry.value
+
+    async def set(self, key: Hashable, value: Any, ttl: float) -> None:
+        """
+        Store a value for ``ttl`` seconds; the backend evicts entries when
+        it is full.
+        """
+        now = time.time()
+        await self.backend.set(key, CacheEntry(value, now, now + ttl))
+
+    async def delete(self, key: Hashable) -> None:
+        await self.backend.delete(key)
+
+    async def clear(self) -> None:
+        await self.backend.clear()
+
+    async def get_or_load(self, key: Hashable, loader: Callable[[], Awaitable[Any]], ttl: float) -> Any:
+        """
+        Return the cached value for a key, loading and storing it on a miss.
+
+        Args:
+            key (Hashable): Cache key.
+            loader (Callable[[], Awaitable]): Coroutine function producing the value.
+            ttl (float): Time to live for a newly loaded value, in seconds.
+
+        Returns:
+            Any: The cached or freshly loaded value.
+
+        Raises:
+            Exception: Whatever the loader raised. Failed loads are not cached.
+        """
+        while True:
+            value = await self.get(key)
+            if value is not None:
+                return value
+
+            pending = self._loading.get(key)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except LoadAbandoned:
+                # The caller running the load was cancelled (e.g. its own
+                # timeout), this one was not: try again, possibly as leader
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._loading[key] = future
+        try:
+            value = await loader()
+        except Exception as e:
+            future.set_exception(e)
+            # Mark the exception as retrieved in case nobody else was waiting
+            future.exception()
+            raise
+        except BaseException:
+            # Never cancel the shared future: that would cancel every waiter
+            future.set_exception(LoadAbandoned(key))
+            future.exception()
+            raise
+        else:
+            # Resolved first, so callers arriving while it is stored get it
+            future.set_result(value)
+            if value is not None:
+                await self.set(key, value, ttl)
+            return value
+        finally:
+            self._loading.pop(key, None)
+
+
+cache = TTLCache(create_backend())
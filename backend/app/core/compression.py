@@ -0,0 +1,207 @@
+"""
+Response compression.
+
+API responses are large, repetitive JSON that compresses 5-10x. Clients get
+brotli or gzip, whichever their Accept-Encoding prefers (brotli on a tie).
+
+- Cached aggregates (the year endpoints) are stored as an EncodedPayload:
+  the serialized body plus its gzip and brotli encodings, compressed once
+  at high levels when the cache entry is filled. Cache hits send the
+  stored bytes without serializing or compressing anything.
+- Every other response is compressed on the fly by CompressionMiddleware at
+  cheaper levels.
+
+Encoded representations get their own ETag (the identity ETag with an
+encoding suffix, e.g. "abc-br"); app.core.http_cache compares ETags
+without the suffix. MessagePack responses (app.core.formats) are compressed
+the same way.
+"""
+
+from dataclasses import dataclass, field
+from starlette.datastructures import MutableHeaders
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from app.core import formats, metrics
+import brotli
+import gzip
+import hashlib
+
+# Preferred first when the client accepts several with the same weight
+ENCODINGS = ("br", "gzip")
+
+# Responses smaller than this are not worth compressing
+MIN_SIZE = 1024
+
+COMPRESSIBLE_TYPES = (formats.JSON, formats.MSGPACK, "text/")
+
+BYTES_SENT = metrics.counter(
+    "response_bytes_total", "Response body bytes before and after compression", ("encoding", "stage")
+)
+
+
+def compress(body: bytes, encoding: str, *, best: bool = False) -> bytes:
+    """
+    Compress a body. ``best`` uses high levels, for bodies compressed once
+    and sent many times.
+    """
+    if encoding == "br":
+        # Quality 10 and 11 are 10-30x slower for a few percent smaller output
+        return brotli.compress(body, quality=9 if best else 4)
+    return gzip.compress(body, compresslevel=9 if best else 6, mtime=0)
+
+
+def choose_encoding(accept_encoding: str | None) -> str | None:
+    """
+    Pick the content coding for an Accept-Encoding header.
+
+    Returns:
+        str | None: "br", "gzip", or None for an uncompressed response.
+    """
+    if not accept_encoding:
+        return None
+    weights = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[name.strip().lower()] = q
+
+    best, best_q = None, 0.0
+    for encoding in ENCODINGS:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def encoded_etag(etag: str, encoding: str | None) -> str:
+    if encoding is None:
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def add_vary(headers: MutableHeaders, name: str = "Accept-Encoding") -> None:
+    vary = headers.get("vary")
+    if vary is None:
+        headers["Vary"] = name
+    elif name.lower() not in {field.strip().lower() for field in vary.split(",")}:
+        headers["Vary"] = f"{vary}, {name}"
+
+
+@dataclass
+class EncodedPayload:
+    """
+    A response body serialized once and compressed in every supported coding.
+
+    Attributes:
+        data: The original value, for callers that inspect it.
+        body: The serialized, uncompressed body.
+        media_type: Content type of the body.
+        etag: Strong ETag of the uncompressed body.
+        encoded: Compressed body per content coding.
+        alternates: The same payload in other response formats, by media type.
+    """
+    data: object
+    body: bytes
+    media_type: str
+    etag: str
+    encoded: dict[str, bytes] = field(default_factory=dict)
+    alternates: dict[str, "EncodedPayload"] = field(default_factory=dict)
+
+    @classmethod
+    def from_body(cls, data: object, body: bytes, media_type: str) -> "EncodedPayload":
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        encoded = {}
+        if len(body) >= MIN_SIZE:
+            encoded = {encoding: compress(body, encoding, best=True) for encoding in ENCODINGS}
+        return cls(data, body, media_type, etag, encoded)
+
+    @classmethod
+    def from_data(cls, data: object) -> "EncodedPayload":
+        """
+        Serialize data as JSON, with a MessagePack alternate, the same way
+        the app's APIResponse does.
+        """
+        payload = cls.from_body(data, formats.serialize(data, formats.JSON), formats.JSON)
+        payload.alternates[formats.MSGPACK] = cls.from_body(
+            data, formats.serialize(data, formats.MSGPACK), formats.MSGPACK
+        )
+        return payload
+
+    def response(self, request: Request, headers: dict[str, str] | None = None) -> Response:
+        """
+        Build the response for a request, in the format (see
+        app.core.formats) and coding it prefers.
+        """
+        if self.alternates:
+            alternate = self.alternates.get(formats.current())
+            if alternate is not None:
+                response = alternate.response(request, headers)
+            else:
+                response = self._response(request, headers)
+            add_vary(response.headers, "Accept")
+            return response
+        return self._response(request, headers)
+
+    def _response(self, request: Request, headers: dict[str, str] | None) -> Response:
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        body = self.encoded.get(encoding) if encoding else None
+        if body is None:
+            encoding = None
+            body = self.body
+
+        response = Response(body, media_type=self.media_type, headers=headers)
+        response.headers["ETag"] = encoded_etag(self.etag, encoding)
+        if self.encoded:
+            add_vary(response.headers)
+        if encoding:
+            response.headers["Content-Encoding"] = encoding
+        BYTES_SENT.inc(len(self.body), encoding=encoding or "identity", stage="uncompressed")
+        BYTES_SENT.inc(len(body), encoding=encoding or "identity", stage="sent")
+        return response
+
+
+def compressible(response: Response) -> bool:
+    content_type = response.headers.get("content-type", "")
+    return (
+        response.status_code == 200
+        and "content-encoding" not in response.headers
+        and content_type.startswith(COMPRESSIBLE_TYPES)
+    )
+
+
+class CompressionMiddleware(BaseHTTPMiddleware):
+    """
+    Compresses responses that are not compressed yet, on the fly.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        response = await call_next(request)
+        if not compressible(response):
+            return response
+
+        add_vary(response.headers)
+        encoding = choose_encoding(request.headers.get("accept-encoding"))
+        if encoding is None:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        headers = MutableHeaders(raw=[
+            (name, value) for name, value in response.headers.raw if name != b"content-length"
+        ])
+        if len(body) < MIN_SIZE:
+            return Response(body, status_code=response.status_code, headers=headers)
+
+        compressed = compress(body, encoding)
+        headers["Content-Encoding"] = encoding
+        if "etag" in headers:
+            headers["ETag"] = encoded_etag(headers["etag"], encoding)
+        BYTES_SENT.inc(len(body), encoding=encoding, stage="uncompressed")
+        BYTES_SENT.inc(len(compressed), encoding=encoding, stage="sent")
+        return Response(compressed, status_code=response.status_code, headers=headers)
@@ -1,8 +1,11 @@
 """Application configuration loader for external API credentials.
 
-Loads environment variables from the project .env file (two directories up) and
-raises clear errors when required keys are missing. Exposes TMDB, LastFM, and
-Spotify credentials as module-level constants for import by clients/services.
+Loads environment variables from the project .env file (two directories up).
+Exposes TMDB, LastFM, and Spotify credentials as module-level constants for
+import by clients/services, along with the paths of locally persisted data
+such as the Oscar index. Missing credentials do not stop the app: the
+upstream that needs them is disabled (see missing_credentials()), and the
+sections it serves are reported unavailable.
 """
 
 import os
@@ -16,14 +19,135 @@ LASTFM_API_KEY=os.getenv("LASTFM_API_KEY")
 SPOTIFY_CLIENT_ID=os.getenv("SPOTIFY_CLIENT_ID")
 SPOTIFY_CLIENT_SECRET=os.getenv("SPOTIFY_CLIENT_SECRET")
 
-if not TMDB_API_KEY:
-    raise RuntimeError("TMDB_API_KEY is missing in the environment")
+# Credentials each upstream needs; upstreams not listed need none
+UPSTREAM_CREDENTIALS = {
+    "tmdb": ("TMDB_API_KEY",),
+    "lastfm": ("LASTFM_API_KEY",),
+    "spotify": ("SPOTIFY_CLIENT_ID", "SPOTIFY_CLIENT_SECRET"),
+}
 
-if not LASTFM_API_KEY:
-    raise RuntimeError("LASTFM_API_KEY is missing in the environment")
 
-if not SPOTIFY_CLIENT_ID:
-    raise RuntimeError("SPOTIFY_CLIENT_ID is missing in the environment")
+def missing_credentials(upstream: str) -> list[str]:
+    """
+    Return the names of the credentials an upstream needs but that are not set.
 
-if not SPOTIFY_CLIENT_SECRET:
-    raise RuntimeError("SPOTIFY_CLIENT_SECRET is missing in the environment")
+    An upstream with missing credentials is disabled: app.core.http refuses
+    to call it, so only the sections that depend on it are unavailable.
+    """
+    return [name for name in UPSTREAM_CREDENTIALS.get(upstream, ()) if not globals()[name]]
+
+
+DATA_DIR = Path(os.getenv("WIKICAP_DATA_DIR", Path(__file__).resolve().parents[2] / "data"))
+
+# Local index of Oscar edition and category ids, rebuilt in bulk from The Awards API.
+OSCAR_INDEX_PATH = Path(os.getenv("OSCAR_INDEX_PATH", DATA_DIR / "oscar_index.json"))
+OSCAR_INDEX_MAX_AGE_DAYS = int(os.getenv("OSCAR_INDEX_MAX_AGE_DAYS", "90"))
+
+# Columnar movie/series index used by the cross-year search endpoints.
+MEDIA_INDEX_DIR = Path(os.getenv("MEDIA_INDEX_DIR", DATA_DIR / "media_index"))
+
+# Number of TMDb discover pages (20 results each) ranked for series. Movies need
+# one page: discover sorts them by vote count, the movie ranking key.
+TMDB_DISCOVER_PAGES = int(os.getenv("TMDB_DISCOVER_PAGES", "1"))
+
+# Spotify track search pages (of up to 50 tracks) fetched per year for the songs section.
+SPOTIFY_SEARCH_PAGES = int(os.getenv("SPOTIFY_SEARCH_PAGES", "5"))
+SPOTIFY_SEARCH_PAGE_SIZE = int(os.getenv("SPOTIFY_SEARCH_PAGE_SIZE", "50"))
+
+# Upstream data cache: "memory" (per worker) or "sqlite" (a local file shared by
+# the workers on one host, in front of which each worker keeps its memory cache),
+# and the size bound of the shared file
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_DB_PATH = Path(os.getenv("CACHE_DB_PATH", DATA_DIR / "cache.sqlite3"))
+CACHE_DB_MAX_MB = float(os.getenv("CACHE_DB_MAX_MB", "256"))
+
+# Image proxy (/api/v1/img): on-disk cache location and size bound, and the
+# largest upstream image it accepts
+IMAGE_CACHE_DIR = Path(os.getenv("IMAGE_CACHE_DIR", DATA_DIR / "images"))
+IMAGE_CACHE_MAX_MB = float(os.getenv("IMAGE_CACHE_MAX_MB", "512"))
+IMAGE_MAX_BYTES = int(os.getenv("IMAGE_MAX_BYTES", str(10 * 1024 * 1024)))
+
+
+# Negotiate HTTP/2 with every upstream (can be overridden per upstream with <UPSTREAM>_HTTP2)
+UPSTREAM_HTTP2 = os.getenv("UPSTREAM_HTTP2", "0") == "1"
+
+
+# Seconds resolved upstream addresses and idle upstream connections are kept
+DNS_CACHE_TTL = float(os.getenv("DNS_CACHE_TTL", "300"))
+UPSTREAM_KEEPALIVE_SECONDS = float(os.getenv("UPSTREAM_KEEPALIVE_SECONDS", "60"))
+
+# Startup warm-up: connections opened per upstream, and how long readiness may wait for it
+WARMUP_ON_STARTUP = os.getenv("WARMUP_ON_STARTUP", "1") == "1"
+WARMUP_CONNECTIONS = int(os.getenv("WARMUP_CONNECTIONS", "2"))
+WARMUP_TIMEOUT_SECONDS = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "10"))
+
+
+# Admission control for aggregation endpoints: concurrent cache-miss
+# aggregations, requests allowed to wait for one, and how long they may wait
+ADMISSION_MAX_CONCURRENT = int(os.getenv("ADMISSION_MAX_CONCURRENT", "8"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "16"))
+ADMISSION_MAX_WAIT_SECONDS = float(os.getenv("ADMISSION_MAX_WAIT_SECONDS", "2"))
+
+
+# Per-client rate limits. Every request takes a token from the request bucket;
+# requests that call upstream APIs also take one from the smaller fan-out bucket.
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "1") == "1"
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "60"))
+RATE_LIMIT_PER_MINUTE = float(os.getenv("RATE_LIMIT_PER_MINUTE", "120"))
+RATE_LIMIT_FANOUT_BURST = float(os.getenv("RATE_LIMIT_FANOUT_BURST", "10"))
+RATE_LIMIT_FANOUT_PER_MINUTE = float(os.getenv("RATE_LIMIT_FANOUT_PER_MINUTE", "20"))
+# Image proxy requests skip the request bucket; the ones that miss the disk
+# cache take a token from the image bucket instead of the fan-out bucket
+RATE_LIMIT_IMAGE_BURST = float(os.getenv("RATE_LIMIT_IMAGE_BURST", "120"))
+RATE_LIMIT_IMAGE_PER_MINUTE = float(os.getenv("RATE_LIMIT_IMAGE_PER_MINUTE", "240"))
+
+# "memory" (per worker) or "sqlite" (shared by the workers on one host)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+RATE_LIMIT_DB_PATH = Path(os.getenv("RATE_LIMIT_DB_PATH", DATA_DIR / "ratelimit.sqlite3"))
+
+# Clients sending one of these keys in X-API-Key are limited per key instead of per IP
+API_KEYS = {key.strip() for key in os.getenv("API_KEYS", "").split(",") if key.strip()}
+
+# Take the client IP from X-Forwarded-For (only behind a trusted proxy). Each
+# proxy appends the address it received the request from, so the client IP is
+# the entry TRUSTED_PROXY_HOPS from the right; entries further left are sent
+# by the client and cannot be trusted.
+TRUST_FORWARDED_FOR = os.getenv("TRUST_FORWARDED_FOR", "0") == "1"
+TRUSTED_PROXY_HOPS = max(1, int(os.getenv("TRUSTED_PROXY_HOPS", "1")))
+
+# Comma-separated origins allowed to call the API from a browser, "*" for any
+CORS_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "*").split(",") if origin.strip()]
+
+
+# Upstream quota budgets as "<requests>/<window>" pairs, e.g. "5/1s,50000/1d"
+# (override with <UPSTREAM>_QUOTA, empty for no budget), and the share of a
+# budget after which low-priority enrichment is served from cache or skipped
+UPSTREAM_QUOTAS = {
+    upstream: os.getenv(f"{upstream.upper()}_QUOTA", default)
+    for upstream, default in {
+        "lastfm": "1500/5m",
+        "tmdb": "3000/1m",
+        "spotify": "180/30s",
+        "wikipedia": "",
+        "awards": "",
+    }.items()
+}
+QUOTA_SOFT_LIMIT = float(os.getenv("QUOTA_SOFT_LIMIT", "0.8"))
+
+# Enrichment is skipped once less than this many seconds of the request
+# deadline remain, and gives up this long before the deadline
+ENRICHMENT_RESERVE_SECONDS = float(os.getenv("ENRICHMENT_RESERVE_SECONDS", "3"))
+
+# Key required in X-Admin-Key for the admin endpoints; they are disabled without it
+ADMIN_API_KEY = os.getenv("ADMIN_API_KEY")
+
+
+def upstream_env(upstream: str, setting: str, default: float) -> float:
+    """
+    Read a numeric per-upstream setting, e.g. TMDB_RETRY_ATTEMPTS for ("tmdb", "RETRY_ATTEMPTS").
+    """
+    return float(os.getenv(f"{upstream.upper()}_{setting}", default))
+
+# Time budget of one API request, in seconds. Upstream calls are cut short
+# and unfinished work is cancelled when it runs out.
+REQUEST_DEADLINE_SECONDS = float(os.getenv("REQUEST_DEADLINE_SECONDS", "20"))
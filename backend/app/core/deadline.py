@@ -0,0 +1,133 @@
+"""
+Request deadlines.
+
+A deadline is the point in time (time.monotonic()) by which the current
+request must be answered. It is stored in a context variable, so it follows
+the request through services and clients without being passed explicitly;
+tasks started with asyncio.gather or create_task inherit it.
+
+The api/v1 routers set it per request with the request_deadline dependency.
+app.core.http clamps the timeout of every upstream call to the time that is
+left and raises DeadlineExceeded instead of starting work that can no
+longer finish in time.
+"""
+
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable
+from app.core import config
+import asyncio
+import httpx
+import time
+
+_deadline: ContextVar[float | None] = ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(Exception):
+    """
+    Raised when the current request has run out of time.
+    """
+
+
+def get() -> float | None:
+    """
+    Return the current deadline as a time.monotonic() value, or None.
+    """
+    return _deadline.get()
+
+
+def set_budget(seconds: float) -> None:
+    """
+    Give the current request ``seconds`` to finish. An earlier deadline that
+    is already set is kept.
+    """
+    deadline = time.monotonic() + seconds
+    current = _deadline.get()
+    if current is None or deadline < current:
+        _deadline.set(deadline)
+
+
+def remaining() -> float | None:
+    """
+    Return the seconds left until the current deadline, or None if there is none.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return deadline - time.monotonic()
+
+
+def expired() -> bool:
+    left = remaining()
+    return left is not None and left <= 0
+
+
+def check() -> None:
+    """
+    Raises:
+        DeadlineExceeded: If the current deadline has passed.
+    """
+    if expired():
+        raise DeadlineExceeded("Request deadline exceeded")
+
+
+def clamp_timeout(timeout: httpx.Timeout) -> httpx.Timeout:
+    """
+    Shorten every part of an httpx timeout to the time left before the deadline.
+
+    Args:
+        timeout (httpx.Timeout): The timeout the call would use otherwise.
+
+    Returns:
+        httpx.Timeout: The clamped timeout, or ``timeout`` itself without a deadline.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    left = max(left, 0.001)
+
+    def clamp(value: float | None) -> float:
+        return left if value is None else min(value, left)
+
+    return httpx.Timeout(
+        connect=clamp(timeout.connect),
+        read=clamp(timeout.read),
+        write=clamp(timeout.write),
+        pool=clamp(timeout.pool),
+    )
+
+
+@asynccontextmanager
+async def enforce():
+    """
+    Cancel the enclosed work when the deadline passes.
+
+    Raises:
+        DeadlineExceeded: If the deadline passed before the work finished.
+    """
+    try:
+        async with asyncio.timeout_at(get()):
+            yield
+    except TimeoutError as e:
+        raise DeadlineExceeded("Request deadline exceeded") from e
+
+
+async def run(awaitable: Awaitable[Any]) -> Any:
+    """
+    Await ``awaitable``, cancelling it when the deadline passes.
+
+    Raises:
+        DeadlineExceeded: If the deadline passed before it finished.
+    """
+    async with enforce():
+        return await awaitable
+
+
+async def request_deadline() -> None:
+    """
+    FastAPI dependency giving each request REQUEST_DEADLINE_SECONDS to finish.
+
+    It is async on purpose: async dependencies run in the request's own
+    context, so the deadline is visible to the endpoint and everything it calls.
+    """
+    set_budget(config.REQUEST_DEADLINE_SECONDS)
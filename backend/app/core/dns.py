@@ -0,0 +1,93 @@
+"""
+DNS result caching for the upstream clients.
+
+Every new upstream connection otherwise starts with a DNS lookup. The
+CachingDNSBackend resolves each host once and reuses the addresses for
+DNS_CACHE_TTL seconds. If a later lookup fails, the expired addresses are
+used rather than failing the request. TLS still verifies and sends SNI for
+the original host name, only the TCP connection is opened to the cached IP.
+"""
+
+from app.core import metrics
+import asyncio
+import httpcore
+import ipaddress
+import socket
+import time
+
+LOOKUPS = metrics.counter(
+    "dns_lookups_total", "Upstream host name resolutions by outcome", ("outcome",)
+)
+
+
+def is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that caches resolved addresses per host.
+
+    Args:
+        ttl (float): Seconds a resolution is reused.
+        backend (httpcore.AsyncNetworkBackend | None): Backend that opens
+            the connections. Defaults to httpcore's automatic backend.
+    """
+
+    def __init__(self, ttl: float = 300.0, backend: httpcore.AsyncNetworkBackend | None = None):
+        self.ttl = ttl
+        self._backend = backend or httpcore.AnyIOBackend()
+        self._cache: dict[tuple[str, int], tuple[list[str], float]] = {}
+
+    async def resolve(self, host: str, port: int) -> list[str]:
+        """
+        Return the addresses of a host, from the cache while fresh.
+
+        Raises:
+            httpcore.ConnectError: If the host cannot be resolved and nothing is cached.
+        """
+        if is_ip_address(host):
+            return [host]
+
+        cached = self._cache.get((host, port))
+        if cached is not None and time.monotonic() < cached[1]:
+            LOOKUPS.inc(outcome="hit")
+            return cached[0]
+
+        try:
+            infos = await asyncio.get_running_loop().getaddrinfo(host, port, type=socket.SOCK_STREAM)
+        except OSError as e:
+            if cached is not None:
+                LOOKUPS.inc(outcome="stale")
+                return cached[0]
+            LOOKUPS.inc(outcome="error")
+            raise httpcore.ConnectError(str(e)) from e
+
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        self._cache[(host, port)] = (addresses, time.monotonic() + self.ttl)
+        LOOKUPS.inc(outcome="miss")
+        return addresses
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        addresses = await self.resolve(host, port)
+        error = None
+        for address in addresses:
+            try:
+                return await self._backend.connect_tcp(
+                    address, port, timeout=timeout, local_address=local_address, socket_options=socket_options
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                error = e
+        # None of the addresses worked, resolve again next time
+        self._cache.pop((host, port), None)
+        raise error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self._backend.connect_unix_socket(path, timeout=timeout, socket_options=socket_options)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._backend.sleep(seconds)
@@ -0,0 +1,104 @@
+"""
+Response formats.
+
+API responses are JSON unless the client asks for MessagePack with
+``Accept: application/msgpack``: the same response shape in a compact
+binary encoding that is smaller and several times cheaper to decode, for
+batch and mobile consumers. Non-string dict keys become strings in both
+formats, so clients see the same shape either way.
+
+The format is negotiated per request by the response_format dependency and
+kept in a context variable, like the request deadline. APIResponse, the
+app's default response class, renders whatever an endpoint returns in that
+format. Cached year payloads are stored in both formats (see
+app.core.compression.EncodedPayload). Error responses are always JSON.
+"""
+
+from contextvars import ContextVar
+from fastapi import Request
+from fastapi.responses import ORJSONResponse
+import msgpack
+import orjson
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+
+# Media type names used for MessagePack before application/msgpack was registered
+MSGPACK_ALIASES = ("application/x-msgpack", "application/vnd.msgpack")
+
+_format: ContextVar[str] = ContextVar("response_format", default=JSON)
+
+
+def choose_format(accept: str | None) -> str:
+    """
+    Pick the response format for an Accept header.
+
+    MessagePack is chosen only when the client prefers it over JSON, so
+    browsers sending ``*/*`` or ``text/html, */*;q=0.8`` keep getting JSON.
+
+    Returns:
+        str: JSON or MSGPACK.
+    """
+    if not accept:
+        return JSON
+    json_q = msgpack_q = 0.0
+    for item in accept.split(","):
+        name, *params = item.split(";")
+        name = name.strip().lower()
+        q = 1.0
+        for param in params:
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if name == MSGPACK or name in MSGPACK_ALIASES:
+            msgpack_q = max(msgpack_q, q)
+        elif name in (JSON, "application/*", "*/*"):
+            json_q = max(json_q, q)
+    return MSGPACK if msgpack_q > json_q else JSON
+
+
+def current() -> str:
+    """
+    Return the response format of the current request.
+    """
+    return _format.get()
+
+
+async def response_format(request: Request) -> None:
+    """
+    FastAPI dependency negotiating the response format of a request.
+
+    Async, like request_deadline, so the format is set in the request's own
+    context and seen by the response class.
+    """
+    _format.set(choose_format(request.headers.get("accept")))
+
+
+def serialize(data: object, media_type: str) -> bytes:
+    if media_type == MSGPACK:
+        try:
+            # Without OPT_NON_STR_KEYS orjson rejects non-string dict keys: a
+            # quick check for the rare payload that has some
+            orjson.dumps(data)
+        except orjson.JSONEncodeError:
+            # Convert them the way JSON does (1 becomes "1"), so a MessagePack
+            # response has the same shape as the JSON one
+            data = orjson.loads(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS))
+        return msgpack.packb(data)
+    return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
+
+
+class APIResponse(ORJSONResponse):
+    """
+    ORJSONResponse that renders MessagePack instead when the request asked for it.
+    """
+
+    def __init__(self, content, status_code=200, headers=None, media_type=None, background=None):
+        headers = {"Vary": "Accept", **(headers or {})}
+        super().__init__(content, status_code, headers, media_type or current(), background)
+
+    def render(self, content) -> bytes:
+        return serialize(content, self.media_type)
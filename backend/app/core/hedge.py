@@ -0,0 +1,149 @@
+"""
+Hedged requests for idempotent upstream reads.
+
+Most Wikipedia requests answer quickly, but a few straggle for seconds and
+set the response time of the whole /year/{year} request. A hedged request
+waits for the primary attempt until it is slower than a recent latency
+percentile (p95 by default), then sends a second, identical attempt and uses
+whichever answers first. The loser is cancelled.
+
+A token bucket caps the extra load: every request earns ``budget`` tokens
+(0.05 by default) and every hedge spends one, so at most about 5% of
+requests are sent twice.
+
+Calls opt in with app.core.http.request(..., hedge=True); only the
+Wikipedia year page reads do, not low-priority lookups such as artist
+images.
+"""
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+from app.core import metrics
+import asyncio
+import time
+
+T = TypeVar("T")
+
+HEDGES = metrics.counter(
+    "upstream_hedged_requests_total", "Hedged upstream requests by outcome", ("upstream", "outcome")
+)
+
+
+@dataclass(frozen=True)
+class HedgePolicy:
+    """
+    Attributes:
+        percentile: Latency percentile after which a hedge is sent.
+        budget: Hedges earned per request, i.e. the maximum share of extra requests.
+        max_burst: Maximum number of saved-up hedges.
+        min_samples: Latencies to observe before hedging starts.
+    """
+    percentile: float = 0.95
+    budget: float = 0.05
+    max_burst: float = 10.0
+    min_samples: int = 20
+
+
+class LatencyTracker:
+    """
+    Latencies of the most recent requests, for percentile estimates.
+    """
+
+    def __init__(self, window: int = 500):
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, latency: float) -> None:
+        self._samples.append(latency)
+
+    def percentile(self, q: float) -> float | None:
+        """
+        Return the q-quantile (0-1) of the recent latencies, None without samples.
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Hedger:
+    """
+    Sends hedged attempts for one upstream within its budget.
+    """
+
+    def __init__(self, name: str, policy: HedgePolicy):
+        self.name = name
+        self.policy = policy
+        self.latencies = LatencyTracker()
+        self._tokens = policy.max_burst
+
+    def hedge_delay(self) -> float | None:
+        """
+        Return how long to wait for the primary attempt before hedging, None
+        while there are too few samples to know what slow means.
+        """
+        if len(self.latencies) < self.policy.min_samples:
+            return None
+        return self.latencies.percentile(self.policy.percentile)
+
+    def _try_spend(self) -> bool:
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def run(self, attempt: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run ``attempt``, hedging it with a second call if it is slow.
+
+        Args:
+            attempt (Callable[[], Awaitable]): Starts one attempt. Called at
+                most twice, so it must be safe to repeat.
+
+        Returns:
+            The result of the first attempt to succeed.
+
+        Raises:
+            Exception: The error of the primary attempt if both attempts fail.
+        """
+        self._tokens = min(self.policy.max_burst, self._tokens + self.policy.budget)
+        delay = self.hedge_delay()
+        started = time.monotonic()
+
+        if delay is None:
+            result = await attempt()
+            self.latencies.add(time.monotonic() - started)
+            return result
+
+        primary = asyncio.ensure_future(attempt())
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done or not self._try_spend():
+                if not done:
+                    HEDGES.inc(upstream=self.name, outcome="over_budget")
+                result = await primary
+                self.latencies.add(time.monotonic() - started)
+                return result
+
+            HEDGES.inc(upstream=self.name, outcome="sent")
+            hedge = asyncio.ensure_future(attempt())
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            HEDGES.inc(upstream=self.name, outcome="won")
+                        self.latencies.add(time.monotonic() - started)
+                        return task.result()
+            # Both attempts failed
+            raise primary.exception()
+        finally:
+            # Cancel the loser, or both attempts if the caller was cancelled
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
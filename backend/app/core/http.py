@@ -0,0 +1,441 @@
+"""
+Shared HTTP access to upstream APIs.
+
+Creating a new httpx.AsyncClient per call means a new connection (DNS lookup,
+TCP and TLS handshake) per call. This module keeps one long-lived, pooled
+client per upstream so concurrent and consecutive requests to the same host
+reuse connections. Clients are created lazily and closed on app shutdown.
+They share a DNS cache (app.core.dns) and keep idle connections open for
+UPSTREAM_KEEPALIVE_SECONDS, so connections opened by the startup warm-up
+are still there for the first requests.
+
+HTTP/2 is opt-in, with UPSTREAM_HTTP2=1 for all upstreams or <UPSTREAM>_HTTP2=1
+for one. Concurrent requests to a host are then multiplexed over one or two
+connections instead of one connection per request in flight.
+
+Every client call goes through request()/get(), which checks the upstream's
+circuit breaker, runs the call under the upstream's adaptive concurrency
+limiter, retries idempotent GETs according to the upstream's retry policy,
+hedges slow GETs that opt in (hedge=True) to upstreams with a hedge policy and
+records request metrics.
+Timeouts are clamped to the current request deadline (see app.core.deadline).
+Upstreams whose credentials are not configured are never called: requests to
+them fail right away with UpstreamNotConfigured.
+"""
+
+from dataclasses import dataclass, field
+from app.core import config, deadline, metrics, quota, ratelimit
+from app.core.breaker import CircuitBreaker
+from app.core.dns import CachingDNSBackend
+from app.core.hedge import HedgePolicy, Hedger
+from app.core.limiter import AdaptiveLimiter, parse_retry_after
+from app.core.retry import NO_RETRY, RetryPolicy
+import asyncio
+import httpx
+import time
+
+
+@dataclass(frozen=True)
+class Upstream:
+    """
+    Per-upstream settings.
+
+    Attributes:
+        name: Short upstream name used in metrics and logs.
+        initial_limit: Starting concurrency limit.
+        max_limit: Upper bound for the adaptive concurrency limit.
+        retry: Retry policy for GET requests.
+        timeout: Default timeout of the pooled client.
+        failure_threshold: Consecutive failures that open the circuit breaker.
+        recovery_timeout: Seconds an open breaker waits before a probe request.
+        hedge: Hedge policy for GET requests, None to never hedge.
+        http2: Whether the pooled client negotiates HTTP/2.
+        max_connections: Connections the pooled client may open to the upstream.
+        headers: Default headers of the pooled client.
+        warm_urls: URLs requested at startup to open connections ahead of traffic.
+    """
+    name: str
+    initial_limit: int = 8
+    max_limit: int = 32
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    timeout: httpx.Timeout = field(default_factory=lambda: httpx.Timeout(10.0, connect=5.0))
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    hedge: HedgePolicy | None = None
+    http2: bool = False
+    max_connections: int = 20
+    headers: dict[str, str] = field(default_factory=dict)
+    warm_urls: tuple[str, ...] = ()
+
+
+class UpstreamNotConfigured(httpx.RequestError):
+    """
+    Raised instead of calling an upstream whose credentials are missing.
+
+    Like CircuitOpenError it is an httpx.RequestError, so routers answer 503
+    and the year endpoints report the affected sections as unavailable.
+    """
+
+    def __init__(self, upstream: str, missing: list[str]):
+        super().__init__(f"{upstream} is disabled, missing {', '.join(missing)}")
+        self.upstream = upstream
+        self.missing = missing
+
+
+def retry_policy(upstream: str, *, max_attempts: int = 3, base_delay: float = 0.2, max_delay: float = 5.0) -> RetryPolicy:
+    """
+    Build the retry policy of an upstream. Each value can be overridden with
+    <UPSTREAM>_RETRY_ATTEMPTS, <UPSTREAM>_RETRY_BASE_DELAY and <UPSTREAM>_RETRY_MAX_DELAY.
+    """
+    return RetryPolicy(
+        max_attempts=int(config.upstream_env(upstream, "RETRY_ATTEMPTS", max_attempts)),
+        base_delay=config.upstream_env(upstream, "RETRY_BASE_DELAY", base_delay),
+        max_delay=config.upstream_env(upstream, "RETRY_MAX_DELAY", max_delay),
+    )
+
+
+def hedge_policy(upstream: str, *, percentile: float = 0.95, budget: float = 0.05) -> HedgePolicy | None:
+    """
+    Build the hedge policy of an upstream. <UPSTREAM>_HEDGE=0 turns hedging
+    off; <UPSTREAM>_HEDGE_PERCENTILE and <UPSTREAM>_HEDGE_BUDGET override the
+    defaults.
+    """
+    if not config.upstream_env(upstream, "HEDGE", 1):
+        return None
+    return HedgePolicy(
+        percentile=config.upstream_env(upstream, "HEDGE_PERCENTILE", percentile),
+        budget=config.upstream_env(upstream, "HEDGE_BUDGET", budget),
+    )
+
+
+def connection_options(upstream: str) -> dict:
+    """
+    Read the connection settings of an upstream: <UPSTREAM>_HTTP2 (default
+    UPSTREAM_HTTP2, off) and <UPSTREAM>_MAX_CONNECTIONS (default 2 with
+    HTTP/2, where requests share connections, and 20 without).
+    """
+    http2 = bool(config.upstream_env(upstream, "HTTP2", config.UPSTREAM_HTTP2))
+    max_connections = int(config.upstream_env(upstream, "MAX_CONNECTIONS", 2 if http2 else 20))
+    return {"http2": http2, "max_connections": max_connections}
+
+
+UPSTREAMS = {
+    # Wikipedia reads are idempotent and have a long latency tail
+    "wikipedia": Upstream(
+        "wikipedia", initial_limit=8, max_limit=32, retry=retry_policy("wikipedia"),
+        timeout=httpx.Timeout(15.0, connect=5.0), hedge=hedge_policy("wikipedia"),
+        # Wikimedia asks every client to identify itself
+        headers={"User-Agent": "WikiCap/1.0 (https://github.com/WikiCap/year-overview)"},
+        warm_urls=("https://en.wikipedia.org/w/api.php",),
+        **connection_options("wikipedia"),
+    ),
+    "tmdb": Upstream(
+        "tmdb", initial_limit=10, max_limit=40, retry=retry_policy("tmdb"),
+        timeout=httpx.Timeout(8.0, connect=3.0), warm_urls=("https://api.themoviedb.org/3",),
+        **connection_options("tmdb"),
+    ),
+    "lastfm": Upstream(
+        "lastfm", initial_limit=4, max_limit=16, retry=retry_policy("lastfm", max_attempts=2),
+        warm_urls=("https://ws.audioscrobbler.com/2.0/",), **connection_options("lastfm"),
+    ),
+    "spotify": Upstream(
+        "spotify", initial_limit=6, max_limit=24, retry=retry_policy("spotify", max_attempts=1),
+        # The token endpoint on accounts.spotify.com is warmed by fetching a token
+        warm_urls=("https://api.spotify.com/v1",), **connection_options("spotify"),
+    ),
+    # Free Vercel deployment: cold starts are slow, outages are not rare
+    "awards": Upstream(
+        "awards", initial_limit=4, max_limit=16, retry=retry_policy("awards", base_delay=0.5),
+        timeout=httpx.Timeout(8.0, connect=3.0), failure_threshold=3, recovery_timeout=60.0,
+        warm_urls=("https://theawards.vercel.app/api",), **connection_options("awards"),
+    ),
+    # Image hosts behind the image proxy (app.services.image_proxy)
+    "tmdb_images": Upstream(
+        "tmdb_images", initial_limit=8, max_limit=32, retry=retry_policy("tmdb_images"),
+        timeout=httpx.Timeout(15.0, connect=3.0), **connection_options("tmdb_images"),
+    ),
+    "wikimedia": Upstream(
+        "wikimedia", initial_limit=8, max_limit=32, retry=retry_policy("wikimedia"),
+        timeout=httpx.Timeout(15.0, connect=3.0),
+        headers={"User-Agent": "WikiCap/1.0 (https://github.com/WikiCap/year-overview)"},
+        **connection_options("wikimedia"),
+    ),
+}
+
+REQUESTS = metrics.counter(
+    "upstream_requests_total", "Upstream requests by outcome", ("upstream", "status")
+)
+LATENCY = metrics.counter(
+    "upstream_request_seconds_total", "Total time spent in upstream requests", ("upstream",)
+)
+RETRIES = metrics.counter(
+    "upstream_retries_total", "Retried upstream requests by reason", ("upstream", "reason")
+)
+
+_clients: dict[str, httpx.AsyncClient] = {}
+_limiters: dict[str, AdaptiveLimiter] = {}
+_breakers: dict[str, CircuitBreaker] = {}
+_hedgers: dict[str, Hedger] = {}
+_dns = CachingDNSBackend(ttl=config.DNS_CACHE_TTL)
+
+
+def get_settings(upstream: str) -> Upstream:
+    return UPSTREAMS.get(upstream) or Upstream(upstream)
+
+
+def get_client(upstream: str) -> httpx.AsyncClient:
+    """
+    Return the pooled client for an upstream, creating it on first use.
+
+    Args:
+        upstream (str): Upstream name, e.g. "tmdb" or "spotify".
+
+    Returns:
+        httpx.AsyncClient: A client shared by all calls to that upstream.
+    """
+    client = _clients.get(upstream)
+    if client is None or client.is_closed:
+        settings = get_settings(upstream)
+        transport = httpx.AsyncHTTPTransport(
+            http2=settings.http2,
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_connections,
+                keepalive_expiry=config.UPSTREAM_KEEPALIVE_SECONDS,
+            ),
+        )
+        # httpx 0.27 has no public option for the network backend of its pool
+        transport._pool._network_backend = _dns
+        client = httpx.AsyncClient(timeout=settings.timeout, headers=settings.headers, transport=transport)
+        _clients[upstream] = client
+    return client
+
+
+def get_limiter(upstream: str) -> AdaptiveLimiter:
+    """
+    Return the adaptive concurrency limiter for an upstream.
+    """
+    limiter = _limiters.get(upstream)
+    if limiter is None:
+        settings = get_settings(upstream)
+        limiter = AdaptiveLimiter(
+            upstream,
+            initial=settings.initial_limit,
+            max_limit=settings.max_limit,
+        )
+        _limiters[upstream] = limiter
+    return limiter
+
+
+def get_breaker(upstream: str) -> CircuitBreaker:
+    """
+    Return the circuit breaker for an upstream.
+    """
+    breaker = _breakers.get(upstream)
+    if breaker is None:
+        settings = get_settings(upstream)
+        breaker = CircuitBreaker(
+            upstream,
+            failure_threshold=settings.failure_threshold,
+            recovery_timeout=settings.recovery_timeout,
+        )
+        _breakers[upstream] = breaker
+    return breaker
+
+
+def get_hedger(upstream: str) -> Hedger | None:
+    """
+    Return the hedger for an upstream, None if it has no hedge policy.
+    """
+    settings = get_settings(upstream)
+    if settings.hedge is None:
+        return None
+    hedger = _hedgers.get(upstream)
+    if hedger is None:
+        hedger = Hedger(upstream, settings.hedge)
+        _hedgers[upstream] = hedger
+    return hedger
+
+
+def upstream_health() -> dict[str, dict]:
+    """
+    Return breaker and limiter state for every known upstream.
+    """
+    return {
+        name: {
+            **get_breaker(name).snapshot(),
+            "configured": not config.missing_credentials(name),
+            "concurrency_limit": int(get_limiter(name).limit),
+            "in_flight": get_limiter(name).in_flight,
+        }
+        for name in UPSTREAMS
+    }
+
+
+async def send(
+    upstream: str,
+    method: str,
+    url: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Send a single request attempt to an upstream under its circuit breaker
+    and concurrency limiter.
+
+    Raises:
+        CircuitOpenError: If the upstream's circuit breaker is open.
+        DeadlineExceeded: If the request deadline passed before or during the attempt.
+        httpx.RequestError: If the request fails due to network issues
+    """
+    deadline.check()
+    client = client or get_client(upstream)
+    limiter = get_limiter(upstream)
+    breaker = get_breaker(upstream)
+    kwargs["timeout"] = deadline.clamp_timeout(httpx.Timeout(kwargs.get("timeout", client.timeout)))
+
+    probe = breaker.before_call()
+    try:
+        # Waiting for a slot also counts against the deadline
+        async with deadline.enforce(), limiter:
+            started = time.monotonic()
+            quota.ledger.record(upstream)
+            try:
+                response = await client.request(method, url, **kwargs)
+            except httpx.TimeoutException as e:
+                if deadline.expired():
+                    # Our own deadline cut the call short; not the upstream's fault
+                    raise deadline.DeadlineExceeded("Request deadline exceeded") from e
+                limiter.record(None)
+                breaker.record(None, probe=probe)
+                probe = False
+                REQUESTS.inc(upstream=upstream, status="error")
+                raise
+            except httpx.RequestError:
+                limiter.record(None)
+                breaker.record(None, probe=probe)
+                probe = False
+                REQUESTS.inc(upstream=upstream, status="error")
+                raise
+
+            latency = time.monotonic() - started
+            limiter.record(
+                latency,
+                response.status_code,
+                parse_retry_after(response.headers.get("Retry-After")),
+            )
+            breaker.record(response.status_code, probe=probe)
+            probe = False
+    finally:
+        if probe:
+            # The probe ended without an outcome, e.g. it was cancelled while queued
+            breaker.cancel()
+
+    REQUESTS.inc(upstream=upstream, status=response.status_code)
+    LATENCY.inc(latency, upstream=upstream)
+    return response
+
+
+async def request(
+    upstream: str,
+    method: str,
+    url: str,
+    *,
+    client: httpx.AsyncClient | None = None,
+    hedge: bool = False,
+    **kwargs,
+) -> httpx.Response:
+    """
+    Send a request to an upstream under its concurrency limiter.
+
+    GET requests that fail with a connection error, a timeout or a retryable
+    status (429, 5xx) are retried according to the upstream's retry policy,
+    as long as the backoff still fits in the remaining request deadline. The
+    last response is returned as is; callers decide whether to call
+    raise_for_status().
+
+    With ``hedge=True``, for upstreams with a hedge policy, a GET attempt
+    that is slower than the policy's latency percentile is hedged with a
+    second, identical attempt. Hedging is opt-in per call, so the hedge
+    budget goes to the reads that hold up a response, not to enrichment.
+
+    Args:
+        upstream (str): Upstream name, e.g. "wikipedia".
+        method (str): HTTP method.
+        url (str): Request URL.
+        client (httpx.AsyncClient | None): Client to send the request with.
+            Defaults to the pooled client of the upstream.
+        hedge (bool): Hedge slow attempts (GET only, see above).
+        **kwargs: Passed on to httpx.AsyncClient.request (params, headers, ...).
+
+    Returns:
+        httpx.Response: The upstream response.
+
+    Raises:
+        DeadlineExceeded: If the request deadline passes first.
+        RateLimited: If the API client has used up its fan-out rate limit.
+        UpstreamNotConfigured: If the upstream's credentials are missing.
+        httpx.RequestError: If the request fails due to network issues
+    """
+    missing = config.missing_credentials(upstream)
+    if missing:
+        raise UpstreamNotConfigured(upstream, missing)
+    await ratelimit.charge_fanout()
+    settings = UPSTREAMS.get(upstream)
+    policy = settings.retry if settings and method == "GET" else NO_RETRY
+    hedger = get_hedger(upstream) if hedge and method == "GET" else None
+
+    def attempt_once():
+        return send(upstream, method, url, client=client, **kwargs)
+
+    attempt = 0
+    while True:
+        error = response = None
+        try:
+            if hedger is not None:
+                response = await hedger.run(attempt_once)
+            else:
+                response = await attempt_once()
+        except httpx.TransportError as e:
+            if attempt + 1 >= policy.max_attempts:
+                raise
+            error = e
+            reason = type(e).__name__
+            delay = policy.backoff(attempt)
+        else:
+            if response.status_code not in policy.retry_statuses or attempt + 1 >= policy.max_attempts:
+                return response
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            if retry_after is not None and retry_after > policy.max_delay:
+                return response
+            reason = str(response.status_code)
+            delay = max(retry_after or 0, policy.backoff(attempt))
+
+        # Not worth waiting if the caller will have given up by then
+        remaining = deadline.remaining()
+        if remaining is not None and delay >= remaining:
+            if error is not None:
+                raise error
+            return response
+
+        RETRIES.inc(upstream=upstream, reason=reason)
+        attempt += 1
+        await asyncio.sleep(delay)
+
+
+async def get(upstream: str, url: str, **kwargs) -> httpx.Response:
+    """
+    Send a GET request to an upstream. See request().
+    """
+    return await request(upstream, "GET", url, **kwargs)
+
+
+async def close_clients() -> None:
+    """
+    Close all pooled clients. Called when the application shuts down.
+    """
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
@@ -0,0 +1,118 @@
+"""
+HTTP caching headers for API responses.
+
+HTTPCacheMiddleware gives every successful GET response under /api/v1 a
+strong ETag (the SHA-256 of the body, or the ETag a route already set),
+answers matching If-None-Match requests with 304 Not Modified, and sets
+Cache-Control by route:
+
+- /api/v1/year/{year}/... for a past year: cacheable for a day, and served
+  stale for a week while the browser or proxy revalidates
+- the same routes for the current (or a future) year: a minute, plus a few
+  minutes of stale-while-revalidate, matching the server-side cache
+- everything else: no-cache, i.e. always revalidated, which the ETag makes
+  cheap
+
+Routes can override this by setting Cache-Control themselves, e.g. for
+degraded responses that must not be kept (DEGRADED_CACHE_CONTROL).
+
+Compressed representations carry the ETag with an encoding suffix (see
+app.core.compression); validators are compared without it, so a client
+revalidating its brotli copy gets a 304 too.
+"""
+
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+from app.core.cache import CURRENT_YEAR_TTL, HISTORIC_TTL
+from datetime import date
+import hashlib
+import re
+
+HISTORIC_CACHE_CONTROL = f"public, max-age={HISTORIC_TTL}, stale-while-revalidate={7 * HISTORIC_TTL}"
+CURRENT_YEAR_CACHE_CONTROL = f"public, max-age=60, stale-while-revalidate={CURRENT_YEAR_TTL // 2}"
+DEFAULT_CACHE_CONTROL = "no-cache"
+
+# For responses with stale or missing sections: the next request should try again
+DEGRADED_CACHE_CONTROL = "no-store"
+
+# Monitoring and admin endpoints are always fetched fresh, without ETags
+EXCLUDED_PATHS = {"/api/v1/health", "/api/v1/ready", "/api/v1/metrics", "/api/v1/admin/quotas"}
+
+_YEAR_PATH = re.compile(r"/api/v1/year/(\d+)(?:/|$)")
+_ENCODING_SUFFIX = re.compile(r'-(?:br|gzip)"$')
+
+
+def cache_control(path: str) -> str:
+    """
+    Return the Cache-Control header for a successful response on a path.
+    """
+    match = _YEAR_PATH.match(path)
+    if match is None:
+        return DEFAULT_CACHE_CONTROL
+    if int(match.group(1)) < date.today().year:
+        return HISTORIC_CACHE_CONTROL
+    return CURRENT_YEAR_CACHE_CONTROL
+
+
+def strong_etag(body: bytes) -> str:
+    return f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _opaque(etag: str) -> str:
+    return _ENCODING_SUFFIX.sub('"', etag.strip().removeprefix("W/"))
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag (weak comparison, as
+    RFC 9110 requires for If-None-Match, ignoring content-coding suffixes).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = _opaque(etag)
+    return any(_opaque(candidate) == opaque for candidate in if_none_match.split(","))
+
+
+def not_modified(response: Response) -> Response:
+    """
+    Turn a response into 304 Not Modified, keeping its validator and caching headers.
+    """
+    headers = {
+        name: value for name, value in response.headers.items()
+        if name in ("etag", "cache-control", "vary", "content-location", "expires", "last-modified")
+    }
+    return Response(status_code=304, headers=headers)
+
+
+class HTTPCacheMiddleware(BaseHTTPMiddleware):
+    """
+    Adds ETag and Cache-Control to API responses and answers conditional GETs.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        path = request.url.path
+        if request.method != "GET" or not path.startswith("/api/v1/") or path in EXCLUDED_PATHS:
+            return await call_next(request)
+
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+
+        etag = response.headers.get("etag")
+        if etag is None:
+            body = b"".join([chunk async for chunk in response.body_iterator])
+            etag = strong_etag(body)
+            response = Response(
+                content=body,
+                status_code=response.status_code,
+                headers=dict(response.headers),
+            )
+            response.headers["ETag"] = etag
+        response.headers.setdefault("Cache-Control", cache_control(path))
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return not_modified(response)
+        return response
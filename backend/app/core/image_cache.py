@@ -0,0 +1,154 @@
+"""
+Size-bounded, content-addressed disk cache for proxied images.
+
+Image bytes are stored once per content hash under ``blobs/``, so the same
+picture reached through different URLs (or sizes that the upstream serves
+identically) takes space once. ``refs/`` maps a request key (source, path
+and width) to the hash and content type of its image.
+
+Blobs are evicted least recently used once their total size exceeds the
+limit. Recency is the blob's modification time, which is bumped on every
+hit, so the order survives restarts. A ref whose blob was evicted is a
+miss. Each worker keeps its own size index; workers sharing a directory may
+briefly exceed the limit between evictions.
+"""
+
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+import asyncio
+import hashlib
+import os
+import tempfile
+import threading
+
+
+@dataclass(frozen=True)
+class CachedImage:
+    """
+    Attributes:
+        path: File holding the image.
+        content_type: MIME type sent by the upstream.
+        digest: SHA-256 of the image, usable as a strong ETag.
+    """
+    path: Path
+    content_type: str
+    digest: str
+
+
+def _hash(value: bytes) -> str:
+    return hashlib.sha256(value).hexdigest()
+
+
+class DiskImageCache:
+    """
+    Content-addressed image files with an LRU size bound.
+
+    Blocking file operations run in a worker thread.
+    """
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._sizes: OrderedDict[str, int] | None = None
+        self._lock = threading.Lock()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.root / "blobs" / digest[:2] / digest
+
+    def _ref_path(self, key: str) -> Path:
+        return self.root / "refs" / _hash(key.encode())
+
+    def _index(self) -> OrderedDict[str, int]:
+        """
+        Load the blob sizes from disk, oldest first, on first use.
+        """
+        if self._sizes is None:
+            blobs = []
+            for path in (self.root / "blobs").glob("*/*"):
+                if path.name.startswith("."):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                blobs.append((stat.st_mtime, path.name, stat.st_size))
+            blobs.sort()
+            self._sizes = OrderedDict((digest, size) for _, digest, size in blobs)
+            self.total_bytes = sum(self._sizes.values())
+        return self._sizes
+
+    def _write(self, path: Path, content: bytes) -> None:
+        # Write to a temporary file and rename, so readers never see a partial file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(content)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+    def _get(self, key: str) -> CachedImage | None:
+        try:
+            digest, content_type = self._ref_path(key).read_text().split("\n", 1)
+        except (FileNotFoundError, ValueError):
+            return None
+        path = self._blob_path(digest)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        index = self._index()
+        if digest in index:
+            index.move_to_end(digest)
+        return CachedImage(path, content_type, digest)
+
+    def _put(self, key: str, content: bytes, content_type: str) -> CachedImage:
+        digest = _hash(content)
+        path = self._blob_path(digest)
+        index = self._index()
+        if digest not in index:
+            self._write(path, content)
+            index[digest] = len(content)
+            self.total_bytes += len(content)
+        else:
+            os.utime(path)
+            index.move_to_end(digest)
+        self._write(self._ref_path(key), f"{digest}\n{content_type}".encode())
+        self._evict(keep=digest)
+        return CachedImage(path, content_type, digest)
+
+    def _evict(self, keep: str) -> None:
+        index = self._index()
+        while self.total_bytes > self.max_bytes and len(index) > 1:
+            digest, size = next(iter(index.items()))
+            if digest == keep:
+                index.move_to_end(digest)
+                continue
+            del index[digest]
+            self.total_bytes -= size
+            try:
+                self._blob_path(digest).unlink()
+            except FileNotFoundError:
+                pass
+
+    async def get(self, key: str) -> CachedImage | None:
+        """
+        Return the cached image for a request key, or None on a miss.
+        """
+        def get():
+            with self._lock:
+                return self._get(key)
+        return await asyncio.to_thread(get)
+
+    async def put(self, key: str, content: bytes, content_type: str) -> CachedImage:
+        """
+        Store an image under a request key, evicting old images if needed.
+        """
+        def put():
+            with self._lock:
+                return self._put(key, content, content_type)
+        return await asyncio.to_thread(put)
@@ -0,0 +1,219 @@
+"""
+Adaptive concurrency limiter for upstream APIs.
+
+Each upstream gets its own limiter that decides how many requests may be in
+flight at once. The limit adapts AIMD-style:
+
+- a 429 or 503 halves the limit, and a Retry-After header pauses new requests
+  for that long
+- latency well above the long-term average, or a timeout, shrinks it a little
+- a healthy response while the limiter is busy grows it by about one request
+  per round trip
+
+Requests over the limit wait in a queue per priority class (see
+app.core.priority): critical requests are dispatched before enrichment, in
+arrival order within a class. Enrichment may only use ENRICHMENT_SHARE of
+the limit, so slots stay free for critical requests arriving later.
+"""
+
+from collections import deque
+from email.utils import parsedate_to_datetime
+from app.core import metrics, priority
+import asyncio
+import time
+
+LIMIT = metrics.gauge(
+    "upstream_concurrency_limit", "Current adaptive concurrency limit per upstream", ("upstream",)
+)
+IN_FLIGHT = metrics.gauge(
+    "upstream_in_flight", "Requests currently in flight per upstream", ("upstream",)
+)
+QUEUE_DEPTH = metrics.gauge(
+    "upstream_queue_depth", "Requests waiting for a concurrency slot per upstream", ("upstream", "priority")
+)
+
+# Share of the concurrency limit enrichment requests may occupy
+ENRICHMENT_SHARE = 0.75
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """
+    Parse a Retry-After header into a number of seconds.
+
+    Args:
+        value (str | None): Header value, either delay-seconds or an HTTP date.
+
+    Returns:
+        float | None: Seconds to wait, or None if the header is missing or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limiter for one upstream.
+
+    Usage:
+        async with limiter:
+            response = await client.get(...)
+            limiter.record(latency, response.status_code, retry_after)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        *,
+        initial: int = 8,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        latency_tolerance: float = 2.0,
+    ):
+        self.name = name
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.in_flight = 0
+        self.avg_latency: float | None = None
+        self._waiters: dict[str, deque[asyncio.Future]] = {name: deque() for name in priority.PRIORITIES}
+        self._blocked_until = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+        self._last_decrease = 0.0
+        self._update_gauges()
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def _has_capacity(self, priority_class: str = priority.CRITICAL) -> bool:
+        limit = int(self.limit)
+        if priority_class != priority.CRITICAL:
+            limit = max(1, int(limit * ENRICHMENT_SHARE))
+        return self.in_flight < limit and time.monotonic() >= self._blocked_until
+
+    def _update_gauges(self) -> None:
+        LIMIT.set(int(self.limit), upstream=self.name)
+        IN_FLIGHT.set(self.in_flight, upstream=self.name)
+        for priority_class, waiters in self._waiters.items():
+            QUEUE_DEPTH.set(len(waiters), upstream=self.name, priority=priority_class)
+
+    def _dispatch(self) -> None:
+        """
+        Hand free slots to waiting requests, critical ones first, in arrival
+        order within a priority class.
+        """
+        for priority_class in priority.PRIORITIES:
+            waiters = self._waiters[priority_class]
+            while waiters and self._has_capacity(priority_class):
+                future = waiters.popleft()
+                if future.done():
+                    continue
+                self.in_flight += 1
+                future.set_result(None)
+            if waiters:
+                # Lower classes wait until this one is served
+                break
+
+        # Paused by Retry-After: wake the queue up again once the pause is over
+        if self.queue_depth and self._timer is None and time.monotonic() < self._blocked_until:
+            loop = asyncio.get_running_loop()
+            delay = self._blocked_until - time.monotonic()
+            self._timer = loop.call_later(delay, self._on_timer)
+
+        self._update_gauges()
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    async def acquire(self) -> None:
+        """
+        Wait for a free slot. Slots are handed over by priority (of the
+        calling context), then in arrival order.
+        """
+        priority_class = priority.current()
+        ahead = any(
+            self._waiters[name] for name in priority.PRIORITIES[:priority.PRIORITIES.index(priority_class) + 1]
+        )
+        if not ahead and self._has_capacity(priority_class):
+            self.in_flight += 1
+            self._update_gauges()
+            return
+
+        waiters = self._waiters[priority_class]
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        self._dispatch()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # A slot was handed over just before the cancellation, give it back
+                self.release()
+            else:
+                try:
+                    waiters.remove(future)
+                except ValueError:
+                    pass
+                self._update_gauges()
+            raise
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._dispatch()
+
+    async def __aenter__(self) -> "AdaptiveLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+    def _decrease(self, factor: float) -> None:
+        """
+        Shrink the limit, at most once per average round trip, so a burst of
+        errors from requests that were sent together counts as one signal.
+        """
+        now = time.monotonic()
+        if now - self._last_decrease < (self.avg_latency or 0):
+            return
+        self._last_decrease = now
+        self.limit = max(self.min_limit, self.limit * factor)
+
+    def record(self, latency: float | None, status: int | None = None, retry_after: float | None = None) -> None:
+        """
+        Adjust the limit from the outcome of a request. Called while the
+        request still holds its slot.
+
+        Args:
+            latency (float | None): Request duration in seconds, None if the
+                request failed without a response.
+            status (int | None): HTTP status code, None on a transport error.
+            retry_after (float | None): Seconds from a Retry-After header.
+        """
+        if status in (429, 503):
+            self._decrease(0.5)
+            if retry_after:
+                self._blocked_until = max(self._blocked_until, time.monotonic() + retry_after)
+        elif latency is None:
+            self._decrease(0.9)
+        else:
+            if self.avg_latency is not None and latency > self.avg_latency * self.latency_tolerance:
+                self._decrease(0.9)
+            elif self.in_flight >= int(self.limit):
+                # Only grow while the limit is actually being used
+                self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+            # Slow moving average, so a lasting change in latency becomes the new normal
+            self.avg_latency = latency if self.avg_latency is None else 0.95 * self.avg_latency + 0.05 * latency
+
+        self._dispatch()
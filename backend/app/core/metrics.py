@@ -0,0 +1,91 @@
+"""
+Minimal in-process metrics registry.
+
+Counters and gauges are kept in memory and rendered in the Prometheus text
+exposition format by the /metrics endpoint. Metric values are per worker
+process.
+"""
+
+from collections import defaultdict
+from threading import Lock
+
+_registry: dict[str, "Metric"] = {}
+
+
+class Metric:
+    """
+    A named metric with one value per label combination.
+    """
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.description = description
+        self.labels = labels
+        self._values: dict[tuple, float] = defaultdict(float)
+        self._lock = Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def render(self) -> list[str]:
+        lines = [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.kind}",
+        ]
+        for key, value in sorted(self._values.items()):
+            if self.labels:
+                label_text = ",".join(
+                    f'{label}="{label_value}"' for label, label_value in zip(self.labels, key)
+                )
+                lines.append(f"{self.name}{{{label_text}}} {value:g}")
+            else:
+                lines.append(f"{self.name} {value:g}")
+        return lines
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] += amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+def counter(name: str, description: str, labels: tuple[str, ...] = ()) -> Counter:
+    """
+    Return the counter registered under ``name``, creating it if needed.
+    """
+    if name not in _registry:
+        _registry[name] = Counter(name, description, labels)
+    return _registry[name]
+
+
+def gauge(name: str, description: str, labels: tuple[str, ...] = ()) -> Gauge:
+    """
+    Return the gauge registered under ``name``, creating it if needed.
+    """
+    if name not in _registry:
+        _registry[name] = Gauge(name, description, labels)
+    return _registry[name]
+
+
+def render() -> str:
+    """
+    Render all registered metrics in the Prometheus text format.
+    """
+    lines = []
+    for metric in _registry.values():
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
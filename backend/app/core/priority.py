@@ -0,0 +1,37 @@
+"""
+Request priority classes for upstream calls.
+
+Within one aggregation, core facts (events, movies, Nobel prizes, award
+winners) and enrichment (images, hit songs) share the same upstream
+concurrency slots. The priority of the running code is kept in a context
+variable: upstream calls are "critical" unless they run inside
+as_enrichment(). The adaptive limiters dispatch critical calls first and
+keep part of their slots free for them.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+CRITICAL = "critical"
+ENRICHMENT = "enrichment"
+
+# Dispatch order, most important first
+PRIORITIES = (CRITICAL, ENRICHMENT)
+
+_priority: ContextVar[str] = ContextVar("priority", default=CRITICAL)
+
+
+def current() -> str:
+    return _priority.get()
+
+
+@contextmanager
+def as_enrichment():
+    """
+    Run the enclosed upstream calls, and tasks started in it, as enrichment.
+    """
+    token = _priority.set(ENRICHMENT)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
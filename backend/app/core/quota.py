@@ -0,0 +1,257 @@
+"""
+Upstream quota accounting.
+
+Last.fm, TMDb and Spotify enforce request quotas, and exceeding them only
+shows up as 429 responses. The quota ledger counts every request sent to an
+upstream (in app.core.http, so retries and hedges count too) in rolling
+windows and compares the counts with configured budgets (<UPSTREAM>_QUOTA,
+e.g. "1500/5m" or "5/1s,50000/1d").
+
+Low-priority enrichment (artist images, hit songs, Oscar posters and
+photos) goes through enrichment(): once an upstream has used
+QUOTA_SOFT_LIMIT of any budget, enrichment is served from the cache, even if
+expired, or skipped, leaving the quota to the requests that need it. The
+same happens when the request deadline is close: enrichment calls run with
+enrichment priority (app.core.priority), are not started with less than
+ENRICHMENT_RESERVE_SECONDS left and are abandoned that long before the
+deadline, so the core facts still make it into the response. Enrichment
+skipped without a cached value is recorded (track_skipped), so a section
+missing some of its data is not cached as complete.
+
+Counts are kept per worker process.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Hashable, Iterator
+from app.core import config, deadline, metrics, priority
+from app.core.cache import cache
+import asyncio
+import math
+import re
+import time
+
+DEFERRED = metrics.counter(
+    "quota_deferred_total", "Low-priority upstream calls deferred to save quota", ("upstream", "outcome")
+)
+DROPPED = metrics.counter(
+    "enrichment_dropped_total", "Enrichment calls dropped because the request deadline was close", ("upstream", "outcome")
+)
+UTILIZATION = metrics.gauge(
+    "upstream_quota_utilization", "Share of the most used quota window per upstream", ("upstream",)
+)
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+@dataclass(frozen=True)
+class QuotaWindow:
+    """
+    A budget of ``budget`` requests per rolling window of ``seconds``.
+    """
+    budget: int
+    seconds: float
+    label: str
+
+
+def parse_quota(spec: str) -> list[QuotaWindow]:
+    """
+    Parse a quota specification such as "5/1s,50000/1d".
+
+    Args:
+        spec (str): Comma-separated "<requests>/<number><s|m|h|d>" budgets.
+            An empty string means no budget.
+
+    Returns:
+        list[QuotaWindow]: One window per budget.
+
+    Raises:
+        ValueError: If the specification is malformed.
+    """
+    windows = []
+    for part in filter(None, (part.strip() for part in spec.split(","))):
+        match = re.fullmatch(r"(\d+)\s*/\s*(\d*)([smhd])", part)
+        if not match:
+            raise ValueError(f"Invalid quota {part!r}, expected e.g. '5/1s' or '50000/1d'")
+        budget, count, unit = match.groups()
+        count = int(count or 1)
+        windows.append(QuotaWindow(int(budget), count * _UNITS[unit], f"{count}{unit}"))
+    return windows
+
+
+class RollingCounter:
+    """
+    Approximate count of events in a rolling window, kept in a fixed number of slots.
+    """
+
+    def __init__(self, seconds: float, slots: int = 60):
+        self.slot_seconds = seconds / slots
+        self._counts = [0] * slots
+        self._slot_ids = [-1] * slots
+
+    def _slot(self, now: float) -> tuple[int, int]:
+        slot_id = math.floor(now / self.slot_seconds)
+        return slot_id % len(self._counts), slot_id
+
+    def add(self, now: float) -> None:
+        index, slot_id = self._slot(now)
+        if self._slot_ids[index] != slot_id:
+            self._slot_ids[index] = slot_id
+            self._counts[index] = 0
+        self._counts[index] += 1
+
+    def total(self, now: float) -> int:
+        _, current = self._slot(now)
+        oldest = current - len(self._counts) + 1
+        return sum(
+            count for count, slot_id in zip(self._counts, self._slot_ids)
+            if slot_id >= oldest
+        )
+
+
+class QuotaLedger:
+    """
+    Request counts per upstream against their quota windows.
+    """
+
+    def __init__(self, quotas: dict[str, list[QuotaWindow]]):
+        self.quotas = quotas
+        self._counters = {
+            upstream: [RollingCounter(window.seconds) for window in windows]
+            for upstream, windows in quotas.items()
+        }
+        self._totals: dict[str, int] = {}
+
+    def record(self, upstream: str) -> None:
+        """
+        Count one request sent to an upstream.
+        """
+        now = time.time()
+        self._totals[upstream] = self._totals.get(upstream, 0) + 1
+        for counter in self._counters.get(upstream, ()):
+            counter.add(now)
+        UTILIZATION.set(round(self.utilization(upstream), 3), upstream=upstream)
+
+    def utilization(self, upstream: str) -> float:
+        """
+        Return the share of the most used budget of an upstream, 0 without budgets.
+        """
+        now = time.time()
+        return max(
+            (counter.total(now) / window.budget
+             for window, counter in zip(self.quotas.get(upstream, ()), self._counters.get(upstream, ()))),
+            default=0.0,
+        )
+
+    def nearly_spent(self, upstream: str) -> bool:
+        return self.utilization(upstream) >= config.QUOTA_SOFT_LIMIT
+
+    def snapshot(self) -> dict[str, dict]:
+        """
+        Return usage per upstream and window for the admin endpoint.
+        """
+        now = time.time()
+        result = {}
+        for upstream in sorted(set(self.quotas) | set(self._totals)):
+            windows = []
+            for window, counter in zip(self.quotas.get(upstream, ()), self._counters.get(upstream, ())):
+                used = counter.total(now)
+                windows.append({
+                    "window": window.label,
+                    "budget": window.budget,
+                    "used": used,
+                    "remaining": max(0, window.budget - used),
+                    "utilization": round(used / window.budget, 3),
+                })
+            result[upstream] = {
+                "total_requests": self._totals.get(upstream, 0),
+                "nearly_spent": self.nearly_spent(upstream),
+                "windows": windows,
+            }
+        return result
+
+
+ledger = QuotaLedger({
+    upstream: parse_quota(spec) for upstream, spec in config.UPSTREAM_QUOTAS.items()
+})
+
+
+_skipped: ContextVar[list | None] = ContextVar("skipped_enrichment", default=None)
+
+
+@contextmanager
+def track_skipped() -> Iterator[list[tuple[str, Hashable]]]:
+    """
+    Record the enrichment skipped within the block, including in tasks it
+    starts.
+
+    Yields:
+        list[tuple[str, Hashable]]: (upstream, key) of every enrichment call
+        that returned nothing because it was skipped.
+    """
+    skipped = []
+    token = _skipped.set(skipped)
+    try:
+        yield skipped
+    finally:
+        _skipped.reset(token)
+
+
+def skip(upstream: str, key: Hashable, fallback: Any) -> Any:
+    skipped = _skipped.get()
+    if fallback is None and skipped is not None:
+        skipped.append((upstream, key))
+    return fallback
+
+
+async def enrichment(
+    upstream: str,
+    key: Hashable,
+    loader: Callable[[], Awaitable[Any]],
+    ttl: float,
+) -> Any | None:
+    """
+    Load low-priority data, backing off when the upstream's quota or the
+    request's time budget runs low.
+
+    Args:
+        upstream (str): Upstream the loader calls.
+        key (Hashable): Cache key of the result.
+        loader (Callable[[], Awaitable]): Coroutine function fetching the data.
+        ttl (float): Time to live of a fetched result, in seconds.
+
+    Returns:
+        Any | None: The cached or fetched value. While the quota is nearly
+        spent or the deadline is close, or if the upstream is not
+        configured, the last cached value even if expired, or None. A
+        None from skipping is recorded for track_skipped(); one from an
+        unconfigured upstream is not, since it is not going to change.
+    """
+    entry = await cache.get_entry(key)
+    if entry is not None and entry.fresh:
+        return entry.value
+    fallback = entry.value if entry is not None else None
+    outcome = "stale" if entry is not None else "skipped"
+
+    if config.missing_credentials(upstream):
+        return fallback
+
+    if ledger.nearly_spent(upstream):
+        DEFERRED.inc(upstream=upstream, outcome=outcome)
+        return skip(upstream, key, fallback)
+
+    budget = deadline.remaining()
+    if budget is not None:
+        budget -= config.ENRICHMENT_RESERVE_SECONDS
+        if budget <= 0:
+            DROPPED.inc(upstream=upstream, outcome=outcome)
+            return skip(upstream, key, fallback)
+
+    with priority.as_enrichment():
+        try:
+            async with asyncio.timeout(budget):
+                return await cache.get_or_load(key, loader, ttl)
+        except TimeoutError:
+            DROPPED.inc(upstream=upstream, outcome=outcome)
+            return skip(upstream, key, fallback)
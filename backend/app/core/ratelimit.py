@@ -0,0 +1,335 @@
+"""
+Per-client API rate limiting.
+
+Every client (an API key from API_KEYS sent in X-API-Key, otherwise the
+client IP) has two token buckets:
+
+- "requests": charged once for every API request. Generous, since most
+  requests are answered from the cache.
+- "fanout": charged once for every request that actually calls upstream
+  APIs (a cache miss). Much smaller, because these spend our Last.fm, TMDb
+  and Spotify quotas.
+- "images": the fan-out bucket of image proxy requests, which skip the
+  request bucket (a page shows dozens of images, mostly served from disk);
+  only images missing from the disk cache are charged.
+
+RateLimitMiddleware charges the request bucket and keeps the client in a
+context variable. charge_fanout() is called where a request is about to
+call upstreams (app.core.http, and admission.load_cached on a miss), and
+charges the fan-out bucket at most once per request. Once a request is
+rejected, every later upstream call of that request is rejected too, so
+concurrent calls do not go out while the first rejection travels to the
+handler; code gathering calls with return_exceptions must pass it on
+(raise_rate_limited).
+
+Responses carry RateLimit-Limit, RateLimit-Remaining, RateLimit-Reset and
+RateLimit-Policy headers for the request bucket. Rejected requests get 429
+with Retry-After.
+
+Bucket state lives in memory per worker. With RATE_LIMIT_BACKEND=sqlite it
+is kept in a local SQLite file shared by all workers on the host.
+"""
+
+from collections import OrderedDict
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from app.core import config, metrics
+import asyncio
+import math
+import sqlite3
+import time
+
+REJECTED = metrics.counter(
+    "rate_limit_rejected_total", "API requests rejected by the rate limiter", ("bucket",)
+)
+
+# Paths that are never rate limited (monitoring and the API root)
+EXEMPT_PATHS = {"/", "/api/v1/health", "/api/v1/ready", "/api/v1/metrics"}
+
+# Path prefixes whose requests skip the request bucket and are charged to the
+# image bucket on a miss: the image proxy, since a single page shows dozens
+# of images and repeat views are served from disk
+IMAGE_PREFIXES = ("/api/v1/img/",)
+
+
+@dataclass(frozen=True)
+class BucketPolicy:
+    """
+    Attributes:
+        name: Bucket name, used in keys, headers and metrics.
+        capacity: Maximum tokens, i.e. the allowed burst.
+        per_minute: Tokens refilled per minute, i.e. the sustained rate.
+    """
+    name: str
+    capacity: float
+    per_minute: float
+
+    @property
+    def refill_rate(self) -> float:
+        return self.per_minute / 60
+
+
+@dataclass(frozen=True)
+class Decision:
+    """
+    Outcome of charging a bucket.
+
+    Attributes:
+        allowed: Whether the token was taken.
+        remaining: Whole tokens left afterwards.
+        reset: Seconds until the bucket is full again.
+        retry_after: Seconds until a token is available, 0 if allowed.
+    """
+    allowed: bool
+    remaining: int
+    reset: int
+    retry_after: int
+
+
+def refill(tokens: float, updated: float, now: float, policy: BucketPolicy) -> float:
+    return min(policy.capacity, tokens + (now - updated) * policy.refill_rate)
+
+
+def decide(tokens: float, allowed: bool, policy: BucketPolicy) -> Decision:
+    missing = policy.capacity - tokens
+    return Decision(
+        allowed=allowed,
+        remaining=int(tokens),
+        reset=math.ceil(missing / policy.refill_rate) if missing > 0 else 0,
+        retry_after=0 if allowed else math.ceil((1 - tokens) / policy.refill_rate),
+    )
+
+
+class MemoryBucketStore:
+    """
+    Token buckets in memory, local to this worker process.
+
+    Least recently used buckets are dropped beyond ``max_keys``; a dropped
+    client simply starts again with a full bucket.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    async def take(self, key: str, policy: BucketPolicy) -> Decision:
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (policy.capacity, now))
+        tokens = refill(tokens, updated, now, policy)
+        allowed = tokens >= 1
+        if allowed:
+            tokens -= 1
+        self._buckets[key] = (tokens, now)
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return decide(tokens, allowed, policy)
+
+
+class SQLiteBucketStore:
+    """
+    Token buckets in a local SQLite file, shared by all workers on a host.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        db = self._connect()
+        try:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)"
+            )
+        finally:
+            db.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=1.0, isolation_level=None)
+
+    def _take(self, key: str, policy: BucketPolicy) -> Decision:
+        # Wall-clock time: monotonic clocks are not comparable across processes
+        now = time.time()
+        db = self._connect()
+        try:
+            db.execute("BEGIN IMMEDIATE")
+            row = db.execute("SELECT tokens, updated FROM buckets WHERE key = ?", (key,)).fetchone()
+            tokens = policy.capacity if row is None else refill(row[0], row[1], now, policy)
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+            db.execute(
+                "INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated",
+                (key, tokens, now),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            if db.in_transaction:
+                db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+        return decide(tokens, allowed, policy)
+
+    async def take(self, key: str, policy: BucketPolicy) -> Decision:
+        return await asyncio.to_thread(self._take, key, policy)
+
+
+REQUEST_POLICY = BucketPolicy("requests", config.RATE_LIMIT_BURST, config.RATE_LIMIT_PER_MINUTE)
+FANOUT_POLICY = BucketPolicy("fanout", config.RATE_LIMIT_FANOUT_BURST, config.RATE_LIMIT_FANOUT_PER_MINUTE)
+IMAGE_POLICY = BucketPolicy("images", config.RATE_LIMIT_IMAGE_BURST, config.RATE_LIMIT_IMAGE_PER_MINUTE)
+
+
+def create_store():
+    if config.RATE_LIMIT_BACKEND == "sqlite":
+        return SQLiteBucketStore(config.RATE_LIMIT_DB_PATH)
+    return MemoryBucketStore()
+
+
+class RateLimited(Exception):
+    """
+    Raised when a client has used up a bucket. Turned into 429 by the app.
+    """
+
+    def __init__(self, policy: BucketPolicy, decision: Decision):
+        super().__init__(f"Rate limit exceeded ({policy.name})")
+        self.policy = policy
+        self.decision = decision
+
+
+@dataclass
+class ClientContext:
+    """
+    The rate-limited client of the current request.
+
+    Tasks inherit it with the rest of the context, so background work
+    started from a request (e.g. oscar_index.schedule_refresh) must start in
+    an empty context, or it is charged to, and rejected with, that client.
+    """
+    key: str
+    fanout_policy: BucketPolicy = FANOUT_POLICY
+    fanout_charged: bool = False
+    fanout_rejected: "RateLimited | None" = None
+
+
+_client: ContextVar[ClientContext | None] = ContextVar("rate_limit_client", default=None)
+_store = None
+
+
+def get_store():
+    global _store
+    if _store is None:
+        _store = create_store()
+    return _store
+
+
+def client_key(request: Request) -> str:
+    """
+    Identify the client: a known API key, otherwise the client IP.
+
+    Unknown API keys are ignored, so sending random keys does not give a
+    client fresh buckets. Likewise only the X-Forwarded-For entries added by
+    our own proxies are used (config.TRUSTED_PROXY_HOPS).
+    """
+    api_key = request.headers.get("x-api-key")
+    if api_key and api_key in config.API_KEYS:
+        return f"key:{api_key}"
+    if config.TRUST_FORWARDED_FOR:
+        forwarded = [address.strip() for address in request.headers.get("x-forwarded-for", "").split(",")]
+        forwarded = [address for address in forwarded if address]
+        if forwarded:
+            # The entry added by the outermost trusted proxy; anything to its
+            # left came from the client
+            return f"ip:{forwarded[-min(config.TRUSTED_PROXY_HOPS, len(forwarded))]}"
+    return f"ip:{request.client.host if request.client else 'unknown'}"
+
+
+def rate_limit_headers(policy: BucketPolicy, decision: Decision) -> dict[str, str]:
+    headers = {
+        "RateLimit-Limit": str(int(policy.capacity)),
+        "RateLimit-Remaining": str(decision.remaining),
+        "RateLimit-Reset": str(decision.reset),
+        "RateLimit-Policy": f"{int(policy.capacity)};w={math.ceil(policy.capacity / policy.refill_rate)}",
+    }
+    if not decision.allowed:
+        headers["Retry-After"] = str(decision.retry_after)
+    return headers
+
+
+def rate_limited_response(exc: RateLimited) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "TOO MANY REQUESTS: Rate limit exceeded, please retry later."},
+        headers=rate_limit_headers(exc.policy, exc.decision),
+    )
+
+
+async def charge_fanout() -> None:
+    """
+    Charge the current client's fan-out bucket, once per request.
+
+    Does nothing outside a rate-limited request (e.g. during the startup
+    warm-up).
+
+    Raises:
+        RateLimited: If the client's fan-out bucket is empty, on this and
+        every later call for the same request.
+    """
+    client = _client.get()
+    if client is None:
+        return
+    if client.fanout_rejected is not None:
+        raise client.fanout_rejected
+    if client.fanout_charged:
+        return
+    client.fanout_charged = True
+    policy = client.fanout_policy
+    decision = await get_store().take(f"{policy.name}:{client.key}", policy)
+    if not decision.allowed:
+        REJECTED.inc(bucket=policy.name)
+        client.fanout_rejected = RateLimited(policy, decision)
+        raise client.fanout_rejected
+
+
+def raise_rate_limited(results: Iterable) -> None:
+    """
+    Re-raise a RateLimited among ``asyncio.gather(..., return_exceptions=True)``
+    results, which would otherwise be dropped with the other failed calls
+    instead of answering 429.
+    """
+    for result in results:
+        if isinstance(result, RateLimited):
+            raise result
+
+
+class RateLimitMiddleware(BaseHTTPMiddleware):
+    """
+    Charges the request bucket and sets the client for charge_fanout().
+    Image proxy requests only set the client, with the image bucket.
+    """
+
+    async def dispatch(self, request: Request, call_next):
+        if not config.RATE_LIMIT_ENABLED or request.method == "OPTIONS" or request.url.path in EXEMPT_PATHS:
+            return await call_next(request)
+
+        key = client_key(request)
+        if request.url.path.startswith(IMAGE_PREFIXES):
+            _client.set(ClientContext(key, fanout_policy=IMAGE_POLICY))
+            return await call_next(request)
+
+        decision = await get_store().take(f"{REQUEST_POLICY.name}:{key}", REQUEST_POLICY)
+        if not decision.allowed:
+            REJECTED.inc(bucket=REQUEST_POLICY.name)
+            return rate_limited_response(RateLimited(REQUEST_POLICY, decision))
+
+        _client.set(ClientContext(key))
+        response = await call_next(request)
+        # A 429 from the fan-out bucket already carries that bucket's headers
+        for name, value in rate_limit_headers(REQUEST_POLICY, decision).items():
+            response.headers.setdefault(name, value)
+        return response
@@ -0,0 +1,37 @@
+"""
+Retry policy for idempotent upstream requests.
+
+Failed GETs are retried with exponential backoff and full jitter: the delay
+before retry n is a random value between 0 and min(max_delay, base_delay * 2**n).
+A Retry-After header from the upstream overrides a shorter backoff.
+"""
+
+from dataclasses import dataclass
+import random
+
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    Attributes:
+        max_attempts: Total number of attempts, including the first one.
+        base_delay: Backoff before the first retry, in seconds (before jitter).
+        max_delay: Upper bound for a single backoff, in seconds. A Retry-After
+            longer than this is not waited for.
+        retry_statuses: Response status codes worth retrying.
+    """
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+    retry_statuses: frozenset = RETRY_STATUSES
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Return the delay before retrying after failed attempt number ``attempt`` (0-based).
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+
+NO_RETRY = RetryPolicy(max_attempts=1)
@@ -3,8 +3,21 @@ from dotenv import load_dotenv
 import os
 load_dotenv()
 
-from fastapi import FastAPI
+import asyncio
+import contextvars
+from contextlib import asynccontextmanager
+from fastapi import Depends, FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from app.core.deadline import DeadlineExceeded, request_deadline
+from app.core import config
+from app.core.admission import Overloaded
+from app.core.ratelimit import RateLimited, RateLimitMiddleware, rate_limited_response
+from app.core.http_cache import HTTPCacheMiddleware
+from app.core.compression import CompressionMiddleware
+from app.core.formats import APIResponse, response_format
+from app.core.http import UpstreamNotConfigured, close_clients
+from app.services import warmup
 from app.api.v1.year import router as year_router
 from app.api.v1.movies import router as movies_router
 from app.api.v1.awards import router as awards_router
@@ -12,24 +25,89 @@ from app.api.v1.wiki import router as wiki_router
 from app.api.v1.nobel import router as nobel_router
 from app.api.v1.billboard import router as billboard_router
 from app.api.v1.music import router as music_router
+from app.api.v1.metrics import router as metrics_router
+from app.api.v1.health import router as health_router
+from app.api.v1.admin import router as admin_router
+from app.api.v1.images import router as images_router
 
-app = FastAPI()
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm up in the background: the worker answers health checks right away
+    # and reports ready at /api/v1/ready when the warm-up is done
+    warmup_task = None
+    if config.WARMUP_ON_STARTUP:
+        # In an empty context: background work has no deadline and no rate-limited client
+        warmup_task = asyncio.create_task(warmup.warm_up(), context=contextvars.Context())
+    else:
+        warmup.mark_ready()
+    yield
+    if warmup_task is not None:
+        warmup_task.cancel()
+    await close_clients()
+
+# JSON via orjson, which serializes large aggregates several times faster than the
+# stdlib json module, or MessagePack for clients that ask for it
+app = FastAPI(lifespan=lifespan, default_response_class=APIResponse)
+
+
+@app.exception_handler(DeadlineExceeded)
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded):
+    return JSONResponse(status_code=504, content={"detail": "Request deadline exceeded"})
+
+
+@app.exception_handler(RateLimited)
+async def rate_limited_handler(request: Request, exc: RateLimited):
+    return rate_limited_response(exc)
+
+
+@app.exception_handler(UpstreamNotConfigured)
+async def upstream_not_configured_handler(request: Request, exc: UpstreamNotConfigured):
+    # For routers that do not map httpx.RequestError to 503 themselves
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"SERVICE UNAVAILABLE: {exc.upstream} is not configured on this server."},
+    )
+
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request: Request, exc: Overloaded):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "SERVICE UNAVAILABLE: Too many requests in progress, please retry later."},
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+app.add_middleware(HTTPCacheMiddleware)
+# Outside the cache middleware, so ETags and 304s are decided on the uncompressed body
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(RateLimitMiddleware)
+
+# Added last so it runs first: preflight requests and 429 responses get CORS headers too
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
-    allow_methods=["*"],
+    allow_origins=config.CORS_ORIGINS,
+    # Credentials cannot be combined with a wildcard origin
+    allow_credentials="*" not in config.CORS_ORIGINS,
+    allow_methods=["GET", "HEAD", "OPTIONS"],
     allow_headers=["*"],
+    expose_headers=["RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset", "RateLimit-Policy", "Retry-After"],
 )
 
-app.include_router(year_router, prefix="/api/v1")
-app.include_router(movies_router, prefix="/api/v1")
-app.include_router(billboard_router, prefix="/api/v1")
-app.include_router(music_router, prefix="/api/v1")
-app.include_router(awards_router, prefix="/api/v1")
-app.include_router(wiki_router, prefix="/api/v1")
-app.include_router(nobel_router, prefix="/api/v1")
+api_dependencies = [Depends(request_deadline), Depends(response_format)]
+
+app.include_router(year_router, prefix="/api/v1", dependencies=api_dependencies)
+app.include_router(movies_router, prefix="/api/v1", dependencies=api_dependencies)
+app.include_router(billboard_router, prefix="/api/v1", dependencies=api_dependencies)
+app.include_router(music_router, prefix="/api/v1", dependencies=api_dependencies)
+app.include_router(awards_router, prefix="/api/v1", dependencies=api_dependencies)
+app.include_router(wiki_router, prefix="/api/v1", dependencies=api_dependencies)
+app.include_router(nobel_router, prefix="/api/v1", dependencies=api_dependencies)
+app.include_router(images_router, prefix="/api/v1", dependencies=[Depends(request_deadline)])
+app.include_router(metrics_router, prefix="/api/v1")
+app.include_router(health_router, prefix="/api/v1", dependencies=[Depends(response_format)])
+app.include_router(admin_router, prefix="/api/v1", dependencies=[Depends(response_format)])
 
 @app.get("/")
 def read_root():
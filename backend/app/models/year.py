@@ -0,0 +1,153 @@
+"""
+Response models for the year sections.
+
+One model per section of the year response, shared by the section
+endpoints (response_model) and the year endpoints (documented response).
+Models allow extra fields, so a field added by a service is passed through
+instead of silently dropped.
+"""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class Section(BaseModel):
+    model_config = ConfigDict(extra="allow")
+
+
+class MediaItem(Section):
+    """
+    A movie or TV series from TMDb.
+    """
+    id: int | None = None
+    title: str
+    rating: float
+    votes: int
+    popularity: float | None = None
+    poster: str | None = None
+    release_date: str | None = None
+
+
+class MoviesSection(Section):
+    year: int
+    top_movies: list[MediaItem]
+    source: str
+
+
+class SeriesSection(Section):
+    year: int
+    top_series: list[MediaItem]
+    source: str
+
+
+class OscarWinner(Section):
+    """
+    Winner of an Oscar category: a film (title, poster) or a person (name,
+    movie, image); screenplay winners have name, movie and poster.
+    """
+    title: str | None = None
+    name: str | None = None
+    movie: str | None = None
+    poster: str | None = None
+    image: str | None = None
+
+
+class OscarHighlights(Section):
+    year: int
+    oscars: dict[str, OscarWinner]
+    source: str
+    # Only on a partial result: categories that could not be loaded
+    missing_categories: list[str] | None = None
+
+
+class BillboardArtists(Section):
+    year: int
+    artists: list[str]
+
+
+class ArtistImage(Section):
+    name: str
+    image: str | None = None
+
+
+class BillboardArtistsWithImages(BillboardArtists):
+    artists_with_images: list[ArtistImage]
+
+
+class Track(Section):
+    title: str
+
+
+class ArtistTopTracks(Section):
+    artist: str
+    top_tracks: list[Track]
+
+
+class BillboardTopSongs(Section):
+    year: int
+    artists: list[ArtistTopTracks]
+
+
+class Laureate(Section):
+    name: str
+    motivation: str | None = None
+    image: str | None = None
+
+
+class NobelPrizes(Section):
+    year: int
+    prizes: dict[str, list[Laureate]]
+
+
+class Song(Section):
+    title: str
+    artist: str | None = None
+    album: str | None = None
+    release_date: str | None = None
+    spotify_url: str | None = None
+    image: str | None = None
+
+
+class SongsSection(Section):
+    year: int
+    top_songs: list[Song]
+    source: str
+
+
+# Month name -> event descriptions
+EventsByMonth = dict[str, list[str]]
+
+
+class YearEvents(Section):
+    year: int
+    events_by_month: EventsByMonth
+
+
+class YearResponse(Section):
+    """
+    GET /year/{year}. A section is null if it could not be loaded.
+    """
+    year: int
+    events_by_month: EventsByMonth | None = None
+    movie_highlights: OscarHighlights | None = None
+    movies: MoviesSection | None = None
+    series: SeriesSection | None = None
+    billboard_top_artists: BillboardArtists | None = None
+    billboard_artist_top_songs: BillboardTopSongs | None = None
+    nobel_prizes: NobelPrizes | None = None
+    spotify_songs: SongsSection | None = None
+    stale_sections: list[str]
+    unavailable_sections: list[str]
+    # Only with ?images=deferred
+    images: str | None = None
+
+
+class YearImagesResponse(Section):
+    """
+    GET /year/{year}/images.
+    """
+    year: int
+    oscars: dict[str, dict[str, str | None]] | None = None
+    artists: dict[str, str | None] | None = None
+    nobel: dict[str, dict[str, str | None]] | None = None
+    stale_sections: list[str]
+    unavailable_sections: list[str]
@@ -1,8 +1,12 @@
 import re
-from bs4 import BeautifulSoup
 from app.clients.billboard_artist_client import get_billboard_page
 from app.clients.artist_img_client import fetch_wiki_image
-from typing import Callable
+from app.core.cache import HISTORIC_TTL
+from app.core.quota import enrichment
+from app.core.ratelimit import raise_rate_limited
+from functools import partial
+from typing import Awaitable, Callable
+import asyncio
 
 
 def find_artist_column(table_data: list[str]) -> int| None:
@@ -52,6 +56,8 @@ async def get_artist_of_the_year(year: int) -> dict:
     """
     html = await get_billboard_page(year)
 
+    # Imported on first use: BeautifulSoup takes tens of milliseconds to import
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html, "html.parser")
 
     # Wikipedia har ofta flera wikitable — vi letar efter en tabell vars header innehåller "Artist"
@@ -109,19 +115,19 @@ async def get_artist_of_the_year(year: int) -> dict:
     }
     
     
-def add_artist_images( year_data: dict, fetch_image: Callable[[str], str | None]) -> dict: 
+async def add_artist_images( year_data: dict, fetch_image: Callable[[str], Awaitable[str | None]]) -> dict: 
     """
     Add image URLs to each artist in the provided year-data. 
     
     This function iterates through the list of artists in ``"year_data"`` and uses the 
-    ``"fetch_image"`` callable to look up an image URL for each artist. 
-    It also has a simple cache in-memory to avoid fetching the same artist image multiple times. 
+    ``"fetch_image"`` coroutine function to look up an image URL for each artist. 
+    Each distinct artist is looked up once, and the lookups run concurrently. 
     
     Parameters
     ---------- 
         year_data: dict
             A dicitionary that includes an ``"artist_list"``.
-        fetch_image: Callable[[str], str| None]
+        fetch_image: Callable[[str], Awaitable[str | None]]
             Returns an image URL for an artist or None.
              
     Returns
@@ -131,17 +137,24 @@ def add_artist_images( year_data: dict, fetch_image: Callable[[str], str | None]
     """
     artist_list = year_data.get("artists", []) 
     
-    image_cache = {}
+    unique_artists = list(dict.fromkeys(artist_list))
+    # Low priority: served from cache or skipped while the Wikipedia quota runs low
+    images = await asyncio.gather(
+        *[
+            enrichment("wikipedia", ("artist_image", artist_name), partial(fetch_image, artist_name), HISTORIC_TTL)
+            for artist_name in unique_artists
+        ],
+        return_exceptions=True
+    )
+    raise_rate_limited(images)
+    image_cache = {
+        artist_name: None if isinstance(image, Exception) else image
+        for artist_name, image in zip(unique_artists, images)
+    }
     
     artists_with_images = []
     
     for artist_name in artist_list: 
-        if artist_name not in image_cache:
-           try:
-               image_cache[artist_name] = fetch_image(artist_name)
-           except Exception:
-               image_cache[artist_name] = None
-               
         artists_with_images.append({
                 "name": artist_name,
                 "image": image_cache[artist_name]
@@ -3,15 +3,18 @@ Awards service module.
 
 This module provides business logic for fetching and processing Oscar (Academy Awards)
 data from The Awards API, enriched with images from The Movie Database (TMDb).
-Focuses on the three major categories: Best Picture, Best Actor, and Best Actress.
+Focuses on the three major categories: Best Picture, Best Actor, and Best Actress,
+with an expanded mode that also covers directing, supporting roles, screenplay
+and international feature.
 """
 
-from app.clients.awards_client import (
-    get_oscar_edition_by_year,
-    get_oscar_categories,
-    get_oscar_category_details
-)
+from app.clients.awards_client import get_oscar_category_details
 from app.clients.movie_client import search_movie_by_title, search_person_by_name
+from app.services.oscar_index import get_edition_categories
+from app.core.cache import HISTORIC_TTL
+from app.core.quota import enrichment
+from app.core.ratelimit import raise_rate_limited
+from functools import partial
 import asyncio
 import re
 
@@ -21,6 +24,28 @@ OSCAR_CATEGORY_MAP = {
     "Actress In A Leading Role": "bestActress",
 }
 
+# Expanded category mode (?categories=all). The Awards API has used both names
+# for the international feature category over the years.
+OSCAR_ALL_CATEGORY_MAP = {
+    **OSCAR_CATEGORY_MAP,
+    "Directing": "bestDirector",
+    "Actor In A Supporting Role": "bestSupportingActor",
+    "Actress In A Supporting Role": "bestSupportingActress",
+    "Writing (Original Screenplay)": "bestOriginalScreenplay",
+    "Writing (Adapted Screenplay)": "bestAdaptedScreenplay",
+    "International Feature Film": "bestInternationalFeature",
+    "Foreign Language Film": "bestInternationalFeature",
+}
+
+# Categories where the winner is the film itself rather than a person
+MOVIE_CATEGORIES = {"bestPicture", "bestInternationalFeature"}
+
+# Categories won by writers, illustrated with the film's poster
+SCREENPLAY_CATEGORIES = {"bestOriginalScreenplay", "bestAdaptedScreenplay"}
+
+# Maximum number of TMDb lookups in flight per request
+TMDB_ENRICH_CONCURRENCY = 4
+
 def extract_movie_title(more_field: str) -> str:
     """
     Extract clean movie title from The Awards API 'more' field.
@@ -50,22 +75,131 @@ def extract_movie_title(more_field: str) -> str:
     return title.strip()
 
 
-async def fetch_oscar_highlights(year: int):
+def find_winner(nominees: list[dict]) -> dict | None:
+    """
+    Return the first nominee marked as winner, or None if there is none.
+    """
+    for nominee in nominees:
+        if nominee.get("winner") is True:
+            return nominee
+    return None
+
+
+def winner_entry(key: str, winner: dict) -> dict:
+    """
+    Build the response entry of a category winner, without images.
+
+    Args:
+        key (str): Response key of the category, e.g. "bestPicture".
+        winner (dict): The winning nominee from The Awards API.
+
+    Returns:
+        dict: {"title", "poster"} for film categories, {"name", "movie",
+        "poster"} for screenplay and {"name", "movie", "image"} otherwise,
+        with poster and image set to None.
+    """
+    if key in MOVIE_CATEGORIES:
+        return {"title": winner.get("name"), "poster": None}
+    if key in SCREENPLAY_CATEGORIES:
+        return {
+            "name": winner.get("name"),
+            "movie": extract_movie_title(winner.get("more", "")),
+            "poster": None,
+        }
+    return {
+        "name": winner.get("name"),
+        "movie": extract_movie_title(winner.get("more", "")),
+        "image": None,
+    }
+
+
+async def add_oscar_images(oscars: dict[str, dict], year: int) -> dict[str, dict]:
+    """
+    Look up the TMDb poster or profile image of every winner.
+
+    Works on the ``oscars`` of a highlights result, including one loaded
+    without images and cached, so images can be added later without asking
+    The Awards API again.
+
+    Args:
+        oscars (dict[str, dict]): Winner entries by category key.
+        year (int): The ceremony year, used to narrow the movie search.
+
+    Returns:
+        dict[str, dict]: A copy of ``oscars`` with poster and image filled
+        in where TMDb has one. A failed lookup leaves the image as None.
+
+    Raises:
+        RateLimited: If the API client has used up its fan-out rate limit.
+    """
+    movie_titles = set()
+    person_names = set()
+    for key, winner in oscars.items():
+        if key in MOVIE_CATEGORIES:
+            movie_titles.add(winner.get("title"))
+        elif key in SCREENPLAY_CATEGORIES:
+            movie_titles.add(winner.get("movie"))
+        else:
+            person_names.add(winner.get("name"))
+
+    sem = asyncio.Semaphore(TMDB_ENRICH_CONCURRENCY)
+
+    async def lookup(search, *args):
+        # Posters and photos are low priority: served from cache or skipped
+        # while the TMDb quota runs low
+        async with sem:
+            return await enrichment("tmdb", (search.__name__, *args), partial(search, *args), HISTORIC_TTL)
+
+    movie_titles = [title for title in movie_titles if title]
+    person_names = [name for name in person_names if name]
+    lookups = await asyncio.gather(
+        *[lookup(search_movie_by_title, title, year) for title in movie_titles],
+        *[lookup(search_person_by_name, name) for name in person_names],
+        return_exceptions=True
+    )
+    raise_rate_limited(lookups)
+
+    posters = {}
+    for title, movie_data in zip(movie_titles, lookups[:len(movie_titles)]):
+        if movie_data and not isinstance(movie_data, Exception):
+            posters[title] = movie_data.get("poster_path")
+
+    profiles = {}
+    for name, person_data in zip(person_names, lookups[len(movie_titles):]):
+        if person_data and not isinstance(person_data, Exception):
+            profiles[name] = person_data.get("profile_path")
+
+    with_images = {}
+    for key, winner in oscars.items():
+        if key in MOVIE_CATEGORIES:
+            with_images[key] = {**winner, "poster": posters.get(winner.get("title"))}
+        elif key in SCREENPLAY_CATEGORIES:
+            with_images[key] = {**winner, "poster": posters.get(winner.get("movie"))}
+        else:
+            with_images[key] = {**winner, "image": profiles.get(winner.get("name"))}
+    return with_images
+
+
+async def fetch_oscar_highlights(year: int, *, categories: str = "major", images: bool = True):
     """
     Fetch Oscar winners for major categories and enrich with TMDb images.
 
-    Retrieves the Oscar edition for the specified year from The Awards API,
-    then fetches winners for Best Picture, Best Actor (Leading Role), and
-    Best Actress (Leading Role). Movie posters and actor profile images are
+    Looks up the Oscar edition and category ids for the specified year in the
+    local Oscar index, then fetches winners for Best Picture, Best Actor
+    (Leading Role), and Best Actress (Leading Role) from The Awards API. Movie posters and actor profile images are
     retrieved from TMDb to enhance the response data.
 
     Args:
         year (int): The Oscar ceremony year (e.g., 2020 for the 92nd Academy Awards).
+        categories (str): "major" (default) or "all" for the expanded category set.
+        images (bool): Whether to look up the TMDb images. Without them every
+            poster and image is None, and no TMDb call is made (see
+            image_service.fetch_oscar_images for the deferred lookup).
 
     Returns:
         dict | None: A dictionary containing:
             - year (int): The requested year
-            - oscars (dict): Dictionary with up to three keys:
+            - oscars (dict): Dictionary with up to three keys (more with categories="all"):
                 - bestPicture (dict, optional):
                     - title (str): Winning movie title
                     - poster (str | None): TMDb poster path
@@ -77,15 +211,30 @@ async def fetch_oscar_highlights(year: int):
                     - name (str): Winning actress's name
                     - movie (str): Movie they won for
                     - image (str | None): TMDb profile image path
+                - bestDirector, bestSupportingActor, bestSupportingActress
+                  (dict, optional, categories="all"): same shape as bestActor
+                - bestInternationalFeature (dict, optional, categories="all"):
+                  same shape as bestPicture
+                - bestOriginalScreenplay, bestAdaptedScreenplay
+                  (dict, optional, categories="all"):
+                    - name (str): Winning writer(s)
+                    - movie (str): Movie they won for
+                    - poster (str | None): TMDb poster path of the movie
             - source (str): Always "The Awards API"
+            - missing_categories (list[str], optional): Categories whose
+              nominees could not be loaded. Only present on a partial result,
+              which callers must not cache.
 
         Returns None if no Oscar edition found for the year.
 
     Note:
         - Not all categories may be present if no winner is found
+        - Edition and category ids come from the Oscar index, so only the
+          nominee calls hit The Awards API on the critical path
         - Image paths may be None if TMDb lookup fails
-        - Categories are fetched concurrently but processed sequentially
-          to maintain proper error handling for each TMDb lookup
+        - Categories and TMDb lookups are fetched concurrently; a failed
+          lookup only leaves that image as None
+        - If every category call fails, the first error is raised
 
     Example:
         await fetch_oscar_highlights(2020)
@@ -99,16 +248,17 @@ async def fetch_oscar_highlights(year: int):
             "source": "The Awards API"
         }
     """
-    editions = await get_oscar_edition_by_year(year)
-    if not editions:
+    edition = await get_edition_categories(year)
+    if not edition:
         return None
 
-    edition_id = editions[0]["id"]
-    categories = await get_oscar_categories(edition_id)
+    edition_id, category_ids = edition
+    category_map = OSCAR_ALL_CATEGORY_MAP if categories == "all" else OSCAR_CATEGORY_MAP
 
     relevant_categories = [
-        cat for cat in categories
-        if cat.get("name") in OSCAR_CATEGORY_MAP
+        {"id": category_id, "name": name}
+        for name, category_id in category_ids.items()
+        if name in category_map
     ]
 
     category_details = await asyncio.gather(
@@ -116,53 +266,34 @@ async def fetch_oscar_highlights(year: int):
         return_exceptions=True
     )
 
-    oscars = {}
+    raise_rate_limited(category_details)
+    failures = [details for details in category_details if isinstance(details, Exception)]
+    if failures and len(failures) == len(category_details):
+        # Nothing was loaded: fail like a single upstream call would, so the
+        # caller serves its last good result instead of an empty one
+        raise failures[0]
 
-    async def process_category(category, nominees):
+    # Collect all winners first so TMDb lookups can be deduplicated across categories
+    winners = {}
+    missing = []
+    for category, nominees in zip(relevant_categories, category_details):
         if isinstance(nominees, Exception):
-            return None
-
-        category_name = category.get("name")
-        key = OSCAR_CATEGORY_MAP[category_name]
-
-        winner = None
-        for nominee in nominees:
-            if nominee.get("winner") is True:
-                winner = nominee
-                break
-
-        if not winner:
-            return None
-
-        if key == "bestPicture":
-            movie_title = winner.get("name")
-            movie_data = await search_movie_by_title(movie_title, year)
-            return (key, {
-                "title": movie_title,
-                "poster": movie_data.get("poster_path") if movie_data else None,
-            })
-        else:
-            person_name = winner.get("name")
-            movie_title = extract_movie_title(winner.get("more", ""))
-            person_data = await search_person_by_name(person_name)
-            return (key, {
-                "name": person_name,
-                "movie": movie_title,
-                "image": person_data.get("profile_path") if person_data else None,
-            })
-
-    results = await asyncio.gather(
-        *[process_category(cat, details) for cat, details in zip(relevant_categories, category_details)],
-        return_exceptions=True
-    )
+            missing.append(category_map[category["name"]])
+            continue
 
-    for result in results:
-        if result and not isinstance(result, Exception):
-            key, data = result
-            oscars[key] = data
+        winner = find_winner(nominees)
+        if winner:
+            winners[category_map[category["name"]]] = winner
 
-    return {
+    oscars = {key: winner_entry(key, winner) for key, winner in winners.items()}
+    if images:
+        oscars = await add_oscar_images(oscars, year)
+
+    highlights = {
         "year": year,
         "oscars": oscars,
         "source": "The Awards API",
     }
+    if missing:
+        highlights["missing_categories"] = missing
+    return highlights
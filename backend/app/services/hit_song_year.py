@@ -1,5 +1,8 @@
 from app.services.artist_of_the_year import get_artist_of_the_year
 from app.clients.billboard_artist_client import get_hit_song
+from app.core.cache import HISTORIC_TTL
+from app.core.quota import enrichment
+from app.core.ratelimit import raise_rate_limited
 import asyncio
 
           
@@ -34,7 +37,8 @@ async def get_year_with_hit_songs(year: int) -> dict:
     }
 
     async def fetch_artist_songs(name: str):
-        top_songs = await get_hit_song(name, 5)
+        # Low priority: served from cache or skipped while the Last.fm quota runs low
+        top_songs = await enrichment("lastfm", ("hit_songs", name), lambda: get_hit_song(name, 5), HISTORIC_TTL)
         if not top_songs:
             return None
         return {
@@ -46,6 +50,7 @@ async def get_year_with_hit_songs(year: int) -> dict:
         *[fetch_artist_songs(name) for name in artist_names],
         return_exceptions=True
     )
+    raise_rate_limited(artist_results)
 
     for artist_data in artist_results:
         if artist_data and not isinstance(artist_data, Exception):
@@ -0,0 +1,197 @@
+"""
+Image proxy service module.
+
+Fetches images from the image hosts the API refers to (TMDb paths and
+upload.wikimedia.org URLs of artist and Nobel laureate images), keeps them
+in the disk image cache (app.core.image_cache) and serves repeat views
+without calling the host again.
+
+Images are downsized by requesting a smaller rendition from the host rather
+than by resizing locally: TMDb serves fixed widths (w92 … w780) and
+Wikimedia renders thumbnails of any file. Requested widths are rounded up
+to the nearest step both hosts cache, so a handful of renditions per image
+exist at most.
+"""
+
+from dataclasses import dataclass
+from typing import Callable
+from app.core import config, http, ratelimit
+from app.core.cache import LoadAbandoned
+from app.core.image_cache import CachedImage, DiskImageCache
+import asyncio
+import bisect
+import httpx
+import re
+import urllib.parse
+
+# TMDb renditions ("original" above the largest), see /configuration
+TMDB_WIDTHS = (92, 154, 185, 342, 500, 780)
+
+# Thumbnail widths Wikimedia pre-renders and caches
+WIKIMEDIA_WIDTHS = (120, 250, 330, 500, 960, 1280, 1920)
+
+# Wikimedia thumbnail path: <project>/thumb/<a>/<ab>/<file>/<width>px-<name>
+_WIKIMEDIA_THUMB = re.compile(r"(?P<project>.+)/thumb/(?P<file>[0-9a-f]/[0-9a-f]{2}/[^/]+)/\d+px-[^/]+")
+_WIKIMEDIA_FILE = re.compile(r"(?P<project>.+?)/(?P<file>[0-9a-f]/[0-9a-f]{2}/[^/]+)")
+
+
+class ImageNotFound(Exception):
+    """
+    Raised for an unknown source, an invalid path, or a response that is not
+    an acceptable image.
+    """
+
+
+def _snap(width: int | None, steps: tuple[int, ...]) -> int | None:
+    """
+    Round a requested width up to the nearest step, None above the largest.
+    """
+    if width is None:
+        return None
+    index = bisect.bisect_left(steps, width)
+    return steps[index] if index < len(steps) else None
+
+
+def tmdb_url(path: str, width: int | None) -> str:
+    size = _snap(width, TMDB_WIDTHS)
+    return f"https://image.tmdb.org/t/p/{f'w{size}' if size else 'original'}/{path}"
+
+
+def wikimedia_url(path: str, width: int | None) -> str:
+    """
+    Build the upload.wikimedia.org URL of a file or of its thumbnail.
+
+    Args:
+        path (str): Path on upload.wikimedia.org of the original file or
+            of any thumbnail of it.
+        width (int | None): Requested width; None for the path as given.
+    """
+    size = _snap(width, WIKIMEDIA_WIDTHS)
+    if width is not None and size is None:
+        size = WIKIMEDIA_WIDTHS[-1]
+    match = _WIKIMEDIA_THUMB.fullmatch(path) or _WIKIMEDIA_FILE.fullmatch(path)
+    if size is None or match is None:
+        return f"https://upload.wikimedia.org/{path}"
+
+    file = match["file"]
+    name = file.rsplit("/", 1)[1]
+    # Vector and document thumbnails are rendered as PNG
+    if name.lower().endswith((".svg", ".pdf", ".tif", ".tiff")):
+        name = f"{name}.png"
+    return f"https://upload.wikimedia.org/{match['project']}/thumb/{file}/{size}px-{name}"
+
+
+@dataclass(frozen=True)
+class ImageSource:
+    """
+    Attributes:
+        upstream: Upstream (see app.core.http) the images are fetched from.
+        url: Builds the upstream URL from the image path and requested width.
+    """
+    upstream: str
+    url: Callable[[str, int | None], str]
+
+
+SOURCES = {
+    "tmdb": ImageSource("tmdb_images", tmdb_url),
+    "wikimedia": ImageSource("wikimedia", wikimedia_url),
+}
+
+image_cache = DiskImageCache(config.IMAGE_CACHE_DIR, int(config.IMAGE_CACHE_MAX_MB * 1024 * 1024))
+
+# Loads in progress, so concurrent requests for one image fetch it once
+_loading: dict[str, asyncio.Future] = {}
+
+
+def _validate(path: str) -> str:
+    path = path.lstrip("/")
+    segments = path.split("/")
+    if not path or any(segment in ("", ".", "..") for segment in segments) or re.search(r"[\\\x00-\x1f?#]", path):
+        raise ImageNotFound(path)
+    return path
+
+
+async def _fetch(source: ImageSource, path: str, width: int | None) -> tuple[bytes, str]:
+    url = urllib.parse.quote(source.url(path, width), safe=":/()',!*")
+    response = await http.get(source.upstream, url, follow_redirects=True)
+    response.raise_for_status()
+    content_type = response.headers.get("content-type", "").split(";")[0].strip()
+    if not content_type.startswith("image/") or len(response.content) > config.IMAGE_MAX_BYTES:
+        raise ImageNotFound(path)
+    return response.content, content_type
+
+
+async def get_image(source_name: str, path: str, width: int | None = None) -> CachedImage:
+    """
+    Return an image from the disk cache, fetching it from its host on a miss.
+
+    Args:
+        source_name (str): "tmdb" (``path`` is a TMDb file path such as
+            "/abc.jpg") or "wikimedia" (``path`` is the path of an
+            upload.wikimedia.org URL).
+        path (str): Image path within the source.
+        width (int | None): Desired width in pixels, rounded up to a width
+            the host provides. None for the default rendition.
+
+    Returns:
+        CachedImage: The cached image file.
+
+    Raises:
+        ImageNotFound: If the source or path is invalid, or the host did not
+            return an image.
+        httpx.HTTPStatusError: If the host returned an error status.
+        httpx.RequestError: If the host could not be reached.
+        RateLimited: If the image is not cached and the API client has used
+            up its image rate limit.
+    """
+    source = SOURCES.get(source_name)
+    if source is None:
+        raise ImageNotFound(source_name)
+    path = _validate(path)
+    # Widths rounding to the same rendition share one entry
+    key = source.url(path, width)
+
+    while True:
+        cached = await image_cache.get(key)
+        if cached is not None:
+            return cached
+
+        pending = _loading.get(key)
+        if pending is None:
+            # Charged before starting the shared download, so a rejection
+            # fails this request only, not the ones that would wait for it
+            await ratelimit.charge_fanout()
+            pending = _loading.get(key)
+            if pending is None:
+                break
+        try:
+            return await asyncio.shield(pending)
+        except LoadAbandoned:
+            # The request downloading the image was cancelled, this one was not
+            continue
+
+    future = asyncio.get_running_loop().create_future()
+    _loading[key] = future
+    try:
+        try:
+            content, content_type = await _fetch(source, path, width)
+        except httpx.HTTPStatusError as e:
+            if width is None or e.response.status_code not in (400, 404):
+                raise
+            # Wikimedia does not render thumbnails wider than the original
+            content, content_type = await _fetch(source, path, None)
+        cached = await image_cache.put(key, content, content_type)
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()
+        raise
+    except BaseException:
+        # Never cancel the shared future: that would cancel every waiter
+        future.set_exception(LoadAbandoned(key))
+        future.exception()
+        raise
+    else:
+        future.set_result(cached)
+        return cached
+    finally:
+        _loading.pop(key, None)
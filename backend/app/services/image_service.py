@@ -0,0 +1,90 @@
+"""
+Image service module.
+
+Resolves all image URLs of a year in one batch, for year responses fetched
+with deferred images (GET /api/v1/year/{year}?images=deferred): Oscar
+posters and profile photos from TMDb, Billboard artist thumbnails from
+Wikipedia and Nobel laureate images from the Nobel prizes page.
+"""
+
+from app.clients.artist_img_client import fetch_wiki_image
+from app.services.artist_of_the_year import add_artist_images, get_artist_of_the_year
+from app.services.awards_service import add_oscar_images, fetch_oscar_highlights
+import httpx
+
+
+class IncompleteOscars(httpx.RequestError):
+    """
+    Raised when some Oscar categories could not be loaded, so the images of a
+    partial result are not cached as the year's images.
+    """
+
+
+async def fetch_oscar_images(year: int, highlights: dict | None = None) -> dict[str, dict]:
+    """
+    Fetch the TMDb images of the Oscar winners of a year.
+
+    Args:
+        year (int): The Oscar ceremony year.
+        highlights (dict | None): A fetch_oscar_highlights() result to add
+            the images to, e.g. the cached movie_highlights section of a
+            deferred year response. Fetched if None.
+
+    Returns:
+        dict[str, dict]: Image fields per category, shaped like the entries
+        of the year response's ``movie_highlights.oscars`` so they can be
+        merged into it, e.g. ``{"bestPicture": {"poster": "/path.jpg"},
+        "bestActor": {"image": "/path.jpg"}}``. Empty if there is no edition.
+
+    Raises:
+        IncompleteOscars: Some categories could not be loaded.
+    """
+    if highlights is None:
+        highlights = await fetch_oscar_highlights(year)
+        if not highlights:
+            return {}
+        oscars = highlights["oscars"]
+    else:
+        oscars = await add_oscar_images(highlights["oscars"], year)
+    if highlights.get("missing_categories"):
+        raise IncompleteOscars(f"Oscar categories not loaded: {', '.join(highlights['missing_categories'])}")
+    return {
+        category: {field: winner[field] for field in ("poster", "image") if field in winner}
+        for category, winner in oscars.items()
+    }
+
+
+async def fetch_artist_images(year: int, artists: dict | None = None) -> dict[str, str | None]:
+    """
+    Fetch the Wikipedia image of every Billboard artist of a year.
+
+    Args:
+        year (int): The chart year.
+        artists (dict | None): A get_artist_of_the_year() result, e.g. the
+            cached billboard_top_artists section. Fetched if None.
+
+    Returns:
+        dict[str, str | None]: Image URL per artist name.
+    """
+    if artists is None:
+        artists = await get_artist_of_the_year(year)
+    with_images = await add_artist_images(artists, fetch_wiki_image)
+    return {artist["name"]: artist["image"] for artist in with_images["artists_with_images"]}
+
+
+def nobel_images(nobel_prizes: dict | None) -> dict[str, dict[str, str | None]]:
+    """
+    Collect the laureate images of a Nobel prizes section.
+
+    Args:
+        nobel_prizes (dict | None): Result of get_nobel_prizes().
+
+    Returns:
+        dict[str, dict[str, str | None]]: Image URL per laureate name, per prize category.
+    """
+    if not nobel_prizes:
+        return {}
+    return {
+        category: {laureate.get("name"): laureate.get("image") for laureate in laureates}
+        for category, laureates in nobel_prizes.get("prizes", {}).items()
+    }
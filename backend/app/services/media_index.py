@@ -0,0 +1,282 @@
+"""
+Media index service module.
+
+Answers filter queries across many years (minimum rating, minimum votes, year
+range) without calling TMDb live. The index is built from the normalized
+results of fetch_movies_for_year / fetch_series_for_year and stored column by
+column, one numpy array per field:
+
+    year, title_id, rating, votes, popularity, first_air_year
+
+Each column is persisted as a .npy file and opened memory-mapped, so loading
+the index is cheap and a query is a vectorized scan over a few arrays instead
+of a loop over per-year dicts. Display fields (title, poster, release date)
+live in a JSON side table aligned with the rows.
+
+Build the index with:
+
+    python -m app.services.media_index movies 1950 2025
+    python -m app.services.media_index series 1950 2025
+"""
+
+from app.core import config
+from app.services.movie_service import fetch_movies_for_year, fetch_series_for_year
+from pathlib import Path
+import asyncio
+import json
+import numpy as np
+import os
+import shutil
+import sys
+
+COLUMNS = {
+    "year": np.int16,
+    "title_id": np.int32,
+    "rating": np.float32,
+    "votes": np.int32,
+    "popularity": np.float32,
+    "first_air_year": np.int16,
+}
+
+SOURCES = {
+    "movies": (fetch_movies_for_year, "top_movies"),
+    "series": (fetch_series_for_year, "top_series"),
+}
+
+# kind -> (loaded index, stamp of the directory it was loaded from)
+_indexes: dict[str, tuple["MediaIndex", tuple[int, int]]] = {}
+
+
+class MediaIndex:
+    """
+    Columnar, memory-mapped index of movies or series across years.
+
+    Attributes:
+        columns: Mapping of column name to a (memory-mapped) numpy array.
+        titles: Display fields per row: title, poster and release_date.
+    """
+
+    def __init__(self, columns: dict[str, np.ndarray], titles: list[dict]):
+        self.columns = columns
+        self.titles = titles
+
+    def __len__(self) -> int:
+        return len(self.titles)
+
+    @staticmethod
+    def load(path: Path) -> "MediaIndex | None":
+        """
+        Open a persisted index, memory-mapping every column.
+
+        Args:
+            path (Path): Directory the index was saved to.
+
+        Returns:
+            MediaIndex | None: The index, or None if it has not been built.
+        """
+        try:
+            columns = {
+                name: np.load(path / f"{name}.npy", mmap_mode="r")
+                for name in COLUMNS
+            }
+            with open(path / "titles.json", encoding="utf-8") as titles_file:
+                titles = json.load(titles_file)
+        except (OSError, ValueError):
+            return None
+        return MediaIndex(columns, titles)
+
+    def save(self, path: Path) -> None:
+        """
+        Persist the index atomically.
+
+        The columns are written to a sibling directory that then replaces the
+        previous index, so readers never see a partially written index.
+
+        Args:
+            path (Path): Directory to save the index to.
+        """
+        tmp_path = path.with_name(path.name + ".tmp")
+        old_path = path.with_name(path.name + ".old")
+        shutil.rmtree(tmp_path, ignore_errors=True)
+        tmp_path.mkdir(parents=True)
+
+        for name, column in self.columns.items():
+            np.save(tmp_path / f"{name}.npy", column)
+        with open(tmp_path / "titles.json", "w", encoding="utf-8") as titles_file:
+            json.dump(self.titles, titles_file, ensure_ascii=False)
+
+        shutil.rmtree(old_path, ignore_errors=True)
+        if path.exists():
+            os.replace(path, old_path)
+        os.replace(tmp_path, path)
+        shutil.rmtree(old_path, ignore_errors=True)
+
+    def search(
+        self,
+        *,
+        min_rating: float = 0,
+        min_votes: int = 0,
+        from_year: int | None = None,
+        to_year: int | None = None,
+        sort: str = "votes",
+        limit: int = 20,
+    ) -> list[dict]:
+        """
+        Filter and sort the index with vectorized column scans.
+
+        A title that appears in several years (e.g. a long-running series) is
+        returned once, at its best position in the requested sort order.
+
+        Args:
+            min_rating (float): Minimum average rating (0-10).
+            min_votes (int): Minimum number of votes.
+            from_year (int | None): First year to include.
+            to_year (int | None): Last year to include.
+            sort (str): "rating", "votes" or "popularity" (descending) or
+                "year" (ascending).
+            limit (int): Maximum number of results.
+
+        Returns:
+            list[dict]: Matching titles with year, title, rating, votes,
+            popularity, poster and release_date.
+        """
+        cols = self.columns
+        mask = (cols["rating"] >= min_rating) & (cols["votes"] >= min_votes)
+        if from_year is not None:
+            mask &= cols["year"] >= from_year
+        if to_year is not None:
+            mask &= cols["year"] <= to_year
+
+        rows = np.flatnonzero(mask)
+        if sort == "year":
+            order = np.argsort(cols["year"][rows], kind="stable")
+        else:
+            order = np.argsort(-cols[sort][rows].astype(np.float64), kind="stable")
+        rows = rows[order]
+
+        # Keep the first (best ranked) row of every title
+        _, first = np.unique(cols["title_id"][rows], return_index=True)
+        rows = rows[np.sort(first)][:limit]
+
+        results = []
+        for row in rows.tolist():
+            results.append({
+                "year": int(cols["year"][row]),
+                "title": self.titles[row]["title"],
+                "rating": round(float(cols["rating"][row]), 1),
+                "votes": int(cols["votes"][row]),
+                "popularity": round(float(cols["popularity"][row]), 1),
+                "poster": self.titles[row]["poster"],
+                "release_date": self.titles[row]["release_date"],
+            })
+        return results
+
+
+def index_path(kind: str) -> Path:
+    return config.MEDIA_INDEX_DIR / kind
+
+
+def index_stamp(path: Path) -> tuple[int, int] | None:
+    """
+    Identify the index directory on disk. save() replaces the whole
+    directory, so a rebuilt index has a new inode and modification time.
+    """
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def get_media_index(kind: str) -> MediaIndex | None:
+    """
+    Return the loaded index for "movies" or "series", or None if not built.
+
+    The index is reopened when it has been rebuilt on disk (e.g. by the
+    command line build) since it was loaded, so a running server picks up
+    the new index instead of reading the old memory maps. If reopening
+    fails (the directory is being replaced), the loaded index is kept.
+    """
+    path = index_path(kind)
+    loaded = _indexes.get(kind)
+    stamp = index_stamp(path)
+    if loaded is not None and (stamp is None or loaded[1] == stamp):
+        return loaded[0]
+
+    index = MediaIndex.load(path) if stamp is not None else None
+    if index is None:
+        return loaded[0] if loaded is not None else None
+    _indexes[kind] = (index, stamp)
+    return index
+
+
+def release_year(release_date: str | None) -> int:
+    try:
+        return int(release_date[:4])
+    except (TypeError, ValueError):
+        return 0
+
+
+async def build_media_index(kind: str, from_year: int, to_year: int, *, concurrency: int = 4) -> MediaIndex:
+    """
+    Build and persist the index for "movies" or "series" over a year range.
+
+    Years whose lookup fails are skipped, so a partial index is still usable.
+
+    Args:
+        kind (str): "movies" or "series".
+        from_year (int): First year to index.
+        to_year (int): Last year to index.
+        concurrency (int): Maximum number of years fetched at once.
+
+    Returns:
+        MediaIndex: The new index, which also becomes the active one.
+    """
+    fetch, key = SOURCES[kind]
+    sem = asyncio.Semaphore(concurrency)
+
+    async def fetch_year(year: int):
+        async with sem:
+            return await fetch(year)
+
+    results = await asyncio.gather(
+        *[fetch_year(year) for year in range(from_year, to_year + 1)],
+        return_exceptions=True
+    )
+
+    rows = {name: [] for name in COLUMNS}
+    titles = []
+    for result in results:
+        if not result or isinstance(result, Exception):
+            continue
+
+        for item in result.get(key, []):
+            if item.get("id") is None:
+                continue
+            rows["year"].append(result["year"])
+            rows["title_id"].append(item["id"])
+            rows["rating"].append(item.get("rating") or 0)
+            rows["votes"].append(item.get("votes") or 0)
+            rows["popularity"].append(item.get("popularity") or 0)
+            rows["first_air_year"].append(release_year(item.get("release_date")))
+            titles.append({
+                "title": item.get("title"),
+                "poster": item.get("poster"),
+                "release_date": item.get("release_date"),
+            })
+
+    columns = {
+        name: np.asarray(rows[name], dtype=dtype)
+        for name, dtype in COLUMNS.items()
+    }
+
+    index = MediaIndex(columns, titles)
+    index.save(index_path(kind))
+    _indexes.pop(kind, None)
+    return get_media_index(kind) or index
+
+
+if __name__ == "__main__":
+    kind, first, last = sys.argv[1], int(sys.argv[2]), int(sys.argv[3])
+    built = asyncio.run(build_media_index(kind, first, last))
+    print(f"{kind} index written to {index_path(kind)} ({len(built)} rows)")
@@ -8,6 +8,84 @@ series and data normalization for consistent API responses.
 
 from app.clients.movie_client import get_top_movies_by_year
 from app.clients.movie_client import get_top_series_by_year
+from app.core import config
+import asyncio
+import heapq
+import httpx
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOP_K = 8
+
+
+async def fetch_discover_top_k(fetch_page, year: int, pages: int, key, k: int = TOP_K) -> list[dict]:
+    """
+    Fetch several TMDb discover pages and keep the top k results.
+
+    All pages are requested at once, so the latency is one round trip.
+    Pages past TMDb's total_pages come back with no results, so asking for
+    more pages than exist costs nothing but the calls. Results are merged into a bounded min-heap of size k, so only k items
+    are ever kept no matter how many pages are read. Items that appear on
+    more than one page are counted once, and equal scores are ordered by
+    TMDb id, so the result does not depend on which page arrived first.
+
+    A failed page after the first is logged and skipped: the result is then
+    ranked across the pages that arrived.
+
+    Args:
+        fetch_page (Callable): Client function taking (year, page) and returning
+            a raw TMDb discover response.
+        year (int): The year to fetch results for.
+        pages (int): Number of discover pages to read (20 results per page).
+        key (Callable[[dict], float]): Ranking score, higher is better.
+        k (int): Number of results to keep.
+
+    Returns:
+        list[dict]: Up to k raw TMDb items ordered by descending score.
+
+    Raises:
+        httpx.HTTPStatusError: If the first page returns a non-2xx status code
+        httpx.RequestError: If the first page fails due to network issues
+    """
+    heap = []
+    seen = set()
+    counter = 0
+
+    def merge(raw: dict) -> None:
+        nonlocal counter
+        for item in raw.get("results", []):
+            item_id = item.get("id")
+            if item_id is not None:
+                if item_id in seen:
+                    continue
+                seen.add(item_id)
+
+            # Lower ids win score ties; the counter keeps dicts from being compared
+            entry = (key(item), -(item_id or 0), counter, item)
+            counter += 1
+            if len(heap) < k:
+                heapq.heappush(heap, entry)
+            elif entry[:2] > heap[0][:2]:
+                heapq.heapreplace(heap, entry)
+
+    results = await asyncio.gather(
+        *[fetch_page(year, page) for page in range(1, max(pages, 1) + 1)],
+        return_exceptions=True,
+    )
+    if isinstance(results[0], BaseException):
+        # Without the first page there is no meaningful top k
+        raise results[0]
+    for page, raw in enumerate(results, start=1):
+        if isinstance(raw, httpx.HTTPError):
+            logger.warning("TMDb discover page %d for %d failed, ranking without it: %r", page, year, raw)
+            continue
+        if isinstance(raw, BaseException):
+            raise raw
+        merge(raw)
+
+    return [entry[-1] for entry in sorted(heap, reverse=True, key=lambda entry: entry[:2])]
+
 
 async def fetch_movies_for_year(year: int):
     """
@@ -17,6 +95,9 @@ async def fetch_movies_for_year(year: int):
     and minimum vote count (≥1000). Results are sorted by vote count to surface
     the most popular critically-acclaimed films. Returns up to 8 movies.
 
+    Discover already sorts by vote count, so the first page holds the top 8
+    and later pages are never needed.
+
     Args:
         year (int): The release year to fetch movies for.
 
@@ -24,9 +105,11 @@ async def fetch_movies_for_year(year: int):
         dict: A dictionary containing:
             - year (int): The requested year
             - top_movies (list): List of up to 8 movie dictionaries with:
+                - id (int): TMDb movie ID
                 - title (str): Movie title
                 - rating (float): Vote average rounded to 1 decimal place
                 - votes (int): Total vote count
+                - popularity (float): TMDb popularity score
                 - poster (str): Poster path for TMDb image URL construction
                 - release_date (str): Release date in YYYY-MM-DD format
             - source (str): Always "TMDb"
@@ -48,13 +131,16 @@ async def fetch_movies_for_year(year: int):
         }
     """
     raw = await get_top_movies_by_year(year)
+    top_movies = raw.get("results", [])[:TOP_K]
 
     movies = []
-    for item in raw.get("results", [])[:8]:
+    for item in top_movies:
         movies.append({
+            "id": item.get("id"),
             "title": item["title"],
             "rating": round(item["vote_average"], 1),
             "votes": item["vote_count"],
+            "popularity": item.get("popularity"),
             "poster": item["poster_path"],
             "release_date": item["release_date"]
         })
@@ -65,7 +151,7 @@ async def fetch_movies_for_year(year: int):
         "source": "TMDb"
     }
 
-async def fetch_series_for_year(year: int):
+async def fetch_series_for_year(year: int, *, pages: int | None = None):
     """
     Fetch, rank, and normalize top TV series for a specific year.
 
@@ -74,16 +160,24 @@ async def fetch_series_for_year(year: int):
     custom scoring algorithm that factors in popularity, rating, and an age
     penalty to prioritize shows relevant to the queried year. Returns up to 8 series.
 
+    With ``pages`` > 1, that many discover pages are fetched concurrently and
+    ranked together, so relevant shows beyond the first 20 results can make
+    the top 8.
+
     Args:
         year (int): The air year to fetch TV series for.
+        pages (int | None): Number of discover pages to read. Defaults to
+            TMDB_DISCOVER_PAGES from the configuration.
 
     Returns:
         dict: A dictionary containing:
             - year (int): The requested year
             - top_series (list): List of up to 8 TV series dictionaries with:
+                - id (int): TMDb series ID
                 - title (str): Series name
                 - rating (float): Vote average rounded to 1 decimal place
                 - votes (int): Total vote count
+                - popularity (float): TMDb popularity score
                 - poster (str): Poster path for TMDb image URL construction
                 - release_date (str): First air date in YYYY-MM-DD format
             - source (str): Always "TMDb"
@@ -112,21 +206,22 @@ async def fetch_series_for_year(year: int):
             "source": "TMDb"
         }
     """
-    raw = await get_top_series_by_year(year)
-    results = raw.get("results", [])
-
-    ranked = sorted(
-        results,
+    pages = pages or config.TMDB_DISCOVER_PAGES
+    ranked = await fetch_discover_top_k(
+        get_top_series_by_year,
+        year,
+        pages,
         key=lambda item: series_score(item, year),
-        reverse=True,
     )
 
     series = []
-    for item in ranked[:8]:
+    for item in ranked:
         series.append({
+            "id": item.get("id"),
             "title": item["name"],
             "rating": round(item["vote_average"], 1),
             "votes": item["vote_count"],
+            "popularity": item.get("popularity"),
             "poster": item["poster_path"],
             "release_date": item.get("first_air_date"),
         })
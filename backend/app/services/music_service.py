@@ -1,39 +1,52 @@
-from app.clients.music_client import get_spotify_token, get_auth_header, get_songs_by_year, get_artists_by_year
-import base64
-import httpx
+from app.clients.music_client import get_cached_spotify_token, get_auth_header, get_song_candidates, get_artists_by_year
+from app.core import config
+from app.core.cache import cache, year_ttl
 import random
 
 
-def fetch_songs_for_year(year: int):
+async def fetch_songs_for_year(year: int, *, mode: str = "sample", seed: int | None = None, limit: int = 10):
     """
     Fetches relevant songs from Spotify for a specific year.
+
+    The selection is deterministic so responses can be cached: the same year,
+    mode and seed always give the same songs (as long as Spotify returns the
+    same search hits). Clients that want variety can shuffle on their side.
+
+    Songs are picked from a per-year pool of candidates fetched with a
+    paginated Spotify search and kept in the cache, so Spotify is only called
+    when the pool for the year is missing or expired.
+
     Args:
         year (int): The year to search for songs.
+        mode (str): "sample" for a seeded random sample of the search hits,
+            or "top" for the most popular hits. Defaults to "sample".
+        seed (int | None): Seed for "sample" mode. Defaults to the year.
+        limit (int): Number of songs to return. Defaults to 10.
     Returns:
         dict: A dictionary containing the year and a list of top songs.
     """
 
-    token = get_spotify_token()
-    auth_header = get_auth_header(token)
-    raw = get_songs_by_year(year, auth_header)
+    candidates = await cache.get_or_load(
+        ("spotify_candidates", year),
+        lambda: get_song_candidates(
+            year,
+            pages=config.SPOTIFY_SEARCH_PAGES,
+            page_size=config.SPOTIFY_SEARCH_PAGE_SIZE,
+        ),
+        ttl=year_ttl(year),
+    )
 
-    raw = sorted(
-    raw,
-    key=lambda x: x["popularity"], # Sortera efter popularitet (högre = mer populär)
-    reverse=True) # Kör listan från högst till lägst
-
-    raw = random.sample(raw, min(len(raw), 10)) # Väljer 10 random låtar från listan
+    selected = select_songs(candidates, mode=mode, seed=year if seed is None else seed, limit=limit)
 
     songs = []
-    for item in raw:
+    for item in selected:
         songs.append({
             "title": item["name"],
-            "artist": item["artists"][0]["name"],
-            "album": item["album"]["name"],
-            "release_date": item["album"]["release_date"],
-            "spotify_url": item["external_urls"]["spotify"],
-            "image": item["album"]["images"][0]["url"],
-            
+            "artist": item["artist"],
+            "album": item["album"],
+            "release_date": item["release_date"],
+            "spotify_url": item["spotify_url"],
+            "image": item["image"],
         })
 
     return {
@@ -42,7 +55,26 @@ def fetch_songs_for_year(year: int):
         "source": "Spotify"
     }
 
-def fetch_artists_for_year(year: int): # Används inte
+def select_songs(tracks: list[dict], *, mode: str, seed: int, limit: int) -> list[dict]:
+    """
+    Deterministically pick ``limit`` tracks from the candidate pool.
+
+    Args:
+        tracks (list[dict]): Candidate tracks with at least "id" and "popularity".
+        mode (str): "top" for the most popular tracks, "sample" for a seeded sample.
+        seed (int): Seed for "sample" mode.
+        limit (int): Number of tracks to pick.
+    Returns:
+        list[dict]: The selected tracks.
+    """
+    if mode == "top":
+        return sorted(tracks, key=lambda x: x.get("popularity", 0), reverse=True)[:limit]
+
+    # Sort by id first so the sample does not depend on the order of the search hits
+    tracks = sorted(tracks, key=lambda x: x.get("id", ""))
+    return random.Random(seed).sample(tracks, min(len(tracks), limit))
+
+async def fetch_artists_for_year(year: int): # Används inte
     """
     Fetches relevant artists from Spotify for a specific year.
     Args:
@@ -51,10 +83,9 @@ def fetch_artists_for_year(year: int): # Används inte
         dict: A dictionary containing the year and a list of top artists.
     """
 
-    print("Spotify fetch artists)")
-    token = get_spotify_token()
+    token = await get_cached_spotify_token()
     auth_header = get_auth_header(token)
-    raw = get_artists_by_year(year, auth_header)
+    raw = await get_artists_by_year(year, auth_header)
 
     artists = []
     for item in raw:
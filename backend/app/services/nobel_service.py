@@ -1,4 +1,4 @@
-import httpx
+from app.core import http
 from app.utils.wiki_nobel_extractor import extract_nobel
 
 WIKI_API = "https://en.wikipedia.org/w/api.php"
@@ -44,10 +44,9 @@ async def get_nobel_prizes(year: int) -> dict:
         "formatversion": "2",
     }
 
-    async with httpx.AsyncClient() as client:
-        r = await client.get(WIKI_API, params=params, headers=HEADERS, timeout=20)
-        r.raise_for_status()
-        data = r.json()
+    r = await http.get("wikipedia", WIKI_API, params=params, headers=HEADERS)
+    r.raise_for_status()
+    data = r.json()
 
     html = (data.get("parse", {}).get("text") or "")
 
@@ -0,0 +1,309 @@
+"""
+Oscar index service module.
+
+Edition ids and category ids in The Awards API are static historical metadata,
+so instead of resolving them on every request this module keeps a local index:
+
+    ceremony year -> edition id -> {category name -> category id}
+
+The index is built once in bulk, persisted as JSON and refreshed rarely. With
+the index in place, fetch_oscar_highlights can go straight to the nominee calls.
+Years missing from the index (e.g. a ceremony that happened after the last
+build) are resolved live and added to the index. Years without a ceremony are
+recorded as misses, so they are not looked up live again for MISS_TTL seconds.
+
+Build or refresh the index manually with:
+
+    python -m app.services.oscar_index
+"""
+
+from app.clients.awards_client import (
+    get_oscar_editions,
+    get_oscar_edition_by_year,
+    get_oscar_categories,
+)
+from app.core import config
+from pathlib import Path
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import tempfile
+import time
+
+logger = logging.getLogger(__name__)
+
+# How long a year found to have no ceremony is answered from the index
+# (a ceremony for the current year may still be added)
+MISS_TTL = 24 * 3600
+
+# Minimum time between background refreshes, so an index that cannot be
+# rebuilt completely is not rebuilt on every request
+REFRESH_RETRY = 3600
+
+# Index changes from live lookups are written to disk at most this often
+SAVE_DELAY = 5.0
+
+_index: dict | None = None
+_refresh_task: asyncio.Task | None = None
+_refresh_started = 0.0
+_save_task: asyncio.Task | None = None
+
+
+def load_oscar_index(path: Path = config.OSCAR_INDEX_PATH) -> dict | None:
+    """
+    Load a persisted Oscar index from disk.
+
+    Args:
+        path (Path): Location of the index file.
+
+    Returns:
+        dict | None: The index with "built_at" (float) and "editions" keys,
+        or None if the file does not exist or cannot be parsed.
+    """
+    try:
+        with open(path, encoding="utf-8") as index_file:
+            index = json.load(index_file)
+    except (OSError, ValueError):
+        return None
+
+    if not isinstance(index, dict) or "editions" not in index:
+        return None
+    return index
+
+
+def save_oscar_index(index: dict, path: Path = config.OSCAR_INDEX_PATH) -> None:
+    """
+    Persist the Oscar index atomically.
+
+    The index is written to a temporary file next to the target and then
+    moved into place, so readers never see a half-written index.
+
+    Args:
+        index (dict): The index to persist.
+        path (Path): Location of the index file.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # A temporary file of its own, so concurrent saves (a refresh and a
+    # pending save, or several workers) never write to the same file
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=path.name, suffix=".tmp")
+    try:
+        with open(fd, "w", encoding="utf-8") as index_file:
+            json.dump(index, index_file, ensure_ascii=False, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def index_entry(edition_id: int, categories: list[dict]) -> dict:
+    """
+    Build the index entry for a single edition.
+
+    Args:
+        edition_id (int): The Oscar edition ID.
+        categories (list[dict]): Categories as returned by get_oscar_categories.
+
+    Returns:
+        dict: {"edition_id": int, "categories": {category name: category id}}
+    """
+    return {
+        "edition_id": edition_id,
+        "categories": {
+            cat["name"]: cat["id"]
+            for cat in categories
+            if cat.get("name") and cat.get("id") is not None
+        },
+    }
+
+
+async def build_oscar_index(*, concurrency: int = 4) -> dict:
+    """
+    Build the complete Oscar index from The Awards API.
+
+    Fetches all editions in one call and then the categories of every edition,
+    with at most ``concurrency`` category requests in flight at once.
+
+    Args:
+        concurrency (int): Maximum number of concurrent category requests.
+
+    Returns:
+        dict: {"built_at": float, "editions": {"<year>": index entry},
+        "missing": {"<year>": time the year was found to have no ceremony}}.
+        built_at is 0 if the categories of some editions could not be
+        fetched, so an incomplete index is never taken for a fresh one.
+
+    Raises:
+        httpx.HTTPStatusError: If the editions request returns a non-2xx status code
+        httpx.RequestError: If the editions request fails due to network issues
+    """
+    editions = await get_oscar_editions()
+    sem = asyncio.Semaphore(concurrency)
+
+    async def fetch_entry(edition: dict):
+        async with sem:
+            categories = await get_oscar_categories(edition["id"])
+        return str(int(edition["year"])), index_entry(edition["id"], categories)
+
+    editions = [edition for edition in editions if edition.get("year")]
+    entries = await asyncio.gather(
+        *[fetch_entry(edition) for edition in editions],
+        return_exceptions=True
+    )
+
+    index = {"built_at": time.time(), "editions": {}, "missing": {}}
+    for edition, entry in zip(editions, entries):
+        if isinstance(entry, Exception):
+            logger.warning("Oscar index: categories of edition %s (%s) failed: %r",
+                           edition["id"], edition["year"], entry)
+            index["built_at"] = 0
+            continue
+        year, data = entry
+        index["editions"][year] = data
+
+    return index
+
+
+async def refresh_oscar_index(path: Path = config.OSCAR_INDEX_PATH) -> dict:
+    """
+    Rebuild the Oscar index, persist it and make it the active index.
+
+    If the rebuild was incomplete, the index keeps the build time of the
+    previous one, so it is rebuilt again after REFRESH_RETRY.
+
+    Args:
+        path (Path): Location of the index file.
+
+    Returns:
+        dict: The freshly built index.
+    """
+    global _index
+
+    index = await build_oscar_index()
+    if _index:
+        # Keep years the bulk build failed on but that were resolved before
+        index["editions"] = {**_index.get("editions", {}), **index["editions"]}
+        if not index["built_at"]:
+            index["built_at"] = _index.get("built_at", 0)
+        index["missing"] = {
+            year: checked_at for year, checked_at in _index.get("missing", {}).items()
+            if year not in index["editions"]
+        }
+
+    await asyncio.to_thread(save_oscar_index, index, path)
+    _index = index
+    return index
+
+
+def is_stale(index: dict) -> bool:
+    """
+    Check whether an index is older than OSCAR_INDEX_MAX_AGE_DAYS.
+    """
+    age = time.time() - index.get("built_at", 0)
+    return age > config.OSCAR_INDEX_MAX_AGE_DAYS * 24 * 3600
+
+
+def schedule_refresh() -> None:
+    """
+    Start a background index refresh unless one is already running or one
+    was started less than REFRESH_RETRY ago.
+
+    The refresh runs in an empty context: it must not inherit the deadline
+    or the rate-limited client of the request that happened to trigger it.
+    """
+    global _refresh_task, _refresh_started
+
+    if _refresh_task is not None and not _refresh_task.done():
+        return
+    if time.time() - _refresh_started < REFRESH_RETRY:
+        return
+    _refresh_started = time.time()
+    _refresh_task = asyncio.create_task(refresh_oscar_index(), context=contextvars.Context())
+    _refresh_task.add_done_callback(log_refresh_failure)
+
+
+def log_refresh_failure(task: asyncio.Task) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Oscar index refresh failed", exc_info=task.exception())
+
+
+def schedule_save() -> None:
+    """
+    Persist the active index in the background, SAVE_DELAY seconds from now,
+    unless a save is already pending; changes made meanwhile go into that
+    save. The file is written on a worker thread.
+    """
+    global _save_task
+
+    if _save_task is None or _save_task.done():
+        _save_task = asyncio.create_task(save_active_index(), context=contextvars.Context())
+
+
+async def save_active_index() -> None:
+    await asyncio.sleep(SAVE_DELAY)
+    # Copied on the event loop, so lookups can keep changing the index while
+    # the copy is written
+    index = {**_index, "editions": dict(_index["editions"]), "missing": dict(_index.get("missing", {}))}
+    try:
+        await asyncio.to_thread(save_oscar_index, index)
+    except OSError as e:
+        logger.warning("Saving the Oscar index failed: %r", e)
+
+
+async def get_edition_categories(year: int) -> tuple[int, dict[str, int]] | None:
+    """
+    Look up the edition id and category ids for an Oscar ceremony year.
+
+    Served from the local index when possible. On an index miss the ids are
+    resolved live (edition, then categories) and stored in the index so the
+    next request for the same year is a hit; the index file is updated in
+    the background (schedule_save). A stale index is still used but
+    triggers a background refresh.
+
+    Args:
+        year (int): The Oscar ceremony year.
+
+    Returns:
+        tuple[int, dict[str, int]] | None: The edition id and a mapping of
+        category name to category id, or None if no edition exists for the year.
+
+    Raises:
+        httpx.HTTPStatusError: If a live lookup returns a non-2xx status code
+        httpx.RequestError: If a live lookup fails due to network issues
+    """
+    global _index
+
+    if _index is None:
+        _index = load_oscar_index() or {"built_at": 0, "editions": {}, "missing": {}}
+        if not _index["editions"]:
+            schedule_refresh()
+
+    if _index["editions"] and is_stale(_index):
+        schedule_refresh()
+
+    entry = _index["editions"].get(str(year))
+    if entry is None:
+        missing = _index.setdefault("missing", {})
+        if time.time() - missing.get(str(year), 0) < MISS_TTL:
+            return None
+
+        editions = await get_oscar_edition_by_year(year)
+        if not editions:
+            missing[str(year)] = time.time()
+            schedule_save()
+            return None
+
+        edition_id = editions[0]["id"]
+        categories = await get_oscar_categories(edition_id)
+        entry = index_entry(edition_id, categories)
+
+        _index["editions"][str(year)] = entry
+        schedule_save()
+
+    return entry["edition_id"], entry["categories"]
+
+
+if __name__ == "__main__":
+    built = asyncio.run(refresh_oscar_index())
+    print(f"Oscar index written to {config.OSCAR_INDEX_PATH} ({len(built['editions'])} editions)")
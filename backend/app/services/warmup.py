@@ -0,0 +1,112 @@
+"""
+Startup warm-up of upstream connections.
+
+Right after a deploy or worker restart, the first requests would otherwise
+pay the DNS lookups and TLS handshakes to every upstream host. The warm-up
+runs once at startup: it resolves each upstream host, opens
+WARMUP_CONNECTIONS pooled connections to it and fetches the Spotify token.
+The worker reports ready (GET /api/v1/ready) once the warm-up has finished,
+or after WARMUP_TIMEOUT_SECONDS, whichever comes first. An unreachable
+upstream does not keep the worker from becoming ready; upstreams without
+credentials are skipped and reported as "disabled".
+"""
+
+from app.clients.music_client import get_cached_spotify_token
+from app.core import config, http
+import asyncio
+import httpx
+import time
+
+_state = {
+    "ready": False,
+    "duration": None,
+    "upstreams": {},
+}
+
+
+def is_ready() -> bool:
+    return _state["ready"]
+
+
+def status() -> dict:
+    """
+    Return the warm-up state for the readiness endpoint.
+    """
+    return {
+        "ready": _state["ready"],
+        "duration": _state["duration"],
+        "upstreams": dict(_state["upstreams"]),
+    }
+
+
+async def warm_upstream(upstream: str) -> str:
+    """
+    Open connections to an upstream with cheap HEAD requests.
+
+    The responses themselves do not matter (many are redirects or 404s);
+    the connections stay in the upstream's pool for the first real requests.
+
+    Returns:
+        str: "ok", "disabled", or the name of the error that prevented connecting.
+    """
+    if config.missing_credentials(upstream):
+        return "disabled"
+    settings = http.get_settings(upstream)
+    client = http.get_client(upstream)
+    outcome = "ok"
+    for url in settings.warm_urls:
+        results = await asyncio.gather(
+            *(client.head(url) for _ in range(config.WARMUP_CONNECTIONS)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                outcome = type(result).__name__
+    return outcome
+
+
+async def warm_spotify_token() -> str:
+    if config.missing_credentials("spotify"):
+        return "disabled"
+    try:
+        await get_cached_spotify_token()
+    except httpx.HTTPError as e:
+        return type(e).__name__
+    return "ok"
+
+
+async def warm_up() -> dict:
+    """
+    Warm up every upstream concurrently and mark the worker ready.
+
+    Returns:
+        dict: The warm-up state, see status().
+    """
+    started = time.monotonic()
+    names = list(http.UPSTREAMS)
+    jobs = [warm_upstream(name) for name in names] + [warm_spotify_token()]
+    names.append("spotify_token")
+
+    tasks = [asyncio.ensure_future(job) for job in jobs]
+    done, pending = await asyncio.wait(tasks, timeout=config.WARMUP_TIMEOUT_SECONDS)
+    for task in pending:
+        task.cancel()
+
+    for name, task in zip(names, tasks):
+        if task in pending:
+            _state["upstreams"][name] = "timeout"
+        elif task.exception() is not None:
+            _state["upstreams"][name] = type(task.exception()).__name__
+        else:
+            _state["upstreams"][name] = task.result()
+
+    _state["duration"] = round(time.monotonic() - started, 3)
+    _state["ready"] = True
+    return status()
+
+
+def mark_ready() -> None:
+    """
+    Report ready without warming up (WARMUP_ON_STARTUP=0).
+    """
+    _state["ready"] = True
@@ -1,5 +1,6 @@
 import asyncio
 import httpx
+from app.core import http
 from app.clients.wiki_client import fetch_year_toc, get_month_wikitext
 from app.utils.wiki_cleaner import CLEANER
 
@@ -15,8 +16,6 @@ MONTHS = [
     "July", "August", "September", "October", "November", "December"
 ]
 
-TIMEOUT = httpx.Timeout(10.0, connect=5.0)
-
 def normalize_toc(toc) -> list[dict]:
     """
     Function to normalize the TOC structure into a flat list of items
@@ -120,25 +119,26 @@ async def fetch_year_summary(year: int,*, limit: int = 6, concurrency: int = 4)
     results: dict[str, list[str]] = {}
     sem = asyncio.Semaphore(concurrency)
 
-    async with httpx.AsyncClient(headers=HEADERS, timeout=TIMEOUT) as client:
-        toc = await fetch_year_toc(client, year)
-        items = normalize_toc(toc)
+    # Pooled Wikipedia client, so all month requests share its connections
+    client = http.get_client("wikipedia")
+    toc = await fetch_year_toc(client, year)
+    items = normalize_toc(toc)
 
-        months = {}
-        for item in items:
-            title = item.get("line", "")
-            index = item.get("index", "")
+    months = {}
+    for item in items:
+        title = item.get("line", "")
+        index = item.get("index", "")
 
-            if title in MONTHS:
-                months[title] = index
+        if title in MONTHS:
+            months[title] = index
 
 
-        tasks = [fetch_month_events(client, sem, year, month, index, limit)
-                for month, index in months.items()]
+    tasks = [fetch_month_events(client, sem, year, month, index, limit)
+            for month, index in months.items()]
 
-        for month, events in await asyncio.gather(*tasks):
-            if events:
-                results[month] = events
+    for month, events in await asyncio.gather(*tasks):
+        if events:
+            results[month] = events
     return results
 
 
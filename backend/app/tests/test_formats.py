@@ -0,0 +1,93 @@
+"""
+Tests for the JSON and MessagePack response formats (app.core.formats).
+"""
+
+from fastapi import Depends, FastAPI, Request
+from fastapi.testclient import TestClient
+import msgpack
+import orjson
+import pytest
+
+from app.core import formats
+from app.core.compression import EncodedPayload
+
+PAYLOAD = {
+    "year": 2001,
+    "movies": {"top_movies": [{"id": 1, "title": "Amélie", "rating": 8.3, "poster": None}]},
+    "stale_sections": [],
+    "unavailable_sections": ["nobel_prizes"],
+}
+
+# Integer keys, which JSON turns into strings
+INT_KEYS = {"nobel": {1901: {"physics": ["Röntgen"]}}, "ranks": [{1: "a", 2: "b"}]}
+
+DECODERS = {
+    formats.JSON: orjson.loads,
+    formats.MSGPACK: msgpack.unpackb,
+}
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, formats.JSON),
+    ("", formats.JSON),
+    ("*/*", formats.JSON),
+    ("text/html, */*;q=0.8", formats.JSON),
+    ("application/json", formats.JSON),
+    ("application/msgpack", formats.MSGPACK),
+    ("application/x-msgpack", formats.MSGPACK),
+    ("application/vnd.msgpack", formats.MSGPACK),
+    ("application/json;q=0.5, application/msgpack", formats.MSGPACK),
+    ("application/msgpack;q=0.5, application/json", formats.JSON),
+    ("application/msgpack;q=0.5, */*;q=0.5", formats.JSON),
+    ("application/msgpack;q=oops", formats.JSON),
+])
+def test_choose_format(accept, expected):
+    assert formats.choose_format(accept) == expected
+
+
+@pytest.mark.parametrize("media_type", DECODERS)
+def test_serialize_round_trips(media_type):
+    assert DECODERS[media_type](formats.serialize(PAYLOAD, media_type)) == PAYLOAD
+
+
+def test_formats_give_the_same_shape_for_non_string_keys():
+    json_data = orjson.loads(formats.serialize(INT_KEYS, formats.JSON))
+    msgpack_data = msgpack.unpackb(formats.serialize(INT_KEYS, formats.MSGPACK))
+    assert json_data == msgpack_data == {"nobel": {"1901": {"physics": ["Röntgen"]}}, "ranks": [{"1": "a", "2": "b"}]}
+
+
+@pytest.fixture
+def client():
+    app = FastAPI(default_response_class=formats.APIResponse, dependencies=[Depends(formats.response_format)])
+
+    @app.get("/data")
+    async def data():
+        return PAYLOAD
+
+    @app.get("/encoded")
+    async def encoded(request: Request):
+        return EncodedPayload.from_data(PAYLOAD).response(request)
+
+    return TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/data", "/encoded"])
+@pytest.mark.parametrize("accept, media_type", [
+    ("application/json", formats.JSON),
+    ("application/msgpack", formats.MSGPACK),
+])
+def test_responses_round_trip(client, path, accept, media_type):
+    response = client.get(path, headers={"Accept": accept})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith(media_type)
+    assert "Accept" in [value.strip() for value in response.headers["vary"].split(",")]
+    assert DECODERS[media_type](response.content) == PAYLOAD
+
+
+def test_encoded_payload_formats_have_distinct_etags():
+    payload = EncodedPayload.from_data(PAYLOAD)
+    alternate = payload.alternates[formats.MSGPACK]
+    assert payload.media_type == formats.JSON
+    assert alternate.media_type == formats.MSGPACK
+    assert payload.etag != alternate.etag
+    assert msgpack.unpackb(alternate.body) == orjson.loads(payload.body)
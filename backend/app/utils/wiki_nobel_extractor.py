@@ -1,7 +1,3 @@
-
-from bs4 import BeautifulSoup
-
-
 def extract_nobel(html: str) -> dict:
     """
     Extract Nobel Prize laureates from the HTML of a Wikipedia Nobel Prize page.
@@ -28,6 +24,8 @@ def extract_nobel(html: str) -> dict:
 
 
     """
+    # Imported on first use: BeautifulSoup takes tens of milliseconds to import
+    from bs4 import BeautifulSoup
 
     soup = BeautifulSoup(html, "html.parser")
     prizes = {}
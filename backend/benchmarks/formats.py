@@ -0,0 +1,71 @@
+"""
+Benchmark: JSON vs MessagePack for a /year/{year} payload.
+
+Uses the synthetic year payload of benchmarks/serialization.py and compares
+the two response formats (app.core.formats) on:
+
+- size: serialized, and after brotli and gzip as the cache stores them
+- encode: what a cache fill or an uncached response costs the server
+- decode: what a client pays to read the response (orjson.loads vs
+  msgpack.unpackb, the fastest decoders for each format in Python)
+
+Before timing, both encodings are decoded and compared with each other, so
+a format that does not round-trip fails loudly (app/tests/test_formats.py
+checks the same on small payloads).
+
+Usage (from backend/):
+    python benchmarks/formats.py
+    python benchmarks/formats.py --artists 100 --events 40 --rounds 50
+"""
+
+from pathlib import Path
+import argparse
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import msgpack
+import orjson
+
+from app.core import formats
+from app.core.compression import compress
+from serialization import timed, year_payload
+
+DECODERS = {
+    formats.JSON: orjson.loads,
+    formats.MSGPACK: msgpack.unpackb,
+}
+
+
+def round_trip(data: dict) -> None:
+    # Both formats give dict keys as strings, like JSON
+    expected = orjson.loads(formats.serialize(data, formats.JSON))
+    for media_type, decode in DECODERS.items():
+        if decode(formats.serialize(data, media_type)) != expected:
+            raise SystemExit(f"{media_type} does not round-trip the year payload")
+
+
+def main(args):
+    data = year_payload(2001, args.artists, args.events)
+    round_trip(data)
+
+    print(f"Year payload, median of {args.rounds} rounds\n")
+    print(f"{'format':<22}{'KiB':>8}{'br KiB':>8}{'gzip KiB':>10}{'encode ms':>11}{'decode ms':>11}")
+    for media_type, decode in DECODERS.items():
+        body = formats.serialize(data, media_type)
+        encode_ms = timed(lambda: formats.serialize(data, media_type), args.rounds)
+        decode_ms = timed(lambda: decode(body), args.rounds)
+        print(
+            f"{media_type:<22}{len(body) / 1024:>8.1f}"
+            f"{len(compress(body, 'br', best=True)) / 1024:>8.1f}"
+            f"{len(compress(body, 'gzip', best=True)) / 1024:>10.1f}"
+            f"{encode_ms:>11.3f}{decode_ms:>11.3f}"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--artists", type=int, default=100, help="Billboard artists in the payload")
+    parser.add_argument("--events", type=int, default=30, help="Events per month")
+    parser.add_argument("--rounds", type=int, default=100, help="Timed rounds per format")
+    main(parser.parse_args())
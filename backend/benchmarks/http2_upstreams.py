@@ -0,0 +1,169 @@
+"""
+Benchmark: HTTP/1.1 vs HTTP/2 for bursts of small upstream GETs.
+
+A /year/{year} request sends many small concurrent GETs to the same few
+hosts (twelve Wikipedia month sections, one Last.fm call per artist, ...).
+This script starts two local stand-in servers, one speaking HTTP/1.1 and one
+speaking HTTP/2 (cleartext, prior knowledge), and sends the same bursts to
+both with clients configured like app.core.http: HTTP/1.1 with up to 20
+connections, HTTP/2 with up to 2.
+
+Each new connection costs --handshake-ms before it is served, standing in
+for the DNS, TCP and TLS round trips to a remote host, and each response is
+delayed by --delay-ms.
+
+Usage (from backend/):
+    python benchmarks/http2_upstreams.py
+    python benchmarks/http2_upstreams.py --requests 48 --rounds 5 --handshake-ms 80
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import h2.config
+import h2.connection
+import h2.events
+import httpx
+
+BODY = b'{"parse": {"wikitext": "' + b"x" * 2000 + b'"}}'
+
+
+class ServerStats:
+    def __init__(self):
+        self.connections = 0
+
+
+async def serve_http1(stats: ServerStats, handshake: float, delay: float):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        stats.connections += 1
+        await asyncio.sleep(handshake)
+        try:
+            while True:
+                try:
+                    await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                await asyncio.sleep(delay)
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\ncontent-type: application/json\r\n"
+                    b"content-length: %d\r\n\r\n" % len(BODY) + BODY
+                )
+                await writer.drain()
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def serve_http2(stats: ServerStats, handshake: float, delay: float):
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        stats.connections += 1
+        await asyncio.sleep(handshake)
+        conn = h2.connection.H2Connection(config=h2.config.H2Configuration(client_side=False))
+        conn.initiate_connection()
+        writer.write(conn.data_to_send())
+        responses = set()
+
+        async def respond(stream_id: int):
+            await asyncio.sleep(delay)
+            conn.send_headers(stream_id, [
+                (":status", "200"),
+                ("content-type", "application/json"),
+                ("content-length", str(len(BODY))),
+            ])
+            conn.send_data(stream_id, BODY, end_stream=True)
+            writer.write(conn.data_to_send())
+            await writer.drain()
+
+        try:
+            while data := await reader.read(65536):
+                for event in conn.receive_data(data):
+                    if isinstance(event, h2.events.RequestReceived):
+                        task = asyncio.create_task(respond(event.stream_id))
+                        responses.add(task)
+                        task.add_done_callback(responses.discard)
+                writer.write(conn.data_to_send())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            for task in responses:
+                task.cancel()
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+async def run_bursts(client: httpx.AsyncClient, url: str, requests: int, rounds: int) -> tuple[list[float], list[float]]:
+    """
+    Send ``rounds`` bursts of ``requests`` concurrent GETs.
+
+    Returns:
+        tuple[list[float], list[float]]: Per-request latencies and per-burst wall times.
+    """
+    latencies, walls = [], []
+
+    async def one():
+        started = time.perf_counter()
+        response = await client.get(url)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(requests)))
+        walls.append(time.perf_counter() - started)
+    return latencies, walls
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def main(args):
+    handshake = args.handshake_ms / 1000
+    delay = args.delay_ms / 1000
+    rows = []
+
+    for label, serve, client_options in [
+        ("HTTP/1.1", serve_http1, {"http1": True, "http2": False, "max_connections": 20}),
+        ("HTTP/2", serve_http2, {"http1": False, "http2": True, "max_connections": 2}),
+    ]:
+        stats = ServerStats()
+        server = await serve(stats, handshake, delay)
+        port = server.sockets[0].getsockname()[1]
+        limits = httpx.Limits(
+            max_connections=client_options["max_connections"],
+            max_keepalive_connections=client_options["max_connections"],
+        )
+        async with httpx.AsyncClient(http1=client_options["http1"], http2=client_options["http2"], limits=limits) as client:
+            latencies, walls = await run_bursts(client, f"http://127.0.0.1:{port}/w/api.php", args.requests, args.rounds)
+        server.close()
+        await server.wait_closed()
+
+        rows.append((
+            label,
+            stats.connections,
+            statistics.median(latencies) * 1000,
+            percentile(latencies, 0.95) * 1000,
+            walls[0] * 1000,
+            statistics.median(walls[1:] or walls) * 1000,
+        ))
+
+    print(f"{args.rounds} bursts of {args.requests} concurrent GETs, "
+          f"{args.handshake_ms:g} ms per new connection, {args.delay_ms:g} ms per response\n")
+    print(f"{'protocol':<10}{'sockets':>9}{'p50 ms':>9}{'p95 ms':>9}{'cold burst ms':>15}{'warm burst ms':>15}")
+    for label, sockets, p50, p95, cold, warm in rows:
+        print(f"{label:<10}{sockets:>9}{p50:>9.1f}{p95:>9.1f}{cold:>15.1f}{warm:>15.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--requests", type=int, default=48, help="Concurrent requests per burst")
+    parser.add_argument("--rounds", type=int, default=5, help="Number of bursts")
+    parser.add_argument("--handshake-ms", type=float, default=60, help="Simulated cost of a new connection")
+    parser.add_argument("--delay-ms", type=float, default=20, help="Simulated response time")
+    asyncio.run(main(parser.parse_args()))
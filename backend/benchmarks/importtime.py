@@ -0,0 +1,96 @@
+"""
+Benchmark: import time of app.main, with a regression check.
+
+Imports app.main in fresh interpreters under ``python -X importtime``,
+without any upstream credentials in the environment (the app must start
+without them), and reports:
+
+- the median total import time of app.main
+- the share spent in the app's own modules (app.*)
+- the modules with the highest self time
+
+It exits with status 1 if the median total exceeds --budget-ms, or if a
+module that is meant to be imported lazily (on first use) is imported at
+startup. The budget depends on the machine; the lazy-module check does not.
+
+Usage (from backend/):
+    python benchmarks/importtime.py
+    python benchmarks/importtime.py --runs 10 --budget-ms 800 --top 20
+"""
+
+from pathlib import Path
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+from app.core.config import UPSTREAM_CREDENTIALS
+
+# Heavy modules only some endpoints need; they must not be imported at startup
+LAZY_MODULES = ("bs4", "numpy", "app.services.media_index")
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def import_once() -> list[tuple[str, int, int]]:
+    """
+    Import app.main in a new interpreter.
+
+    Returns:
+        list[tuple[str, int, int]]: (module, self µs, cumulative µs) per
+        imported module, in import order.
+    """
+    # Empty values also win over the project .env (load_dotenv does not override)
+    env = dict(os.environ)
+    env.update({name: "" for names in UPSTREAM_CREDENTIALS.values() for name in names})
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"Importing app.main failed:\n{result.stderr[-2000:]}")
+    modules = []
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            modules.append((match.group(4), int(match.group(1)), int(match.group(2))))
+    return modules
+
+
+def main(args):
+    runs = [import_once() for _ in range(args.runs)]
+    totals = [next(cumulative for name, _, cumulative in run if name == "app.main") for run in runs]
+    own = [sum(self_us for name, self_us, _ in run if name == "app" or name.startswith("app.")) for run in runs]
+    total_ms = statistics.median(totals) / 1000
+
+    print(f"app.main import, median of {args.runs} runs: {total_ms:.0f} ms "
+          f"(app modules {statistics.median(own) / 1000:.0f} ms, budget {args.budget_ms:.0f} ms)\n")
+    print(f"{'module':<48}{'self ms':>10}")
+    last = sorted(runs[-1], key=lambda module: module[1], reverse=True)
+    for name, self_us, _ in last[:args.top]:
+        print(f"{name:<48}{self_us / 1000:>10.1f}")
+
+    failures = []
+    if total_ms > args.budget_ms:
+        failures.append(f"import time {total_ms:.0f} ms is over the {args.budget_ms:.0f} ms budget")
+    imported = {name for name, _, _ in runs[-1]}
+    for module in LAZY_MODULES:
+        if module in imported:
+            failures.append(f"{module} is imported at startup, it should be imported on first use")
+    if failures:
+        print("\nFAIL: " + "\nFAIL: ".join(failures))
+        sys.exit(1)
+    print("\nOK")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5, help="Interpreters to start")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="Maximum median import time of app.main")
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list")
+    main(parser.parse_args())
@@ -0,0 +1,162 @@
+"""
+Benchmark: serialization cost of a /year/{year} payload.
+
+Builds a synthetic year response shaped like a real one (twelve months of
+events, movies, series, Oscars, Billboard artists with top tracks, Nobel
+laureates, Spotify songs) and times each way the app can turn it into a
+response body:
+
+- stdlib:       jsonable_encoder + json.dumps (FastAPI's JSONResponse)
+- orjson:       jsonable_encoder + orjson.dumps (ORJSONResponse, used for
+                routes returning dicts)
+- model:        YearResponse validation + model_dump_json (typed path, as
+                for routes with a response_model)
+- orjson only:  orjson.dumps of the plain dict, without jsonable_encoder
+- cache fill:   orjson.dumps and msgpack.packb, each plus brotli and gzip
+                at high levels (EncodedPayload.from_data, once per cache fill)
+- cache hit:    EncodedPayload.response (what a cached year costs)
+
+Usage (from backend/):
+    python benchmarks/serialization.py
+    python benchmarks/serialization.py --artists 100 --events 40 --rounds 50
+"""
+
+from pathlib import Path
+import argparse
+import json
+import statistics
+import sys
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+from starlette.requests import Request
+
+from app.core.compression import EncodedPayload
+from app.models.year import YearResponse
+
+MONTHS = [
+    "January", "February", "March", "April", "May", "June",
+    "July", "August", "September", "October", "November", "December",
+]
+
+
+def year_payload(year: int, artists: int, events: int) -> dict:
+    media = [
+        {
+            "id": 1000 + i, "title": f"Title {i}", "rating": 7.0 + i / 10, "votes": 1000 * i,
+            "popularity": 50.5 + i, "poster": f"/poster{i}abcdefghijkl.jpg", "release_date": f"{year}-0{1 + i % 9}-15",
+        }
+        for i in range(10)
+    ]
+    return {
+        "year": year,
+        "events_by_month": {
+            month: [
+                f"{month} {day} – An event of some historical significance happened in a country, "
+                f"involving several notable people and organizations ({day})."
+                for day in range(1, events + 1)
+            ]
+            for month in MONTHS
+        },
+        "movie_highlights": {
+            "year": year,
+            "oscars": {
+                "bestPicture": {"title": "Best Film", "poster": "/bestfilm.jpg"},
+                "bestActor": {"name": "An Actor", "movie": "A Movie", "image": "/actor.jpg"},
+                "bestActress": {"name": "An Actress", "movie": "Another Movie", "image": "/actress.jpg"},
+            },
+            "source": "The Awards API",
+        },
+        "movies": {"year": year, "top_movies": media, "source": "TMDb"},
+        "series": {"year": year, "top_series": media, "source": "TMDb"},
+        "billboard_top_artists": {"year": year, "artists": [f"Artist {i}" for i in range(artists)]},
+        "billboard_artist_top_songs": {
+            "year": year,
+            "artists": [
+                {"artist": f"Artist {i}", "top_tracks": [{"title": f"Song {i}.{j}"} for j in range(5)]}
+                for i in range(artists)
+            ],
+        },
+        "nobel_prizes": {
+            "year": year,
+            "prizes": {
+                category: [
+                    {
+                        "name": f"Laureate {category} {i}",
+                        "motivation": "for their pioneering discoveries concerning something fundamental",
+                        "image": f"https://upload.wikimedia.org/wikipedia/commons/thumb/a/ab/L{i}.jpg/100px-L{i}.jpg",
+                    }
+                    for i in range(3)
+                ]
+                for category in ("Physics", "Chemistry", "Medicine", "Literature", "Peace", "Economics")
+            },
+        },
+        "spotify_songs": {
+            "year": year,
+            "top_songs": [
+                {
+                    "title": f"Song {i}", "artist": f"Artist {i}", "album": f"Album {i}",
+                    "release_date": f"{year}-05-01", "spotify_url": f"https://open.spotify.com/track/{i:022d}",
+                    "image": f"https://i.scdn.co/image/{i:040d}",
+                }
+                for i in range(10)
+            ],
+            "source": "Spotify",
+        },
+        "stale_sections": [],
+        "unavailable_sections": [],
+    }
+
+
+def request(accept_encoding: str) -> Request:
+    return Request({
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(b"accept-encoding", accept_encoding.encode())],
+    })
+
+
+def timed(fn, rounds: int) -> float:
+    fn()
+    durations = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations) * 1000
+
+
+def main(args):
+    data = year_payload(2001, args.artists, args.events)
+    payload = EncodedPayload.from_data(data)
+    brotli_request = request("gzip, deflate, br")
+
+    cases = [
+        ("stdlib", lambda: json.dumps(
+            jsonable_encoder(data), ensure_ascii=False, allow_nan=False, separators=(",", ":")
+        ).encode()),
+        ("orjson", lambda: orjson.dumps(jsonable_encoder(data))),
+        ("model", lambda: YearResponse.model_validate(data).model_dump_json(exclude_unset=True)),
+        ("orjson only", lambda: orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)),
+        ("cache fill", lambda: EncodedPayload.from_data(data)),
+        ("cache hit", lambda: payload.response(brotli_request)),
+    ]
+
+    print(f"Year payload: {len(payload.body) / 1024:.0f} KiB JSON, "
+          f"{len(payload.encoded.get('br', b'')) / 1024:.0f} KiB brotli, "
+          f"{len(payload.encoded.get('gzip', b'')) / 1024:.0f} KiB gzip "
+          f"(median of {args.rounds} rounds)\n")
+    print(f"{'path':<12}{'ms per payload':>16}")
+    for label, fn in cases:
+        rounds = max(3, args.rounds // 10) if label == "cache fill" else args.rounds
+        print(f"{label:<12}{timed(fn, rounds):>16.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--artists", type=int, default=100, help="Billboard artists in the payload")
+    parser.add_argument("--events", type=int, default=30, help="Events per month")
+    parser.add_argument("--rounds", type=int, default=100, help="Timed rounds per path")
+    main(parser.parse_args())
@@ -0,0 +1,144 @@
+"""
+Benchmark: hit latency of the cache backends (app.core.cache).
+
+Compares a cache hit in each backend, for a small section value and for a
+cached /year/{year} payload (EncodedPayload of the synthetic year from
+benchmarks/serialization.py):
+
+- memory:        MemoryBackend, the per-worker default
+- tiered local:  TieredBackend (CACHE_BACKEND=sqlite) answering from the
+                 worker's memory, the common case after the first hit
+- sqlite:        SQLiteBackend, the first hit in a worker for an entry another
+                 worker stored (a read from the shared file plus unpickling,
+                 on the backend's thread)
+
+It then starts --workers processes that read entries written by the parent
+while one of them keeps writing, and reports their read latency
+percentiles, to show what contention between workers costs, and the
+longest time their event loop was held up meanwhile.
+
+Usage (from backend/):
+    python benchmarks/shared_cache.py
+    python benchmarks/shared_cache.py --workers 8 --reads 5000
+"""
+
+from pathlib import Path
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from app.core.cache import CacheEntry, MemoryBackend, SQLiteBackend, TieredBackend
+from app.core.compression import EncodedPayload
+from serialization import year_payload
+
+MAX_BYTES = 256 * 1024 * 1024
+SECTION = {"year": 2001, "artists": [f"Artist {i}" for i in range(10)]}
+
+
+def entry(value) -> CacheEntry:
+    now = time.time()
+    return CacheEntry(value, now, now + 3600)
+
+
+async def timed_async(fn, rounds: int) -> float:
+    await fn()
+    durations = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await fn()
+        durations.append(time.perf_counter() - started)
+    return statistics.median(durations) * 1000
+
+
+async def loop_stall(stop: asyncio.Event) -> float:
+    """
+    Longest delay of a 1 ms timer until stop is set, in seconds.
+    """
+    stall = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        stall = max(stall, time.perf_counter() - started - 0.001)
+    return stall
+
+
+async def read_shared(path: str, keys: int, reads: int, write: bool) -> tuple[list[float], float]:
+    backend = SQLiteBackend(Path(path), MAX_BYTES)
+    stop = asyncio.Event()
+    probe = asyncio.create_task(loop_stall(stop))
+    durations = []
+    for i in range(reads):
+        key = ("section", i % keys)
+        if write and i % 10 == 0:
+            await backend.set(key, entry(SECTION))
+        started = time.perf_counter()
+        if await backend.get(key) is None:
+            raise SystemExit(f"{key} missing in worker")
+        durations.append(time.perf_counter() - started)
+    stop.set()
+    return durations, await probe
+
+
+def worker(path: str, keys: int, reads: int, write: bool, results) -> None:
+    results.put(asyncio.run(read_shared(path, keys, reads, write)))
+
+
+async def hits(args, path: Path) -> None:
+    year = EncodedPayload.from_data(year_payload(2001, args.artists, args.events))
+    memory = MemoryBackend()
+    shared = SQLiteBackend(path, MAX_BYTES)
+    tiered = TieredBackend(MemoryBackend(), SQLiteBackend(path, MAX_BYTES))
+
+    print(f"{'hit':<16}{'section µs':>12}{'year µs':>12}")
+    for label, backend in (("memory", memory), ("tiered local", tiered), ("sqlite", shared)):
+        await backend.set(("section",), entry(SECTION))
+        await backend.set(("year",), entry(year))
+        section_us = await timed_async(lambda: backend.get(("section",)), args.rounds) * 1000
+        year_us = await timed_async(lambda: backend.get(("year",)), args.rounds) * 1000
+        print(f"{label:<16}{section_us:>12.1f}{year_us:>12.1f}")
+
+    for i in range(args.keys):
+        await shared.set(("section", i), entry(SECTION))
+
+
+def main(args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "cache.sqlite3"
+        asyncio.run(hits(args, path))
+        results = multiprocessing.Queue()
+        processes = [
+            multiprocessing.Process(target=worker, args=(str(path), args.keys, args.reads, i == 0, results))
+            for i in range(args.workers)
+        ]
+        for process in processes:
+            process.start()
+        outcomes = [results.get() for _ in processes]
+        durations = sorted(d for worker_durations, _ in outcomes for d in worker_durations)
+        stall = max(worker_stall for _, worker_stall in outcomes)
+        for process in processes:
+            process.join()
+
+        def percentile(p: float) -> float:
+            return durations[min(len(durations) - 1, int(len(durations) * p))] * 1e6
+
+        print(f"\n{args.workers} workers reading the shared file, one also writing: "
+              f"p50 {percentile(0.5):.1f} µs, p99 {percentile(0.99):.1f} µs, "
+              f"mean {statistics.mean(durations) * 1e6:.1f} µs; "
+              f"longest event loop stall {stall * 1e3:.2f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--artists", type=int, default=100, help="Billboard artists in the year payload")
+    parser.add_argument("--events", type=int, default=30, help="Events per month in the year payload")
+    parser.add_argument("--rounds", type=int, default=2000, help="Timed hits per backend")
+    parser.add_argument("--workers", type=int, default=4, help="Worker processes sharing the file")
+    parser.add_argument("--keys", type=int, default=200, help="Entries the workers read")
+    parser.add_argument("--reads", type=int, default=2000, help="Reads per worker")
+    main(parser.parse_args())
@@ -1,3 +1,5 @@
+import { tmdbImage } from "../imageProxy.js";
+
 /**
  * Formats a number of votes into a human-readable string (e.g., 1.2M, 45.3K).
  * 
@@ -34,7 +36,7 @@ export function renderHighlights(highlights, year) {
     w780 - Extra large
     original - Full resolution
     */
-    const TMDB_IMAGE_BASE = 'https://image.tmdb.org/t/p/w500';
+    const TMDB_IMAGE_WIDTH = 500;
 
     const bestPicture = highlights.oscars.bestPicture;
     const bestActor = highlights.oscars.bestActor;
@@ -54,7 +56,7 @@ export function renderHighlights(highlights, year) {
                         ${bestPicture.poster ? `
                             <div class="award-card-poster-image-wrapper">
                                 <img 
-                                    src="${TMDB_IMAGE_BASE}${bestPicture.poster}" 
+                                    src="${tmdbImage(bestPicture.poster, TMDB_IMAGE_WIDTH)}" 
                                     alt="${bestPicture.title} poster"
                                     class="award-card-poster-image"
                                     onerror="this.style.display='none'"
@@ -75,7 +77,7 @@ export function renderHighlights(highlights, year) {
                                 ${bestActor.image ? `
                                     <div class="award-card-image-wrapper">
                                         <img 
-                                            src="${TMDB_IMAGE_BASE}${bestActor.image}" 
+                                            src="${tmdbImage(bestActor.image, TMDB_IMAGE_WIDTH)}" 
                                             alt="${bestActor.name}"
                                             class="award-card-image"
                                             onerror="this.style.display='none'"
@@ -93,7 +95,7 @@ export function renderHighlights(highlights, year) {
                                 ${bestActress.image ? `
                                     <div class="award-card-image-wrapper">
                                         <img 
-                                            src="${TMDB_IMAGE_BASE}${bestActress.image}" 
+                                            src="${tmdbImage(bestActress.image, TMDB_IMAGE_WIDTH)}" 
                                             alt="${bestActress.name}"
                                             class="award-card-image"
                                             onerror="this.style.display='none'"
@@ -122,7 +124,7 @@ export function renderHighlights(highlights, year) {
  * @returns {string} HTML string representing the top movies section.
  */
 export function renderMovies(movies) {
-    const TMDB_IMAGE_BASE = 'https://image.tmdb.org/t/p/w342';
+    const TMDB_IMAGE_WIDTH = 342;
 
     return `
     <section class="mt-20 space-y-6">
@@ -140,7 +142,7 @@ export function renderMovies(movies) {
             ${movie.poster ? `
               <div class="movie-card-poster-wrapper">
                 <img 
-                  src="${TMDB_IMAGE_BASE}${movie.poster}" 
+                  src="${tmdbImage(movie.poster, TMDB_IMAGE_WIDTH)}" 
                   alt="${movie.title} poster"
                   class="movie-card-poster"
                   onerror="this.style.display='none'"
@@ -179,7 +181,7 @@ export function renderMovies(movies) {
  * @returns {string} HTML string representing the top series section.
  */
 export function renderSeries(series, year) {
-  const TMDB_IMAGE_BASE = 'https://image.tmdb.org/t/p/w342';
+  const TMDB_IMAGE_WIDTH = 342;
 
   return `
     <section class="mt-20 space-y-6">
@@ -200,7 +202,7 @@ export function renderSeries(series, year) {
             ${serie.poster ? `
               <div class="series-card-poster-wrapper">
                 <img 
-                  src="${TMDB_IMAGE_BASE}${serie.poster}" 
+                  src="${tmdbImage(serie.poster, TMDB_IMAGE_WIDTH)}" 
                   alt="${serie.title} poster"
                   class="series-card-poster"
                   onerror="this.style.display='none'"
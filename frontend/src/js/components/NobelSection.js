@@ -1,3 +1,5 @@
+import { proxiedImage } from "../imageProxy.js";
+
 /**
  * @typedef {Object} NobelWinner
  * @property {string} [name] - Laureate name.
@@ -107,7 +109,7 @@ export function renderNobel(nobelData, {nobelSection, nobelGrid, nobelTpl, stats
         const imgUrl = winner.image ?? "";
         if (img) {
             if (imgUrl) {
-                img.src = imgUrl;
+                img.src = proxiedImage(imgUrl, 250);
                 img.alt = `Portrait of ${winner.name ?? "Unknown"}`;
             } else {
                 img.src = "https://upload.wikimedia.org/wikipedia/en/e/ed/Nobel_Prize.png";
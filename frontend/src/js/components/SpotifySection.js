@@ -18,6 +18,22 @@ async function fetchSpotifySongs(year) {
     return data.top_songs ?? [];
   }
 
+/**
+ * Returns a shuffled copy of an array (Fisher-Yates).
+ * The API returns the same songs for a year so responses can be cached;
+ * shuffling here keeps the section varied between visits.
+ * @param {Array} arr - Array to shuffle
+ * @returns {Array} - Shuffled array (new array, doesn't mutate original)
+ */
+function shuffle(arr) {
+    const shuffled = [...arr];
+    for (let i = shuffled.length - 1; i > 0; i--) {
+        const j = Math.floor(Math.random() * (i + 1));
+        [shuffled[i], shuffled[j]] = [shuffled[j], shuffled[i]];
+    }
+    return shuffled;
+}
+
 /**
  * Clears the Spotify section by removing all grid content and hides the section.
  * @function clearSpotify
@@ -41,7 +57,7 @@ function renderSpotifySongs(songs, year) {
 
     spotifySection.classList.remove("hidden"); //Tar bort attributet "hidden" för att visa sektionen
 
-    for (const song of songs) {  //Skapar ett kort för varje låt i Songs
+    for (const song of shuffle(songs)) {  //Skapar ett kort för varje låt i Songs
         const card = spotifyCardTpl.content.firstElementChild.cloneNode(true);
 
         card.querySelector(".song-title").textContent = "🎵 " + song.title;
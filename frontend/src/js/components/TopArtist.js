@@ -1,3 +1,5 @@
+import { proxiedImage } from "../imageProxy.js";
+
 const API_BASE = "http://127.0.0.1:8000";
 
 /** Section containing the top artists view.
@@ -193,7 +195,7 @@ async function renderTopArtist(artistData, year) {
       const cleanUrl =
         imgUrl && imgUrl !== "null" && imgUrl !== "None" ? imgUrl : "";
 
-      if (cleanUrl) img.src = cleanUrl;
+      if (cleanUrl) img.src = proxiedImage(cleanUrl, 250);
     }
 
     
@@ -0,0 +1,29 @@
+/** Base URL for the backend API */
+const API_BASE = "http://127.0.0.1:8000";
+
+const WIKIMEDIA_UPLOADS = "https://upload.wikimedia.org/";
+
+/**
+ * Builds the backend image proxy URL for a TMDb image path.
+ * The backend caches the image and serves the nearest TMDb size at or above the width.
+ *
+ * @param {string} path - TMDb image path, e.g. "/abc.jpg".
+ * @param {number} width - Displayed width in pixels.
+ * @returns {string} Image URL.
+ */
+export function tmdbImage(path, width) {
+  return `${API_BASE}/api/v1/img/tmdb${path}?w=${width}`;
+}
+
+/**
+ * Routes a Wikimedia image URL through the backend image proxy, as a thumbnail of the given width.
+ * Other URLs are returned unchanged.
+ *
+ * @param {string} url - Image URL from the API.
+ * @param {number} width - Displayed width in pixels.
+ * @returns {string} Image URL.
+ */
+export function proxiedImage(url, width) {
+  if (!url || !url.startsWith(WIKIMEDIA_UPLOADS)) return url;
+  return `${API_BASE}/api/v1/img/wikimedia/${url.slice(WIKIMEDIA_UPLOADS.length)}?w=${width}`;
+}